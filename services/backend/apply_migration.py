@@ -3,18 +3,78 @@
 Script pentru aplicarea manuală a migrărilor
 """
 
+import asyncio
 import sqlite3
 import os
 import glob
+import importlib.util
+import sys
 
-def apply_migration():
+# Reconstruirile online copiază câte atâtea rânduri pe tranzacție
+MIGRARE_BUCATA = int(os.getenv("MIGRARE_BUCATA", "5000"))
+MIGRARE_PAUZA_SECUNDE = float(os.getenv("MIGRARE_PAUZA_SECUNDE", "0.02"))
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations', 'models')
+
+
+def load_migration(migration_file):
+    """Importă fișierul de migrare ca modul (upgrade, downgrade, RECONSTRUIRI)."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    spec = importlib.util.spec_from_file_location("migrare", migration_file)
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+
+def migration_files(migrations_dir):
+    """Fișierele de migrare în ordinea numărului din față (10_ după 9_), ca aerich."""
+    fisiere = glob.glob(os.path.join(migrations_dir, '*.py'))
+    return sorted(fisiere, key=lambda fisier: int(os.path.basename(fisier).split('_', 1)[0]))
+
+
+class _Sqlite:
+    """`db` pentru upgrade(): migrările aleg SQL-ul după db.capabilities.dialect."""
+
+    class capabilities:
+        dialect = "sqlite"
+
+
+def sql_sqlite(migration_file):
+    """SQL-ul întors de upgrade() pentru SQLite (fără conexiune Tortoise)."""
+    return asyncio.run(load_migration(migration_file).upgrade(_Sqlite()))
+
+
+def apply_online(conn, migration_file):
+    """
+    Migrare cu RECONSTRUIRI: tabelele sunt reconstruite în bucăți, cu
+    aplicația pornită (migrations/reconstruire.py), nu cu SQL-ul blocant.
+    """
+    modul = load_migration(migration_file)
+    from migrations.reconstruire import reconstruieste_online
+
+    conn.commit()
+    conn.isolation_level = None
+    conn.execute("PRAGMA busy_timeout = 5000")
+    try:
+        pasi = reconstruieste_online(
+            conn, modul.RECONSTRUIRI, bucata=MIGRARE_BUCATA, pauza=MIGRARE_PAUZA_SECUNDE
+        )
+    finally:
+        conn.isolation_level = ""
+    lock_maxim = max(pas["lock_ms"] for pas in pasi)
+    print(f"Lock maxim pe un pas: {lock_maxim:.1f} ms ({len(pasi)} tranzacții)")
+
+
+def apply_migration(db_path='/tmp/db/programari.db', migrations_dir='/app/migrations/models'):
     """Apply migration manually"""
 
     # Create database directory
-    os.makedirs('/tmp/db', exist_ok=True)
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
     # Connect to database
-    conn = sqlite3.connect('/tmp/db/programari.db')
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     # Create aerich table if not exists
@@ -28,9 +88,7 @@ def apply_migration():
     """)
 
     # Get list of all migration files
-    migration_files = sorted(glob.glob('/app/migrations/models/*.py'))
-
-    for migration_file in migration_files:
+    for migration_file in migration_files(migrations_dir):
         filename = migration_file.split('/')[-1]
         version = filename.replace('.py', '')
 
@@ -46,23 +104,26 @@ def apply_migration():
         with open(migration_file, 'r') as f:
             content = f.read()
 
-        # Extract SQL from upgrade function
-        start_marker = '"""'
-        end_marker = '"""'
-
-        start_idx = content.find(start_marker, content.find('async def upgrade'))
-        if start_idx == -1:
-            print(f"Start marker not found in {version}")
+        if 'RECONSTRUIRI' in content:
+            try:
+                apply_online(conn, migration_file)
+                cursor.execute("""
+                    INSERT INTO aerich (version, app, content)
+                    VALUES (?, 'models', '{}')
+                """, (version,))
+                conn.commit()
+                print(f"Migration {version} applied successfully!")
+            except Exception as e:
+                print(f"Error applying migration {version}: {e}")
+                return False
             continue
 
-        start_idx += len(start_marker)
-        end_idx = content.find(end_marker, start_idx)
-
-        if end_idx == -1:
-            print(f"End marker not found in {version}")
-            continue
-
-        sql = content[start_idx:end_idx]
+        # SQL-ul SQLite întors de upgrade(); migrările îl pot importa din src/
+        try:
+            sql = sql_sqlite(migration_file)
+        except Exception as e:
+            print(f"Error loading migration {version}: {e}")
+            return False
 
         print(f"Applying SQL for {version}...")
 
@@ -95,6 +156,66 @@ def apply_migration():
     conn.close()
     return True
 
+async def apply_migration_postgres(conn, migrations_dir=MIGRATIONS_DIR):
+    """
+    Apply migrations on PostgreSQL through an initialized Tortoise connection.
+    Each migration runs upgrade(conn) and records its version in aerich in
+    the same transaction (PostgreSQL DDL is transactional).
+    """
+    from tortoise.transactions import in_transaction
+
+    await conn.execute_script("""
+        CREATE TABLE IF NOT EXISTS "aerich" (
+            "id" SERIAL NOT NULL PRIMARY KEY,
+            "version" VARCHAR(255) NOT NULL,
+            "app" VARCHAR(100) NOT NULL,
+            "content" JSONB NOT NULL
+        )
+    """)
+    _, rows = await conn.execute_query('SELECT "version" FROM "aerich"')
+    applied = {row["version"] for row in rows}
+
+    for migration_file in migration_files(migrations_dir):
+        version = os.path.basename(migration_file).replace('.py', '')
+        if version in applied:
+            print(f"Migration {version} already applied, skipping...")
+            continue
+
+        print(f"Applying migration: {version}")
+        try:
+            modul = load_migration(migration_file)
+            async with in_transaction(conn.connection_name) as tx:
+                await tx.execute_script(await modul.upgrade(tx))
+                await tx.execute_query(
+                    'INSERT INTO "aerich" ("version", "app", "content") VALUES ($1, $2, $3)',
+                    [version, 'models', '{}'],
+                )
+            print(f"Migration {version} applied successfully!")
+        except Exception as e:
+            print(f"Error applying migration {version}: {e}")
+            return False
+    return True
+
+
+async def _apply_postgres():
+    from tortoise import Tortoise
+    from db.config import TORTOISE_APP
+
+    # Migrarea inițială generează schema din modele, deci aplicația e inițializată
+    await Tortoise.init(config=TORTOISE_APP)
+    try:
+        return await apply_migration_postgres(Tortoise.get_connection("default"))
+    finally:
+        await Tortoise.close_connections()
+
+
 if __name__ == "__main__":
-    success = apply_migration()
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from db.config import DATABASE_URL, este_postgres
+
+    if este_postgres(DATABASE_URL):
+        success = asyncio.run(_apply_postgres())
+    else:
+        success = apply_migration()
     exit(0 if success else 1)
\ No newline at end of file
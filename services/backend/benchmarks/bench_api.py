@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Benchmark reproductibil pentru API-ul de programări.
+
+Pornește src.main:app cu uvicorn pe o bază SQLite temporară populată
+determinist, rulează un mix realist de requesturi cu un client HTTP async și
+raportează p50/p95/p99 și throughput per endpoint. Rezultatele se salvează
+ca JSON în benchmarks/results/ și pot fi comparate cu o rulare anterioară:
+
+    python benchmarks/bench_api.py --durata 30 --concurenta 20
+    python benchmarks/bench_api.py --compara benchmarks/results/<fisier>.json
+
+Cu --db-url postgres://... rularea se face pe PostgreSQL (vezi și
+benchmarks/compara_backenduri.py).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+PAROLA = "parola123"
+UTILIZATOR = "user1"  # primul utilizator creat de generator
+SERVICII_PER_JOB = 3
+FORMATE_ACCEPT = {"json": "application/json", "msgpack": "application/msgpack"}
+ORE = [f"{h:02d}:{m:02d}" for h in range(8, 18) for m in (0, 30)]
+
+# Ponderile mixului de requesturi (aproximativ traficul din producție)
+MIXURI = {
+    "implicit": {
+        "GET /programari": 50,
+        "POST /programari": 15,
+        "GET /persoane?job_id": 15,
+        "PUT /programari/{id}": 10,
+        "DELETE /programari/{id}": 5,
+        "POST /login": 5,
+    },
+    "citire": {
+        "GET /programari": 70,
+        "GET /persoane?job_id": 30,
+    },
+    "scriere": {
+        "POST /programari": 60,
+        "PUT /programari/{id}": 25,
+        "DELETE /programari/{id}": 15,
+    },
+}
+
+
+async def populeaza(db_url: str, programari: int, persoane: int, joburi: int, seed: int) -> None:
+    """Populează determinist baza de date cu generatorul din migrations/synthetic_data.py."""
+    from tortoise import Tortoise
+    from migrations.synthetic_data import genereaza, parse_args
+
+    await Tortoise.init(db_url=db_url, modules={"models": ["db.models"]})
+    try:
+        conn = Tortoise.get_connection("default")
+        if conn.capabilities.dialect == "postgres":
+            # Schema de producție (cu indecșii PostgreSQL din migrări), apoi tabele goale
+            from apply_migration import apply_migration_postgres
+            if not await apply_migration_postgres(conn):
+                raise RuntimeError("Migrările PostgreSQL au eșuat")
+            await conn.execute_script(
+                'TRUNCATE "Programari", "Programari_archive", "PersoanaJob", "Users", '
+                '"Servicii", "Persoane", "Job" RESTART IDENTITY CASCADE'
+            )
+        await Tortoise.generate_schemas(safe=True)
+        await genereaza(parse_args([
+            "--programari", str(programari),
+            "--persoane", str(persoane),
+            "--joburi", str(joburi),
+            "--servicii-per-job", str(SERVICII_PER_JOB),
+            "--utilizatori", "1",
+            "--zile-trecut", "0",
+            "--parola", PAROLA,
+            "--seed", str(seed),
+        ]))
+        if conn.capabilities.dialect == "postgres":
+            await conn.execute_script("ANALYZE")
+    finally:
+        await Tortoise.close_connections()
+
+
+def port_liber() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def porneste_server(db_url: str, port: int) -> subprocess.Popen:
+    # Tot traficul vine de pe 127.0.0.1: fără LIMITARE_ACTIVA=0, rate limiting-ul
+    # per IP (src/limitare.py) ar respinge aproape toate scrierile
+    env = dict(os.environ, DATABASE_URL=db_url, PYTHONPATH=str(BACKEND_DIR),
+               SECRET_KEY=os.environ.get("SECRET_KEY", "bench-secret"),
+               LIMITARE_ACTIVA=os.environ.get("LIMITARE_ACTIVA", "0"))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def asteapta_server(base_url: str, timeout: float = 30.0) -> None:
+    limita = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < limita:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Serverul nu a pornit în {timeout}s")
+
+
+class Rezultate:
+    def __init__(self):
+        self.latente: Dict[str, List[float]] = {}
+        self.statusuri: Dict[str, Dict[str, int]] = {}
+        self.erori: Dict[str, int] = {}
+
+    def adauga(self, endpoint: str, durata: float, status: Optional[int]) -> None:
+        self.latente.setdefault(endpoint, []).append(durata)
+        cheie = str(status) if status is not None else "transport_error"
+        coduri = self.statusuri.setdefault(endpoint, {})
+        coduri[cheie] = coduri.get(cheie, 0) + 1
+        if status is None or status >= 500:
+            self.erori[endpoint] = self.erori.get(endpoint, 0) + 1
+
+
+def percentila(valori: List[float], p: float) -> float:
+    # Metoda nearest-rank
+    ordonate = sorted(valori)
+    return ordonate[max(0, math.ceil(p / 100 * len(ordonate)) - 1)]
+
+
+def rezumat(latente: List[float], durata: float) -> dict:
+    return {
+        "requesturi": len(latente),
+        "throughput_rps": round(len(latente) / durata, 2),
+        "medie_ms": round(sum(latente) / len(latente) * 1000, 3),
+        "p50_ms": round(percentila(latente, 50) * 1000, 3),
+        "p95_ms": round(percentila(latente, 95) * 1000, 3),
+        "p99_ms": round(percentila(latente, 99) * 1000, 3),
+    }
+
+
+async def worker(base_url: str, mix: Dict[str, int], seed: int, persoane: int, joburi: int,
+                 programari: int, pregatiti: asyncio.Barrier, pornire: asyncio.Event,
+                 fereastra: dict, rezultate: Rezultate, accept: str = "json") -> None:
+    rnd = random.Random(seed)
+    endpointuri = list(mix)
+    ponderi = list(mix.values())
+    create: List[int] = []
+
+    headers = {"Accept": FORMATE_ACCEPT[accept]}
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, headers=headers) as client:
+        # Autentificarea inițială nu intră în fereastra măsurată
+        await client.post("/login", data={"username": UTILIZATOR, "password": PAROLA})
+        await pregatiti.wait()
+        await pornire.wait()
+        sfarsit = fereastra["sfarsit"]
+
+        def programare_noua() -> dict:
+            return {
+                "data": (date.today() + timedelta(days=rnd.randint(1, 365))).isoformat(),
+                "ora": rnd.choice(ORE),
+                "persoana_id": rnd.randint(1, persoane),
+                "serviciu_id": rnd.randint(1, joburi * SERVICII_PER_JOB),
+                "nume": "Bench",
+                "prenume": "Client",
+            }
+
+        while time.monotonic() < sfarsit:
+            endpoint = rnd.choices(endpointuri, ponderi)[0]
+            start = time.perf_counter()
+            status = None
+            try:
+                if endpoint == "GET /programari":
+                    raspuns = await client.get("/programari", params={"persoana_id": rnd.randint(1, persoane)})
+                elif endpoint == "GET /persoane?job_id":
+                    raspuns = await client.get("/persoane", params={"job_id": rnd.randint(1, joburi)})
+                elif endpoint == "POST /programari":
+                    raspuns = await client.post("/programari", json=programare_noua())
+                    if raspuns.status_code == 200:
+                        create.append(raspuns.json()["id"])
+                elif endpoint == "PUT /programari/{id}":
+                    raspuns = await client.put(f"/programari/{rnd.randint(1, programari)}", json=programare_noua())
+                elif endpoint == "DELETE /programari/{id}":
+                    if not create:
+                        continue
+                    raspuns = await client.delete(f"/programari/{create.pop()}")
+                else:
+                    raspuns = await client.post("/login", data={"username": UTILIZATOR, "password": PAROLA})
+                status = raspuns.status_code
+            except httpx.TransportError:
+                pass
+            rezultate.adauga(endpoint, time.perf_counter() - start, status)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except Exception:
+        return None
+
+
+def compara(curent: dict, anterior: dict) -> None:
+    print(f"\nComparație cu {anterior['meta'].get('commit')} ({anterior['meta'].get('timestamp')}):")
+    print(f"{'endpoint':28} {'p50':>18} {'p95':>18} {'p99':>18} {'rps':>18}")
+    for endpoint, valori in curent["endpointuri"].items():
+        vechi = anterior["endpointuri"].get(endpoint)
+        if not vechi:
+            continue
+        coloane = []
+        for cheie in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            delta = (valori[cheie] - vechi[cheie]) / vechi[cheie] * 100 if vechi[cheie] else 0.0
+            coloane.append(f"{valori[cheie]:>9} ({delta:+6.1f}%)")
+        print(f"{endpoint:28} " + " ".join(coloane))
+
+
+async def ruleaza(args) -> dict:
+    db_url = args.db_url or f"sqlite://{tempfile.mkdtemp(prefix='bench_programari_')}/bench.db"
+    await populeaza(db_url, args.programari, args.persoane, args.joburi, args.seed)
+
+    port = port_liber()
+    base_url = f"http://127.0.0.1:{port}"
+    server = porneste_server(db_url, port)
+    try:
+        await asteapta_server(base_url)
+        mix = MIXURI[args.mix]
+        rezultate = Rezultate()
+        pregatiti = asyncio.Barrier(args.concurenta + 1)
+        pornire = asyncio.Event()
+        fereastra = {}
+        workeri = asyncio.gather(*[
+            worker(base_url, mix, args.seed * 1000 + i, args.persoane, args.joburi,
+                   args.programari, pregatiti, pornire, fereastra, rezultate, args.accept)
+            for i in range(args.concurenta)
+        ])
+        await pregatiti.wait()
+        start = time.monotonic()
+        fereastra["sfarsit"] = start + args.durata
+        pornire.set()
+        await workeri
+        durata = time.monotonic() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    toate = [d for latente in rezultate.latente.values() for d in latente]
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platforma": platform.platform(),
+            "backend": db_url.split("://", 1)[0],
+            "parametri": vars(args) | {"compara": None, "db_url": None},
+        },
+        "total": rezumat(toate, durata) | {"erori": sum(rezultate.erori.values())},
+        "endpointuri": {
+            endpoint: rezumat(latente, durata) | {
+                "statusuri": rezultate.statusuri[endpoint],
+                "erori": rezultate.erori.get(endpoint, 0),
+            }
+            for endpoint, latente in sorted(rezultate.latente.items())
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durata", type=float, default=30.0, help="secunde de încărcare")
+    parser.add_argument("--concurenta", type=int, default=20, help="clienți simultani")
+    parser.add_argument("--mix", choices=sorted(MIXURI), default="implicit")
+    parser.add_argument("--accept", choices=sorted(FORMATE_ACCEPT), default="json",
+                        help="formatul cerut pentru listele GET (header-ul Accept)")
+    parser.add_argument("--programari", type=int, default=20000, help="programări populate inițial")
+    parser.add_argument("--persoane", type=int, default=50)
+    parser.add_argument("--joburi", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="fișierul JSON cu rezultatele")
+    parser.add_argument("--compara", type=Path, default=None, help="rezultate anterioare pentru comparație")
+    parser.add_argument("--db-url", default=None,
+                        help="baza de date (implicit un fișier SQLite temporar); o bază PostgreSQL este golită")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+
+    rezultat = asyncio.run(ruleaza(args))
+
+    output = args.output or (
+        BACKEND_DIR / "benchmarks" / "results"
+        / f"{datetime.now():%Y%m%d-%H%M%S}-{rezultat['meta']['commit'] or 'local'}-{rezultat['meta']['backend']}-{args.mix}-{args.accept}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(rezultat, indent=2, default=str))
+
+    print(f"{'endpoint':28} {'req':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erori':>6}")
+    for endpoint, valori in rezultat["endpointuri"].items():
+        print(f"{endpoint:28} {valori['requesturi']:>7} {valori['throughput_rps']:>9} "
+              f"{valori['p50_ms']:>9} {valori['p95_ms']:>9} {valori['p99_ms']:>9} {valori['erori']:>6}")
+    total = rezultat["total"]
+    print(f"{'TOTAL':28} {total['requesturi']:>7} {total['throughput_rps']:>9} "
+          f"{total['p50_ms']:>9} {total['p95_ms']:>9} {total['p99_ms']:>9} {total['erori']:>6}")
+    print(f"\nRezultate salvate în {output}")
+
+    if args.compara:
+        compara(rezultat, json.loads(args.compara.read_text()))
+
+
+if __name__ == "__main__":
+    main()
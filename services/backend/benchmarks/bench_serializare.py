@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark pentru serializarea răspunsurilor de tip listă.
+
+Compară, pe rânduri de forma celor întoarse de Programari.values(), drumul
+implicit FastAPI (jsonable_encoder + json.dumps, ca JSONResponse) cu
+RaspunsJSON (orjson) și RaspunsMsgpack din src/raspunsuri.py:
+
+    python benchmarks/bench_serializare.py --randuri 100 1000 10000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from src.raspunsuri import RaspunsJSON, RaspunsMsgpack  # noqa: E402
+
+
+def randuri_programari(numar: int, seed: int) -> List[dict]:
+    rnd = random.Random(seed)
+    azi = date.today()
+    return [
+        {
+            "id": i + 1,
+            "data": azi + timedelta(days=rnd.randint(0, 365)),
+            "ora": f"{rnd.randint(8, 17):02d}:{rnd.choice((0, 30)):02d}",
+            "observatii": rnd.choice([None, "Client nou", "Preferă dimineața"]),
+            "nume": rnd.choice(["Popescu", "Ionescu", "Stoica"]),
+            "prenume": rnd.choice(["Ion", "Maria", "Ștefan"]),
+            "email": f"client{i}@example.ro",
+            "telefon": f"07{rnd.randint(0, 10 ** 8 - 1):08d}",
+            "job_id": rnd.randint(1, 10),
+            "persoana_id": rnd.randint(1, 500),
+            "serviciu_id": rnd.randint(1, 80),
+        }
+        for i in range(numar)
+    ]
+
+
+def fastapi_implicit(randuri: List[dict]) -> bytes:
+    # Ce face FastAPI pentru un endpoint care returnează lista direct
+    return JSONResponse(content=jsonable_encoder(randuri)).body
+
+
+def orjson_direct(randuri: List[dict]) -> bytes:
+    return RaspunsJSON(content=randuri).body
+
+
+def msgpack_direct(randuri: List[dict]) -> bytes:
+    return RaspunsMsgpack(content=randuri).body
+
+
+VARIANTE = {
+    "jsonable_encoder+json": fastapi_implicit,
+    "orjson": orjson_direct,
+    "msgpack": msgpack_direct,
+}
+
+
+def masoara(functie: Callable[[List[dict]], bytes], randuri: List[dict], repetari: int) -> dict:
+    durate = []
+    for _ in range(repetari):
+        start = time.perf_counter()
+        corp = functie(randuri)
+        durate.append(time.perf_counter() - start)
+    return {"median_ms": statistics.median(durate) * 1000, "octeti": len(corp)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--randuri", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repetari", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Verificare: toate variantele produc aceleași date
+    proba = randuri_programari(10, args.seed)
+    assert json.loads(orjson_direct(proba)) == json.loads(fastapi_implicit(proba))
+
+    print(f"{'rânduri':>8} {'varianta':24} {'median ms':>10} {'octeti':>10} {'accelerare':>10}")
+    for numar in args.randuri:
+        randuri = randuri_programari(numar, args.seed)
+        referinta = None
+        for nume, functie in VARIANTE.items():
+            rezultat = masoara(functie, randuri, args.repetari)
+            if referinta is None:
+                referinta = rezultat["median_ms"]
+            print(f"{numar:>8} {nume:24} {rezultat['median_ms']:>10.3f} {rezultat['octeti']:>10} "
+                  f"{referinta / rezultat['median_ms']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Profilul pornirii aplicației (cold start).
+
+1. Importul src.main sub `python -X importtime`: totalul, pachetele care
+   costă cel mai mult și cele mai scumpe module individuale.
+2. prepare_db.py pe o bază deja pregătită (drumul rapid, amprenta la zi).
+3. Timpul până la primul răspuns 200 al uvicorn, pe o bază nouă (schemele
+   sunt generate la pornire) și pe o bază pregătită (generarea e sărită),
+   împreună cu fazele raportate de aplicație în /metrics (pornire_*).
+
+    python benchmarks/profil_pornire.py
+    python benchmarks/profil_pornire.py --repetari 5 --buget-ms 1500
+
+Cu --buget-ms, scriptul iese cu cod 1 dacă mediana pornirii pe baza
+pregătită depășește bugetul (util în CI).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bench_api import port_liber, porneste_server  # noqa: E402
+
+
+def mediu(db_url: str) -> dict:
+    return dict(os.environ, DATABASE_URL=db_url, PYTHONPATH=str(BACKEND_DIR),
+                SECRET_KEY=os.environ.get("SECRET_KEY", "bench-secret"))
+
+
+def profil_importuri(db_url: str) -> List[Tuple[str, int, int]]:
+    """(modul, microsecunde proprii, microsecunde cumulate) din -X importtime."""
+    proces = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=BACKEND_DIR, env=mediu(db_url), capture_output=True, text=True, check=True,
+    )
+    randuri = []
+    for linie in proces.stderr.splitlines():
+        if not linie.startswith("import time:") or "self [us]" in linie:
+            continue
+        propriu, cumulat, modul = linie[len("import time:"):].split("|")
+        randuri.append((modul.rstrip(), int(propriu), int(cumulat)))
+    return randuri
+
+
+def raport_importuri(randuri: List[Tuple[str, int, int]], top: int) -> None:
+    total = next(cumulat for modul, _, cumulat in randuri if modul.strip() == "src.main")
+    print(f"Import src.main: {total / 1000:.0f} ms\n")
+
+    pe_pachet: Dict[str, int] = defaultdict(int)
+    for modul, propriu, _ in randuri:
+        pe_pachet[modul.strip().split(".")[0]] += propriu
+    print(f"{'pachet':24} {'ms':>8} {'%':>6}")
+    for pachet, propriu in sorted(pe_pachet.items(), key=lambda x: -x[1])[:top]:
+        print(f"{pachet:24} {propriu / 1000:>8.1f} {propriu * 100 / total:>6.1f}")
+
+    print(f"\n{'modul (timp propriu)':48} {'ms':>8}")
+    for modul, propriu, _ in sorted(randuri, key=lambda x: -x[1])[:top]:
+        print(f"{modul.strip():48} {propriu / 1000:>8.1f}")
+
+
+async def pregateste_baza(db_url: str, cale: str) -> None:
+    """Ce lasă în urmă prepare_db.py: schemele generate și amprenta salvată."""
+    from tortoise import Tortoise
+    from db.amprenta import calculeaza_amprenta, salveaza_amprenta
+
+    await Tortoise.init(db_url=db_url, modules={"models": ["db.models"]})
+    try:
+        await Tortoise.generate_schemas(safe=True)
+    finally:
+        await Tortoise.close_connections()
+    salveaza_amprenta(cale, calculeaza_amprenta())
+
+
+def timp_prepare_db(db_url: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "prepare_db.py"], cwd=BACKEND_DIR, env=mediu(db_url),
+                   check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def faze_din_metrici(text: str) -> Dict[str, float]:
+    faze = {}
+    for linie in text.splitlines():
+        if linie.startswith("pornire_"):
+            nume, valoare = linie.split()
+            faze[nume[len("pornire_"):]] = float(valoare)
+    return faze
+
+
+async def cold_start(db_url: str, timeout: float = 60.0) -> Tuple[float, Dict[str, float]]:
+    """Milisecunde de la lansarea procesului până la primul 200 pe /."""
+    port = port_liber()
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = porneste_server(db_url, port)
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            while True:
+                try:
+                    if (await client.get("/")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError(f"Serverul nu a pornit în {timeout}s")
+                await asyncio.sleep(0.005)
+            durata = (time.perf_counter() - start) * 1000
+            faze = faze_din_metrici((await client.get("/metrics")).text)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return durata, faze
+
+
+async def ruleaza(args) -> int:
+    # Moștenite de toate procesele pornite: fără arhivator și fără log-urile de pornire
+    os.environ["ARHIVARE_ACTIVA"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    director = tempfile.mkdtemp(prefix="profil_pornire_")
+    pregatita = f"{director}/pregatita.db"
+    await pregateste_baza(f"sqlite://{pregatita}", pregatita)
+
+    print("== Importuri ==")
+    raport_importuri(profil_importuri(f"sqlite://{pregatita}"), args.top)
+
+    print("\n== prepare_db.py (amprentă la zi) ==")
+    durate = [timp_prepare_db(f"sqlite://{pregatita}") for _ in range(args.repetari)]
+    print(f"mediana {statistics.median(durate):.0f} ms (proces Python complet)")
+
+    print("\n== Pornire uvicorn până la primul 200 ==")
+    rezultate = {}
+    for scenariu in ("baza noua", "baza pregatita"):
+        durate, faze = [], {}
+        for i in range(args.repetari):
+            if scenariu == "baza noua":
+                db_url = f"sqlite://{director}/noua_{i}.db"
+            else:
+                db_url = f"sqlite://{pregatita}"
+            durata, faze = await cold_start(db_url)
+            durate.append(durata)
+        rezultate[scenariu] = statistics.median(durate)
+        detalii = ", ".join(f"{nume} {valoare:g}" for nume, valoare in faze.items() if nume != "buget_ms")
+        print(f"{scenariu:16} mediana {rezultate[scenariu]:>7.0f} ms  ({detalii})")
+
+    if args.buget_ms and rezultate["baza pregatita"] > args.buget_ms:
+        print(f"\nPornirea depășește bugetul: {rezultate['baza pregatita']:.0f} ms > {args.buget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repetari", type=int, default=3)
+    parser.add_argument("--top", type=int, default=12, help="câte pachete/module se afișează")
+    parser.add_argument("--buget-ms", type=float, default=0, help="bugetul pornirii pe baza pregătită")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(ruleaza(args)))
+
+
+if __name__ == "__main__":
+    main()
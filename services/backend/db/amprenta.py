@@ -0,0 +1,94 @@
+"""
+Amprenta schemei: hash-ul modelelor, al migrărilor și al datelor de test.
+
+prepare_db.py o salvează în tabela schema_amprenta după ce a rulat migrările,
+datele de test și generarea schemelor (în fișierul SQLite sau, pe PostgreSQL,
+prin conexiunea Tortoise). La pornirile următoare, dacă amprenta
+din baza de date este aceeași cu a codului, toți acești pași sunt săriți.
+Modulul folosește doar biblioteca standard, ca verificarea să nu plătească
+importul Tortoise.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+BASE_DIR = Path(__file__).parent.parent
+
+TABELA = "schema_amprenta"
+
+_CREEAZA_TABELA = f"""
+    CREATE TABLE IF NOT EXISTS "{TABELA}" (
+        "id" INTEGER PRIMARY KEY CHECK ("id" = 1),
+        "amprenta" VARCHAR(64) NOT NULL,
+        "actualizat_la" TIMESTAMP NOT NULL
+    )
+"""
+
+
+def fisiere_schema() -> List[Path]:
+    """Fișierele care determină schema și datele inițiale, în ordine stabilă."""
+    fisiere = [BASE_DIR / "db" / "models.py", BASE_DIR / "migrations" / "test_data.py"]
+    fisiere += sorted((BASE_DIR / "migrations" / "models").glob("*.py"))
+    return [fisier for fisier in fisiere if fisier.exists()]
+
+
+def calculeaza_amprenta() -> str:
+    h = hashlib.sha256()
+    for fisier in fisiere_schema():
+        h.update(fisier.relative_to(BASE_DIR).as_posix().encode())
+        h.update(b"\0")
+        h.update(fisier.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def citeste_amprenta(cale_db: str) -> Optional[str]:
+    """Amprenta salvată în fișierul SQLite sau None (bază nouă, tabelă lipsă)."""
+    if cale_db == ":memory:" or not Path(cale_db).exists():
+        return None
+    conn = sqlite3.connect(cale_db)
+    try:
+        rand = conn.execute(f'SELECT "amprenta" FROM "{TABELA}" WHERE "id" = 1').fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    return rand[0] if rand else None
+
+
+def salveaza_amprenta(cale_db: str, amprenta: str) -> None:
+    conn = sqlite3.connect(cale_db)
+    try:
+        with conn:
+            conn.execute(_CREEAZA_TABELA)
+            conn.execute(
+                f'INSERT OR REPLACE INTO "{TABELA}" ("id", "amprenta", "actualizat_la") VALUES (1, ?, ?)',
+                (amprenta, datetime.now().isoformat(timespec="seconds")),
+            )
+    finally:
+        conn.close()
+
+
+async def amprenta_din_db(conn) -> Optional[str]:
+    """Ca citeste_amprenta(), pe o conexiune Tortoise deja deschisă."""
+    from tortoise.exceptions import OperationalError
+
+    try:
+        randuri = await conn.execute_query_dict(f'SELECT "amprenta" FROM "{TABELA}" WHERE "id" = 1')
+    except OperationalError:
+        return None
+    return randuri[0]["amprenta"] if randuri else None
+
+
+async def salveaza_amprenta_in_db(conn, amprenta: str) -> None:
+    """Ca salveaza_amprenta(), pe o conexiune Tortoise (bazele PostgreSQL)."""
+    parametri = ("?", "?") if conn.capabilities.dialect == "sqlite" else ("$1", "$2")
+    await conn.execute_script(_CREEAZA_TABELA)
+    await conn.execute_query(
+        f'INSERT INTO "{TABELA}" ("id", "amprenta", "actualizat_la") VALUES (1, {parametri[0]}, {parametri[1]}) '
+        f'ON CONFLICT ("id") DO UPDATE SET "amprenta" = excluded."amprenta", "actualizat_la" = excluded."actualizat_la"',
+        [amprenta, datetime.now()],
+    )
@@ -1,24 +1,105 @@
+import itertools
 import os
 from pathlib import Path
+from typing import List
+
+from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
 
 # Use DATABASE_URL from environment or fallback to file path
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///tmp/db/programari.db")
 
-if DATABASE_URL.startswith("sqlite:///"):
-    # Extract path from DATABASE_URL for Tortoise
-    db_path = DATABASE_URL.replace("sqlite:///", "")
-    if not os.path.isabs(db_path):
-        # If relative path, make it absolute
-        BASE_DIR = Path(__file__).parent.parent
+BASE_DIR = Path(__file__).parent.parent
+
+# Profil SQLite pentru producție: WAL + pragmas ajustate, suprascrise din mediu
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "journal_size_limit": int(os.getenv("SQLITE_JOURNAL_SIZE_LIMIT", str(64 * 1024 * 1024))),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negativ = KiB
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+# Conexiuni separate doar pentru citire (0 = totul pe conexiunea "default")
+SQLITE_READ_CONNECTIONS = int(os.getenv("SQLITE_READ_CONNECTIONS", "4"))
+
+
+# Profil PostgreSQL: pool-ul asyncpg și cache-ul de prepared statements,
+# suprascrise din mediu sau din parametrii URL-ului (?maxsize=20)
+POSTGRES_POOL = {
+    "minsize": int(os.getenv("PG_POOL_MIN", "2")),
+    "maxsize": int(os.getenv("PG_POOL_MAX", "10")),
+    # Conexiunile inactive peste atâtea secunde sunt închise (0 = niciodată)
+    "max_inactive_connection_lifetime": float(os.getenv("PG_POOL_INACTIVE_S", "300")),
+    "command_timeout": float(os.getenv("PG_COMMAND_TIMEOUT_S", "30")),
+    # asyncpg pregătește fiecare interogare o dată per conexiune și o refolosește
+    # din cache; 0 în spatele pgbouncer în mod transaction
+    "statement_cache_size": int(os.getenv("PG_STATEMENT_CACHE_SIZE", "256")),
+    "max_cached_statement_lifetime": int(os.getenv("PG_STATEMENT_LIFETIME_S", "0")),
+    "application_name": os.getenv("PG_APPLICATION_NAME", "programari-backend"),
+    # Interogările aplicației sunt scurte: compilarea JIT costă mai mult decât câștigă
+    "server_settings": {"jit": os.getenv("PG_JIT", "off")},
+}
+
+
+def _sqlite_file_path(url: str) -> str:
+    # sqlite:///tmp/db/x.db -> /tmp/db/x.db (la fel ca Tortoise); căile relative
+    # sunt raportate la directorul backend-ului
+    db_path = url[len("sqlite://"):]
+    if db_path != ":memory:" and not os.path.isabs(db_path):
         db_path = str(BASE_DIR / db_path)
-    db_url = f"sqlite:///{db_path}"
+    return db_path
+
+
+def _sqlite_connection(file_path: str, **extra_pragmas) -> dict:
+    return {
+        "engine": "tortoise.backends.sqlite",
+        "credentials": {"file_path": file_path, **SQLITE_PRAGMAS, **extra_pragmas},
+    }
+
+
+def _postgres_connection(url: str) -> dict:
+    conexiune = expand_db_url(url)
+    conexiune["credentials"] = {**POSTGRES_POOL, **conexiune["credentials"]}
+    return conexiune
+
+
+def este_postgres(url: str = DATABASE_URL) -> bool:
+    return url.split("://", 1)[0] in ("postgres", "postgresql", "asyncpg")
+
+
+if DATABASE_URL.startswith("sqlite://"):
+    db_path = _sqlite_file_path(DATABASE_URL)
+    CONNECTIONS = {"default": _sqlite_connection(db_path)}
+    # În WAL cititorii nu așteaptă după scriitor; fiecare conexiune are propriul fir aiosqlite
+    if db_path != ":memory:":
+        for i in range(SQLITE_READ_CONNECTIONS):
+            CONNECTIONS[f"read_{i}"] = _sqlite_connection(db_path, query_only="ON")
+elif este_postgres(DATABASE_URL):
+    # Un singur pool: citirile concurente primesc fiecare conexiunea lor din pool
+    CONNECTIONS = {"default": _postgres_connection(DATABASE_URL)}
 else:
-    db_url = DATABASE_URL
+    CONNECTIONS = {"default": DATABASE_URL}
 
+READ_CONNECTION_NAMES = [name for name in CONNECTIONS if name.startswith("read_")]
+
+# Configurația aplicației (register_tortoise în src/main.py)
+TORTOISE_APP = {
+    "connections": CONNECTIONS,
+    "apps": {
+        "models": {
+            "models": ["db.models"],
+            "default_connection": "default",
+        }
+    }
+}
+
+# Configurația pentru aerich (include și tabela de migrări)
 TORTOISE_ORM = {
-    "connections": {
-        "default": db_url
-    },
+    "connections": CONNECTIONS,
     "apps": {
         "models": {
             "models": [
@@ -27,4 +108,71 @@ TORTOISE_ORM = {
             "default_connection": "default"
         }
     }
-}
\ No newline at end of file
+}
+
+
+_read_cycle = itertools.cycle(READ_CONNECTION_NAMES) if READ_CONNECTION_NAMES else None
+
+
+def conexiune_citire():
+    """
+    Următoarea conexiune de citire (round-robin), pentru QuerySet.using_db().
+    Returnează None dacă nu există conexiuni de citire, iar Tortoise folosește
+    atunci conexiunea implicită.
+    """
+    if _read_cycle is None:
+        return None
+    return Tortoise.get_connection(next(_read_cycle))
+
+
+async def deschide_conexiunile() -> None:
+    """
+    Deschide toate conexiunile la pornire. Tortoise le deschide leneș, la prima
+    interogare, iar interogările concurente de pe o conexiune încă nedeschisă
+    pot primi obiectul aiosqlite înainte de conectare ("Connection closed").
+    Pe PostgreSQL pool-ul pornește cu PG_POOL_MIN conexiuni deja deschise.
+    """
+    for nume in CONNECTIONS:
+        await Tortoise.get_connection(nume).create_connection(with_db=True)
+
+
+async def rezerva_iduri(conn, model, numar: int) -> List[int]:
+    """
+    `numar` id-uri noi, crescătoare, pentru rânduri inserate apoi cu id
+    explicit (bulk_create nu întoarce id-urile). PostgreSQL: din secvența
+    cheii primare. SQLite: sqlite_sequence (AUTOINCREMENT) este avansată cu
+    `numar` în tranzacția `conn`, care ține de aici lock-ul de scriere până
+    la commit, deci id-urile nu pot fi luate de alt scriitor.
+    """
+    tabela = model._meta.db_table
+    cheie = model._meta.db_pk_column
+    if conn.capabilities.dialect == "sqlite":
+        await conn.execute_query(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT ?, 0 "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+            [tabela, tabela],
+        )
+        await conn.execute_query(
+            f'UPDATE sqlite_sequence SET seq = max(seq, (SELECT coalesce(max("{cheie}"), 0) FROM "{tabela}")) + ? '
+            f"WHERE name = ?",
+            [numar, tabela],
+        )
+        _, randuri = await conn.execute_query("SELECT seq FROM sqlite_sequence WHERE name = ?", [tabela])
+        ultimul = randuri[0]["seq"]
+        return list(range(ultimul - numar + 1, ultimul + 1))
+    _, randuri = await conn.execute_query(
+        "SELECT nextval(pg_get_serial_sequence($1, $2)) AS id FROM generate_series(1, $3)",
+        [f'"{tabela}"', cheie, numar],
+    )
+    return [rand["id"] for rand in randuri]
+
+
+async def sincronizeaza_secventa(conn, model) -> None:
+    """PostgreSQL: aduce secvența cheii primare după rânduri inserate cu id explicit."""
+    tabela = model._meta.db_table
+    cheie = model._meta.db_pk_column
+    await conn.execute_query(
+        f'SELECT setval(pg_get_serial_sequence($1, $2), COALESCE(MAX("{cheie}"), 1), MAX("{cheie}") IS NOT NULL) '
+        f'FROM "{tabela}"',
+        [f'"{tabela}"', cheie],
+    )
@@ -1,6 +1,36 @@
+from datetime import time
+from typing import Any, Optional, Union
+
 from tortoise import fields
 from tortoise.models import Model
 
+
+class OraField(fields.TimeField):
+    """
+    Oră fără fus orar, stocată ca TIME. TimeField din Tortoise atașează fusul
+    implicit la citire și folosește TIMETZ pe PostgreSQL; programările au ore
+    locale, deci aici valorile rămân `datetime.time` naive. Pe SQLite se
+    stochează ca text ISO (HH:MM:SS), care se ordonează corect în index.
+    """
+
+    class _db_postgres:
+        SQL_TYPE = "TIME"
+
+    def to_python_value(self, value: Any) -> Optional[time]:
+        if isinstance(value, str):
+            value = time.fromisoformat(value)
+        self.validate(value)
+        return value
+
+    def to_db_value(self, value: Any, instance: Any) -> Union[time, str, None]:
+        if isinstance(value, str):
+            value = time.fromisoformat(value)
+        # self.model, nu instance: UPDATE-urile din QuerySet.update() nu au instanță
+        if value is not None and self.model._meta.db.capabilities.dialect == "sqlite":
+            return value.isoformat()
+        return value
+
+
 class Users(Model):
     id = fields.IntField(pk=True)
     username = fields.CharField(max_length=50, unique=True)
@@ -48,6 +78,8 @@ class PersoanaJob(Model):
     class Meta:
         table = "PersoanaJob"
         unique_together = [("persoana", "job")]
+        # Acoperă /persoane?job_id= (job -> persoane) fără acces la tabelă
+        indexes = [("job", "persoana")]
 
 class Programari(Model):
     id = fields.IntField(pk=True)
@@ -55,13 +87,62 @@ class Programari(Model):
     job = fields.ForeignKeyField('models.Job', related_name='programari', null=True, on_delete=fields.SET_NULL)
     serviciu = fields.ForeignKeyField('models.Servicii', related_name='programari', null=True, on_delete=fields.SET_NULL)
     data = fields.DateField()  # Tip corect pentru date
-    ora = fields.CharField(max_length=5)  # Format HH:MM
+    ora = OraField()
     observatii = fields.TextField(null=True)
     nume = fields.CharField(max_length=100, null=True)
     prenume = fields.CharField(max_length=100, null=True)
     email = fields.CharField(max_length=200, null=True)
     telefon = fields.CharField(max_length=20, null=True)
+    # Crește la fiecare PUT; servit ca ETag și verificat din If-Match
+    version = fields.IntField(default=1)
+
+
+    class Meta:
+        table = "Programari"
+        indexes = [
+            ("data", "ora", "id"),        # paginarea keyset și ferestrele (data, ora)
+            ("persoana", "data", "ora"),  # /programari?persoana_id= și indexul de ocupare
+            ("job", "data"),              # /programari?job_id=
+        ]
+
 
+# Programările mai vechi decât orizontul de arhivare, mutate din Programari de
+# src/arhivare.py. Păstrează id-ul original; relațiile sunt simple id-uri (fără
+# chei străine), ca istoricul să nu depindă de catalogul curent.
+class ProgramariArhiva(Model):
+    id = fields.IntField(pk=True, generated=False)
+    persoana_id = fields.IntField(null=True)
+    job_id = fields.IntField(null=True)
+    serviciu_id = fields.IntField(null=True)
+    data = fields.DateField()
+    ora = OraField()
+    observatii = fields.TextField(null=True)
+    nume = fields.CharField(max_length=100, null=True)
+    prenume = fields.CharField(max_length=100, null=True)
+    email = fields.CharField(max_length=200, null=True)
+    telefon = fields.CharField(max_length=20, null=True)
+    arhivat_la = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "Programari_archive"
+        indexes = [
+            ("data", "ora", "id"),         # paginarea keyset pe (data, ora, id)
+            ("persoana_id", "data"),
+            ("job_id", "data"),
+        ]
+
+
+# Numărul de programări pe zi, job și persoană (inclusiv cele arhivate), ținut
+# la zi de trigger-e pe Programari și Programari_archive (src/statistici.py).
+# Programările fără job sau fără persoană sunt numărate cu id-ul 0, ca
+# upsert-ul să găsească rândul (NULL-urile nu intră în constrângerea unică).
+class StatisticiZilnice(Model):
+    id = fields.IntField(pk=True)
+    data = fields.DateField()
+    job_id = fields.IntField(default=0)
+    persoana_id = fields.IntField(default=0)
+    numar = fields.IntField(default=0)
 
     class Meta:
-        table = "Programari"
\ No newline at end of file
+        table = "Statistici_zilnice"
+        unique_together = [("data", "job_id", "persoana_id")]
@@ -0,0 +1,109 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            -- Contoarele pentru GET /statistici (src/statistici.py): programări pe zi,
+            -- job și persoană, ținute la zi de trigger-e și calculate o dată aici
+            CREATE TABLE IF NOT EXISTS "Statistici_zilnice" (
+                "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                "data" DATE NOT NULL,
+                "job_id" INT NOT NULL  DEFAULT 0,
+                "persoana_id" INT NOT NULL  DEFAULT 0,
+                "numar" INT NOT NULL  DEFAULT 0,
+                CONSTRAINT "uid_Statistici__data_9d3fe2" UNIQUE ("data", "job_id", "persoana_id")
+            );
+            CREATE TRIGGER IF NOT EXISTS "Statistici_zilnice_Programari_ai" AFTER INSERT ON "Programari" BEGIN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (NEW."data", coalesce(NEW."job_id", 0), coalesce(NEW."persoana_id", 0), 1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END;
+            CREATE TRIGGER IF NOT EXISTS "Statistici_zilnice_Programari_au" AFTER UPDATE OF "data", "job_id", "persoana_id" ON "Programari"
+            WHEN OLD."data" IS NOT NEW."data" OR OLD."job_id" IS NOT NEW."job_id" OR OLD."persoana_id" IS NOT NEW."persoana_id" BEGIN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (OLD."data", coalesce(OLD."job_id", 0), coalesce(OLD."persoana_id", 0), -1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (NEW."data", coalesce(NEW."job_id", 0), coalesce(NEW."persoana_id", 0), 1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END;
+            CREATE TRIGGER IF NOT EXISTS "Statistici_zilnice_Programari_ad" AFTER DELETE ON "Programari" BEGIN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (OLD."data", coalesce(OLD."job_id", 0), coalesce(OLD."persoana_id", 0), -1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS "Statistici_zilnice_Programari_archive_ai" AFTER INSERT ON "Programari_archive" BEGIN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (NEW."data", coalesce(NEW."job_id", 0), coalesce(NEW."persoana_id", 0), 1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END;
+            CREATE TRIGGER IF NOT EXISTS "Statistici_zilnice_Programari_archive_au" AFTER UPDATE OF "data", "job_id", "persoana_id" ON "Programari_archive"
+            WHEN OLD."data" IS NOT NEW."data" OR OLD."job_id" IS NOT NEW."job_id" OR OLD."persoana_id" IS NOT NEW."persoana_id" BEGIN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (OLD."data", coalesce(OLD."job_id", 0), coalesce(OLD."persoana_id", 0), -1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (NEW."data", coalesce(NEW."job_id", 0), coalesce(NEW."persoana_id", 0), 1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END;
+            CREATE TRIGGER IF NOT EXISTS "Statistici_zilnice_Programari_archive_ad" AFTER DELETE ON "Programari_archive" BEGIN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (OLD."data", coalesce(OLD."job_id", 0), coalesce(OLD."persoana_id", 0), -1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END;
+            DELETE FROM "Statistici_zilnice";
+            INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar")
+                SELECT "data", coalesce("job_id", 0), coalesce("persoana_id", 0), count(*) FROM (
+                    SELECT "data", "job_id", "persoana_id" FROM "Programari" UNION ALL SELECT "data", "job_id", "persoana_id" FROM "Programari_archive"
+                ) AS sursa
+                GROUP BY 1, 2, 3;
+        """
+    return """
+        -- Contoarele pentru GET /statistici; pe PostgreSQL trigger-ele folosesc o funcție plpgsql
+        CREATE TABLE IF NOT EXISTS "Statistici_zilnice" (
+            "id" SERIAL NOT NULL PRIMARY KEY,
+            "data" DATE NOT NULL,
+            "job_id" INT NOT NULL  DEFAULT 0,
+            "persoana_id" INT NOT NULL  DEFAULT 0,
+            "numar" INT NOT NULL  DEFAULT 0,
+            CONSTRAINT "uid_Statistici__data_9d3fe2" UNIQUE ("data", "job_id", "persoana_id")
+        );
+        CREATE OR REPLACE FUNCTION "Statistici_zilnice_actualizeaza"() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (OLD."data", coalesce(OLD."job_id", 0), coalesce(OLD."persoana_id", 0), -1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar") VALUES (NEW."data", coalesce(NEW."job_id", 0), coalesce(NEW."persoana_id", 0), 1) ON CONFLICT ("data", "job_id", "persoana_id") DO UPDATE SET "numar" = "Statistici_zilnice"."numar" + excluded."numar";
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari" ON "Programari";
+        CREATE TRIGGER "Statistici_zilnice_Programari" AFTER INSERT OR DELETE ON "Programari"
+            FOR EACH ROW EXECUTE FUNCTION "Statistici_zilnice_actualizeaza"();
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_au" ON "Programari";
+        CREATE TRIGGER "Statistici_zilnice_Programari_au" AFTER UPDATE OF "data", "job_id", "persoana_id" ON "Programari"
+            FOR EACH ROW WHEN (OLD."data" IS DISTINCT FROM NEW."data" OR OLD."job_id" IS DISTINCT FROM NEW."job_id" OR OLD."persoana_id" IS DISTINCT FROM NEW."persoana_id") EXECUTE FUNCTION "Statistici_zilnice_actualizeaza"();
+
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive" ON "Programari_archive";
+        CREATE TRIGGER "Statistici_zilnice_Programari_archive" AFTER INSERT OR DELETE ON "Programari_archive"
+            FOR EACH ROW EXECUTE FUNCTION "Statistici_zilnice_actualizeaza"();
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive_au" ON "Programari_archive";
+        CREATE TRIGGER "Statistici_zilnice_Programari_archive_au" AFTER UPDATE OF "data", "job_id", "persoana_id" ON "Programari_archive"
+            FOR EACH ROW WHEN (OLD."data" IS DISTINCT FROM NEW."data" OR OLD."job_id" IS DISTINCT FROM NEW."job_id" OR OLD."persoana_id" IS DISTINCT FROM NEW."persoana_id") EXECUTE FUNCTION "Statistici_zilnice_actualizeaza"();
+        DELETE FROM "Statistici_zilnice";
+        INSERT INTO "Statistici_zilnice" ("data", "job_id", "persoana_id", "numar")
+            SELECT "data", coalesce("job_id", 0), coalesce("persoana_id", 0), count(*) FROM (
+                SELECT "data", "job_id", "persoana_id" FROM "Programari" UNION ALL SELECT "data", "job_id", "persoana_id" FROM "Programari_archive"
+            ) AS sursa
+            GROUP BY 1, 2, 3;
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_ai";
+            DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_au";
+            DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_ad";
+            DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive_ai";
+            DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive_au";
+            DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive_ad";
+            DROP TABLE IF EXISTS "Statistici_zilnice";
+        """
+    return """
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari" ON "Programari";
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_au" ON "Programari";
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive" ON "Programari_archive";
+        DROP TRIGGER IF EXISTS "Statistici_zilnice_Programari_archive_au" ON "Programari_archive";
+        DROP FUNCTION IF EXISTS "Statistici_zilnice_actualizeaza"();
+        DROP TABLE IF EXISTS "Statistici_zilnice";
+    """
@@ -0,0 +1,26 @@
+from tortoise import BaseDBAsyncClient
+
+from src.cautare import SQL_SQLITE, SQL_SQLITE_POPULARE, TRIGGERE_SQLITE
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        # Telefonul din indexul FTS5: prefixul +40/0040 devine 0, ca în
+        # cuvinte_cautate() (src/cautare.py), deci "0712" găsește și "+40712345678".
+        # Trigger-ele create de migrarea 9 înainte de această schimbare sunt
+        # înlocuite și indexul repopulat
+        stergere = "".join(f'DROP TRIGGER IF EXISTS "{nume}";\n' for nume in TRIGGERE_SQLITE)
+        return stergere + SQL_SQLITE + SQL_SQLITE_POPULARE
+    return """
+        -- PostgreSQL caută subșiruri în cifrele telefonului: "0712" se găsește
+        -- și în "40712345678", deci indexul trigram rămâne neschimbat
+        SELECT 1;
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # Formatul anterior nu mai este păstrat: migrarea 9 creează deja formatul
+    # curent din src/cautare.py
+    return """
+        SELECT 1;
+    """
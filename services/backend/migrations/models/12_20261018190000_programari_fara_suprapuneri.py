@@ -0,0 +1,25 @@
+from tortoise import BaseDBAsyncClient
+
+from src.cache.disponibilitate import CONSTRANGERE_POSTGRES, sql_constrangere_postgres
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            -- Doar pentru PostgreSQL: pe SQLite un singur worker scrie, iar
+            -- indexul de ocupare din memorie refuză suprapunerile
+            SELECT 1;
+        """
+    # Mai mulți workeri sau noduri: fiecare are propriul index de ocupare,
+    # deci suprapunerile sunt refuzate și de baza de date
+    return sql_constrangere_postgres()
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            SELECT 1;
+        """
+    return f"""
+        ALTER TABLE "Programari" DROP CONSTRAINT IF EXISTS "{CONSTRANGERE_POSTGRES}";
+    """
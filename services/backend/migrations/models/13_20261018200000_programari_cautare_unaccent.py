@@ -0,0 +1,27 @@
+from tortoise import BaseDBAsyncClient
+
+from src.cautare import FUNCTIE_UNACCENT, INDEX_TRGM, INDEX_TRGM_VECHI, SQL_POSTGRES
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            -- Doar pentru PostgreSQL: FTS5 ignoră deja diacriticele
+            -- (tokenize = 'unicode61 remove_diacritics 2')
+            SELECT 1;
+        """
+    # Indexul trigram fără diacritice (unaccent), ca "stefan" să găsească
+    # "Ștefan" ca pe SQLite; înlocuiește indexul din migrarea 9
+    return SQL_POSTGRES
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            SELECT 1;
+        """
+    return f"""
+        DROP INDEX IF EXISTS "{INDEX_TRGM}";
+        DROP FUNCTION IF EXISTS "{FUNCTIE_UNACCENT}"(text);
+        CREATE INDEX IF NOT EXISTS "{INDEX_TRGM_VECHI}" ON "Programari" USING GIN ((coalesce("nume", '') || ' ' || coalesce("prenume", '') || ' ' || coalesce("email", '') || ' ' || regexp_replace(coalesce("telefon", ''), '\\D', '', 'g')) gin_trgm_ops);
+    """
@@ -1,8 +1,11 @@
 from tortoise import BaseDBAsyncClient
+from tortoise.utils import get_schema_sql
 
 
 async def upgrade(db: BaseDBAsyncClient) -> str:
-    return """
+    # Ramura SQLite prima: apply_migration.py citește primul SQL din upgrade()
+    if db.capabilities.dialect == "sqlite":
+        return """
         CREATE TABLE IF NOT EXISTS "Job" (
     "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
     "nume" VARCHAR(100) NOT NULL UNIQUE,
@@ -78,6 +81,10 @@ CREATE TABLE IF NOT EXISTS "aerich" (
     "app" VARCHAR(100) NOT NULL,
     "content" JSON NOT NULL
 );"""
+    # Pe PostgreSQL nu există baze create după schema veche: schema inițială
+    # este cea a modelelor curente, iar migrările următoare folosesc
+    # IF [NOT] EXISTS, deci nu schimbă nimic peste ea
+    return get_schema_sql(db, safe=True)
 
 
 async def downgrade(db: BaseDBAsyncClient) -> str:
@@ -1,50 +1,69 @@
 from tortoise import BaseDBAsyncClient
 
+from migrations.reconstruire import Reconstruire, sql_blocant
+
+
+# Elimină coloanele suplimentare din Persoane și Servicii. apply_migration.py
+# reconstruiește tabelele online, în bucăți; aerich rulează sql_blocant().
+# PostgreSQL elimină coloanele direct, fără reconstruire.
+RECONSTRUIRI = [
+    Reconstruire(
+        "Persoane",
+        creare="""
+            CREATE TABLE "new_Persoane" (
+                "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                "nume" VARCHAR(100) NOT NULL,
+                "prenume" VARCHAR(100) NOT NULL,
+                "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL
+            )
+        """,
+        coloane=["id", "nume", "prenume", "job_id"],
+        indecsi=[
+            'CREATE INDEX IF NOT EXISTS "idx_Persoane_job_id_58d8bb" ON "Persoane" ("job_id")',
+            'CREATE INDEX IF NOT EXISTS "idx_Persoane_nume_b0ad65" ON "Persoane" ("nume", "prenume")',
+        ],
+    ),
+    Reconstruire(
+        "Servicii",
+        creare="""
+            CREATE TABLE "new_Servicii" (
+                "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                "descriere" VARCHAR(255) NOT NULL,
+                "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL
+            )
+        """,
+        coloane=["id", "descriere", "job_id"],
+        indecsi=[
+            'CREATE INDEX IF NOT EXISTS "idx_Servicii_job_id_87a4e7" ON "Servicii" ("job_id")',
+            'CREATE INDEX IF NOT EXISTS "idx_Servicii_descrie_a80feb" ON "Servicii" ("descriere")',
+        ],
+    ),
+]
+
 
 async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return sql_blocant(RECONSTRUIRI)
     return """
-        -- Elimină coloanele suplimentare din Persoane
-        CREATE TABLE "new_Persoane" (
-            "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
-            "nume" VARCHAR(100) NOT NULL,
-            "prenume" VARCHAR(100) NOT NULL,
-            "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL
-        );
-
-        -- Copiază datele din tabela veche
-        INSERT INTO "new_Persoane" (id, nume, prenume, job_id)
-        SELECT id, nume, prenume, job_id FROM "Persoane";
-
-        -- Șterge tabela veche și redenumește cea nouă
-        DROP TABLE "Persoane";
-        ALTER TABLE "new_Persoane" RENAME TO "Persoane";
-
-        -- Recreează indecșii
-        CREATE INDEX IF NOT EXISTS "idx_Persoane_job_id_58d8bb" ON "Persoane" ("job_id");
-        CREATE INDEX IF NOT EXISTS "idx_Persoane_nume_b0ad65" ON "Persoane" ("nume", "prenume");
-
-        -- Elimină coloanele suplimentare din Servicii
-        CREATE TABLE "new_Servicii" (
-            "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
-            "descriere" VARCHAR(255) NOT NULL,
-            "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL
-        );
-
-        -- Copiază datele din tabela veche
-        INSERT INTO "new_Servicii" (id, descriere, job_id)
-        SELECT id, descriere, job_id FROM "Servicii";
-
-        -- Șterge tabela veche și redenumește cea nouă
-        DROP TABLE "Servicii";
-        ALTER TABLE "new_Servicii" RENAME TO "Servicii";
-
-        -- Recreează indecșii
-        CREATE INDEX IF NOT EXISTS "idx_Servicii_job_id_87a4e7" ON "Servicii" ("job_id");
-        CREATE INDEX IF NOT EXISTS "idx_Servicii_descrie_a80feb" ON "Servicii" ("descriere");
+        ALTER TABLE "Persoane" DROP COLUMN IF EXISTS "email", DROP COLUMN IF EXISTS "telefon",
+            DROP COLUMN IF EXISTS "created_at", DROP COLUMN IF EXISTS "updated_at";
+        ALTER TABLE "Servicii" DROP COLUMN IF EXISTS "durata_min", DROP COLUMN IF EXISTS "pret",
+            DROP COLUMN IF EXISTS "created_at", DROP COLUMN IF EXISTS "updated_at";
     """
 
 
 async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect != "sqlite":
+        return """
+            ALTER TABLE "Persoane" ADD COLUMN IF NOT EXISTS "email" VARCHAR(200) UNIQUE,
+                ADD COLUMN IF NOT EXISTS "telefon" VARCHAR(50),
+                ADD COLUMN IF NOT EXISTS "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+            ALTER TABLE "Servicii" ADD COLUMN IF NOT EXISTS "durata_min" INT NOT NULL DEFAULT 30,
+                ADD COLUMN IF NOT EXISTS "pret" VARCHAR(40),
+                ADD COLUMN IF NOT EXISTS "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+        """
     return """
         -- Recreează Persoane cu coloanele suplimentare
         CREATE TABLE "new_Persoane" (
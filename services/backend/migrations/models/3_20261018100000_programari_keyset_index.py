@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        -- Index compus pentru paginarea keyset pe (data, ora, id)
+        CREATE INDEX IF NOT EXISTS "idx_Programari_data_ce1d15" ON "Programari" ("data", "ora", "id");
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_Programari_data_ce1d15";
+    """
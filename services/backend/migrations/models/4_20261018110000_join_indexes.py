@@ -0,0 +1,29 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        -- /persoane?job_id=: job -> persoana direct din index
+        CREATE INDEX IF NOT EXISTS "idx_PersoanaJob_job_id_c73f09" ON "PersoanaJob" ("job_id", "persoana_id");
+
+        -- /programari?persoana_id= și /programari?job_id=, ordonate după data
+        CREATE INDEX IF NOT EXISTS "idx_Programari_persoan_5f03ac" ON "Programari" ("persoana_id", "data");
+        CREATE INDEX IF NOT EXISTS "idx_Programari_job_id_aeceaa" ON "Programari" ("job_id", "data");
+
+        -- Indecșii pe o singură coloană sunt acoperiți de prefixul celor compuși
+        DROP INDEX IF EXISTS "idx_PersoanaJob_job_id_1a24cd";
+        DROP INDEX IF EXISTS "idx_Programari_persoan_400f77";
+        DROP INDEX IF EXISTS "idx_Programari_job_id_d041f7";
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_PersoanaJob_job_id_1a24cd" ON "PersoanaJob" ("job_id");
+        CREATE INDEX IF NOT EXISTS "idx_Programari_persoan_400f77" ON "Programari" ("persoana_id");
+        CREATE INDEX IF NOT EXISTS "idx_Programari_job_id_d041f7" ON "Programari" ("job_id");
+
+        DROP INDEX IF EXISTS "idx_PersoanaJob_job_id_c73f09";
+        DROP INDEX IF EXISTS "idx_Programari_persoan_5f03ac";
+        DROP INDEX IF EXISTS "idx_Programari_job_id_aeceaa";
+    """
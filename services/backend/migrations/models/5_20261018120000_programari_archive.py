@@ -0,0 +1,30 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        -- Programările vechi mutate de arhivator (src/arhivare.py)
+        CREATE TABLE IF NOT EXISTS "Programari_archive" (
+            "id" INT NOT NULL  PRIMARY KEY,
+            "persoana_id" INT,
+            "job_id" INT,
+            "serviciu_id" INT,
+            "data" DATE NOT NULL,
+            "ora" VARCHAR(5) NOT NULL,
+            "observatii" TEXT,
+            "nume" VARCHAR(100),
+            "prenume" VARCHAR(100),
+            "email" VARCHAR(200),
+            "telefon" VARCHAR(20),
+            "arhivat_la" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS "idx_Programari__data_3aa60c" ON "Programari_archive" ("data", "ora", "id");
+        CREATE INDEX IF NOT EXISTS "idx_Programari__persoan_4b9e3d" ON "Programari_archive" ("persoana_id", "data");
+        CREATE INDEX IF NOT EXISTS "idx_Programari__job_id_2e6535" ON "Programari_archive" ("job_id", "data");
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "Programari_archive";
+    """
@@ -0,0 +1,139 @@
+from tortoise import BaseDBAsyncClient
+
+from migrations.reconstruire import Reconstruire, citeste_coloanele, sql_blocant
+
+
+# ora devine TIME; SQLite nu poate schimba tipul unei coloane, deci tabelele
+# sunt reconstruite (online, în bucăți, de apply_migration.py); PostgreSQL
+# schimbă tipul direct. Valorile HH:MM
+# devin HH:MM:SS (formatul ISO scris de OraField), ca ordonarea textuală să
+# rămână corectă.
+ORA_ISO = """CASE WHEN length({r}."ora") = 5 THEN {r}."ora" || ':00' ELSE {r}."ora" END"""
+
+# Migrările 1-2 au creat coloanele clientului cu sufixul _client; modelul (și
+# bazele create din el) le numesc fără sufix
+COLOANE_CLIENT = {
+    "nume": "nume_client",
+    "prenume": "prenume_client",
+    "email": "email_client",
+    "telefon": "telefon_client",
+}
+
+RECONSTRUIRI = [
+    Reconstruire(
+        "Programari",
+        creare="""
+            CREATE TABLE "new_Programari" (
+                "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                "data" DATE NOT NULL,
+                "ora" TIME NOT NULL,
+                "observatii" TEXT,
+                "nume" VARCHAR(100),
+                "prenume" VARCHAR(100),
+                "email" VARCHAR(200),
+                "telefon" VARCHAR(20),
+                "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL,
+                "persoana_id" INT REFERENCES "Persoane" ("id") ON DELETE SET NULL,
+                "serviciu_id" INT REFERENCES "Servicii" ("id") ON DELETE SET NULL
+            )
+        """,
+        coloane=[
+            "id", "data", "ora", "observatii", "nume", "prenume", "email", "telefon",
+            "job_id", "persoana_id", "serviciu_id",
+        ],
+        expresii={"ora": ORA_ISO},
+        redenumiri=COLOANE_CLIENT,
+        indecsi=[
+            'CREATE INDEX "idx_Programari_data_ce1d15" ON "Programari" ("data", "ora", "id")',
+            'CREATE INDEX "idx_Programari_persoan_a0e19d" ON "Programari" ("persoana_id", "data", "ora")',
+            'CREATE INDEX "idx_Programari_job_id_aeceaa" ON "Programari" ("job_id", "data")',
+        ],
+    ),
+    Reconstruire(
+        "Programari_archive",
+        creare="""
+            CREATE TABLE "new_Programari_archive" (
+                "id" INT NOT NULL  PRIMARY KEY,
+                "persoana_id" INT,
+                "job_id" INT,
+                "serviciu_id" INT,
+                "data" DATE NOT NULL,
+                "ora" TIME NOT NULL,
+                "observatii" TEXT,
+                "nume" VARCHAR(100),
+                "prenume" VARCHAR(100),
+                "email" VARCHAR(200),
+                "telefon" VARCHAR(20),
+                "arhivat_la" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+            )
+        """,
+        coloane=[
+            "id", "persoana_id", "job_id", "serviciu_id", "data", "ora",
+            "observatii", "nume", "prenume", "email", "telefon", "arhivat_la",
+        ],
+        expresii={"ora": ORA_ISO},
+        indecsi=[
+            'CREATE INDEX "idx_Programari__data_3aa60c" ON "Programari_archive" ("data", "ora", "id")',
+            'CREATE INDEX "idx_Programari__persoan_4b9e3d" ON "Programari_archive" ("persoana_id", "data")',
+            'CREATE INDEX "idx_Programari__job_id_2e6535" ON "Programari_archive" ("job_id", "data")',
+        ],
+    ),
+]
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        await citeste_coloanele(db, RECONSTRUIRI)
+        return sql_blocant(RECONSTRUIRI)
+    return """
+        ALTER TABLE "Programari" ALTER COLUMN "ora" TYPE TIME USING "ora"::time;
+        ALTER TABLE "Programari_archive" ALTER COLUMN "ora" TYPE TIME USING "ora"::time;
+        -- Reconstruirea SQLite păstrează doar indecșii modelului
+        DROP INDEX IF EXISTS "idx_Programari_persoan_5f03ac";
+        CREATE INDEX IF NOT EXISTS "idx_Programari_persoan_a0e19d" ON "Programari" ("persoana_id", "data", "ora");
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect != "sqlite":
+        return """
+            ALTER TABLE "Programari" ALTER COLUMN "ora" TYPE VARCHAR(5) USING to_char("ora", 'HH24:MI');
+            ALTER TABLE "Programari_archive" ALTER COLUMN "ora" TYPE VARCHAR(5) USING to_char("ora", 'HH24:MI');
+        """
+    return """
+        PRAGMA foreign_keys=OFF;
+        BEGIN;
+
+        -- Coloanele clientului revin la numele din migrările 1-2
+        CREATE TABLE "new_Programari" (
+            "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+            "data" DATE NOT NULL,
+            "ora" VARCHAR(5) NOT NULL,
+            "observatii" TEXT,
+            "nume_client" VARCHAR(100),
+            "prenume_client" VARCHAR(100),
+            "email_client" VARCHAR(200),
+            "telefon_client" VARCHAR(50),
+            "status" VARCHAR(20) NOT NULL  DEFAULT 'pending',
+            "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL,
+            "persoana_id" INT REFERENCES "Persoane" ("id") ON DELETE SET NULL,
+            "serviciu_id" INT REFERENCES "Servicii" ("id") ON DELETE SET NULL
+        );
+        INSERT INTO "new_Programari" ("id", "data", "ora", "observatii", "nume_client", "prenume_client", "email_client", "telefon_client", "job_id", "persoana_id", "serviciu_id")
+            SELECT "id", "data", substr("ora", 1, 5), "observatii", "nume", "prenume", "email", "telefon", "job_id", "persoana_id", "serviciu_id"
+            FROM "Programari";
+        DELETE FROM sqlite_sequence WHERE name = 'new_Programari';
+        INSERT INTO sqlite_sequence (name, seq) SELECT 'new_Programari', seq FROM sqlite_sequence WHERE name = 'Programari';
+        DROP TABLE "Programari";
+        ALTER TABLE "new_Programari" RENAME TO "Programari";
+        CREATE INDEX "idx_Programari_data_ce1d15" ON "Programari" ("data", "ora", "id");
+        CREATE INDEX "idx_Programari_persoan_5f03ac" ON "Programari" ("persoana_id", "data");
+        CREATE INDEX "idx_Programari_job_id_aeceaa" ON "Programari" ("job_id", "data");
+
+        UPDATE "Programari_archive" SET "ora" = substr("ora", 1, 5);
+
+        COMMIT;
+        PRAGMA foreign_keys=ON;
+    """
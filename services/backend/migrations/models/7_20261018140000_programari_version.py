@@ -0,0 +1,56 @@
+from tortoise import BaseDBAsyncClient
+
+from migrations.reconstruire import Reconstruire, citeste_coloanele, sql_blocant
+
+
+# Downgrade pe SQLite: DROP COLUMN cere SQLite >= 3.35 (imaginea Docker are
+# 3.27), deci tabela este reconstruită fără "version", ca după migrarea 6
+FARA_VERSIUNE = [
+    Reconstruire(
+        "Programari",
+        creare="""
+            CREATE TABLE "new_Programari" (
+                "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                "data" DATE NOT NULL,
+                "ora" TIME NOT NULL,
+                "observatii" TEXT,
+                "nume" VARCHAR(100),
+                "prenume" VARCHAR(100),
+                "email" VARCHAR(200),
+                "telefon" VARCHAR(20),
+                "job_id" INT REFERENCES "Job" ("id") ON DELETE SET NULL,
+                "persoana_id" INT REFERENCES "Persoane" ("id") ON DELETE SET NULL,
+                "serviciu_id" INT REFERENCES "Servicii" ("id") ON DELETE SET NULL
+            )
+        """,
+        coloane=[
+            "id", "data", "ora", "observatii", "nume", "prenume", "email", "telefon",
+            "job_id", "persoana_id", "serviciu_id",
+        ],
+        indecsi=[
+            'CREATE INDEX "idx_Programari_data_ce1d15" ON "Programari" ("data", "ora", "id")',
+            'CREATE INDEX "idx_Programari_persoan_a0e19d" ON "Programari" ("persoana_id", "data", "ora")',
+            'CREATE INDEX "idx_Programari_job_id_aeceaa" ON "Programari" ("job_id", "data")',
+        ],
+    ),
+]
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            -- Versiunea rândului pentru If-Match pe PUT /programari/{id}
+            ALTER TABLE "Programari" ADD COLUMN "version" INT NOT NULL DEFAULT 1;
+        """
+    return """
+        ALTER TABLE "Programari" ADD COLUMN IF NOT EXISTS "version" INT NOT NULL DEFAULT 1;
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        await citeste_coloanele(db, FARA_VERSIUNE)
+        return sql_blocant(FARA_VERSIUNE)
+    return """
+        ALTER TABLE "Programari" DROP COLUMN "version";
+    """
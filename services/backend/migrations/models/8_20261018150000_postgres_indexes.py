@@ -0,0 +1,36 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            -- Doar pentru PostgreSQL
+            SELECT 1;
+        """
+    return """
+        -- Arhivatorul mută programările în ordinea datei, deci paginile arhivei
+        -- sunt corelate cu data: un index BRIN de câteva pagini restrânge
+        -- scanările pe intervale from/to fără costul unui B-tree la fiecare mutare
+        CREATE INDEX IF NOT EXISTS "idx_Programari__data_brin" ON "Programari_archive" USING BRIN ("data");
+
+        -- PUT /programari/{id} rescrie rândul (version + 1): cu spațiu liber în
+        -- pagină, actualizările care nu mută slotul (data, ora, persoana) sunt
+        -- HOT, fără intrări noi în indecși; autovacuum curăță mai des tabela
+        -- din care arhivatorul șterge în bucăți
+        ALTER TABLE "Programari" SET (
+            fillfactor = 90,
+            autovacuum_vacuum_scale_factor = 0.05,
+            autovacuum_analyze_scale_factor = 0.02
+        );
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+            SELECT 1;
+        """
+    return """
+        DROP INDEX IF EXISTS "idx_Programari__data_brin";
+        ALTER TABLE "Programari" RESET (fillfactor, autovacuum_vacuum_scale_factor, autovacuum_analyze_scale_factor);
+    """
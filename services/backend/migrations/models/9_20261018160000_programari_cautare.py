@@ -0,0 +1,26 @@
+from tortoise import BaseDBAsyncClient
+
+from src.cautare import (
+    INDEX_TRGM, INDEX_TRGM_VECHI, SQL_POSTGRES, SQL_SQLITE, SQL_SQLITE_POPULARE, TABELA_FTS, TRIGGERE_SQLITE,
+)
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # GET /programari/search: SQL-ul vine din src/cautare.py, ca migrarea, pornirea
+    # (asigura_indexul) și căutarea să folosească aceleași expresii
+    if db.capabilities.dialect == "sqlite":
+        # Index FTS5 pe datele clientului, ținut la zi de trigger-e
+        return SQL_SQLITE + SQL_SQLITE_POPULARE
+    # ILIKE '%cuvânt%' pe aceeași concatenare, din index trigram
+    return SQL_POSTGRES
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return "".join(f'DROP TRIGGER IF EXISTS "{nume}";\n' for nume in TRIGGERE_SQLITE) + (
+            f'DROP TABLE IF EXISTS "{TABELA_FTS}";\n'
+        )
+    return f"""
+        DROP INDEX IF EXISTS "{INDEX_TRGM}";
+        DROP INDEX IF EXISTS "{INDEX_TRGM_VECHI}";
+    """
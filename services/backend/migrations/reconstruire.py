@@ -0,0 +1,340 @@
+"""
+Reconstruirea online a tabelelor SQLite, pentru migrările care schimbă
+structura unei tabele (tip de coloană, coloane eliminate).
+
+SQLite nu poate modifica o coloană, deci tabela se reconstruiește: new_X cu
+noua structură, copierea datelor, DROP X, RENAME new_X -> X. Varianta
+blocantă (sql_blocant) face copierea într-o singură tranzacție, care ține
+lock-ul de scriere cât durează tot INSERT ... SELECT. reconstruieste_online
+face aceeași reconstruire fără oprirea aplicației:
+
+1. creează new_X, indecșii ei (încă goi, cu numele prefixate de "new_") și
+   trigger-e pe X care reproduc în new_X fiecare INSERT/UPDATE/DELETE venit
+   între timp din aplicație;
+2. copiază rândurile în bucăți ordonate după cheie, fiecare bucată într-o
+   tranzacție scurtă, cu o pauză între ele ca scrierile aplicației să
+   prindă lock-ul; X rămâne citibilă și scriibilă tot timpul;
+3. verifică numărul de rânduri și face schimbul (X -> old_X, new_X -> X)
+   într-o singură tranzacție scurtă, apoi șterge old_X; X are indecșii
+   tot timpul. RENAME mută trigger-ele proprii ale lui X (indexul FTS,
+   contoarele) pe old_X, deci în aceeași tranzacție ele sunt șterse de pe
+   old_X și recreate pe noua X, din textul lor citit înainte de schimb;
+4. redenumește indecșii la numele finale (doar în schemă, fără reconstruire).
+
+Dacă copierea, verificarea sau schimbul eșuează, trigger-ele și new_X sunt
+șterse înainte ca eroarea să fie propagată, ca scrierile aplicației în X să
+nu eșueze din cauza lor. Pentru fiecare pas se raportează cât a fost ținut
+lock-ul de scriere.
+Migrările declară reconstruirile în RECONSTRUIRI; apply_migration.py le
+rulează online, iar upgrade() întoarce pentru aerich varianta blocantă.
+"""
+
+import re
+import sqlite3
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+
+class Reconstruire:
+    """
+    tabela: tabela reconstruită; creare: CREATE TABLE "new_<tabela>" (...);
+    coloane: coloanele noii tabele; expresii: coloana -> expresie SQL pe rândul
+    vechi, unde {r} este rândul (implicit {r}."coloana"); redenumiri: coloana
+    nouă -> numele ei în tabela veche, folosit dacă tabela veche nu are deja
+    coloana nouă (vezi citeste_coloanele); indecsi: CREATE INDEX pe tabela
+    finală; cheie: coloana întreagă după care se copiază în bucăți.
+    """
+
+    def __init__(
+        self,
+        tabela: str,
+        creare: str,
+        coloane: Sequence[str],
+        expresii: Optional[Dict[str, str]] = None,
+        indecsi: Sequence[str] = (),
+        cheie: str = "id",
+        redenumiri: Optional[Dict[str, str]] = None,
+    ):
+        self.tabela = tabela
+        self.sursa = f'"{tabela}"'
+        self.noua = f"new_{tabela}"
+        self.veche = f"old_{tabela}"
+        self.creare = creare.strip()
+        self.coloane = list(coloane)
+        self.expresii = dict(expresii or {})
+        self.indecsi = [index.strip() for index in indecsi]
+        self.cheie = cheie
+        self.redenumiri = dict(redenumiri or {})
+        # Coloanele și trigger-ele (CREATE TRIGGER) tabelei vechi;
+        # necunoscute până la citeste_coloanele()
+        self.existente: Set[str] = set()
+        self.triggere: List[str] = []
+
+    def lista_coloane(self) -> str:
+        return ", ".join(f'"{coloana}"' for coloana in self.coloane)
+
+    def expresie(self, coloana: str) -> str:
+        if coloana in self.expresii:
+            return self.expresii[coloana]
+        if coloana in self.redenumiri and coloana not in self.existente:
+            return f'{{r}}."{self.redenumiri[coloana]}"'
+        return f'{{r}}."{coloana}"'
+
+    def valori(self, rand: str) -> str:
+        """Expresiile coloanelor noi calculate din `rand` (tabela veche sau NEW)."""
+        return ", ".join(self.expresie(coloana).replace("{r}", rand) for coloana in self.coloane)
+
+    def indecsi_noi(self) -> List[tuple]:
+        """
+        (nume final, nume temporar, CREATE INDEX pe new_X) pentru fiecare index:
+        numele finale sunt încă folosite de indecșii tabelei vechi.
+        """
+        rezultat = []
+        for index in self.indecsi:
+            nume = index.split('"')[1]
+            temporar = f"new_{nume}"
+            creare = index.replace(f'"{nume}"', f'"{temporar}"', 1)
+            creare = re.sub(rf'\bON\s+"{re.escape(self.tabela)}"', f'ON "{self.noua}"', creare, count=1)
+            rezultat.append((nume, temporar, creare))
+        return rezultat
+
+    def sql_triggere_proprii(self) -> str:
+        """
+        Trigger-ele tabelei, fără cele temporare ale reconstruirii online:
+        DROP TABLE și RENAME le iau cu tabela veche, deci se recreează.
+        """
+        temporare = ", ".join(f"'{self.noua}_{sufix}'" for sufix in ("ai", "au", "ad"))
+        return (
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            f"AND tbl_name = '{self.tabela}' AND name NOT IN ({temporare}) ORDER BY name"
+        )
+
+    def autoincrement(self) -> bool:
+        return "AUTOINCREMENT" in self.creare.upper()
+
+    def sql_secventa(self) -> List[str]:
+        # Secvența AUTOINCREMENT a tabelei vechi trece la cea nouă: id-urile
+        # folosite deja (inclusiv cele arhivate sau șterse) nu se refolosesc
+        return [
+            f"DELETE FROM sqlite_sequence WHERE name = '{self.noua}'",
+            f"INSERT INTO sqlite_sequence (name, seq) "
+            f"SELECT '{self.noua}', seq FROM sqlite_sequence WHERE name = '{self.tabela}'",
+        ]
+
+
+async def citeste_coloanele(db, reconstruiri: Sequence[Reconstruire]) -> None:
+    """
+    Coloanele existente ale tabelelor reconstruite, pe o conexiune Tortoise,
+    înainte de sql_blocant(): o coloană din redenumiri se copiază sub numele
+    nou dacă tabela îl are deja (bază creată din modele), altfel sub cel vechi
+    (bază creată de migrări). Citește și trigger-ele tabelelor, pe care
+    sql_blocant() le recreează după DROP TABLE.
+    """
+    for r in reconstruiri:
+        randuri = await db.execute_query_dict(f'PRAGMA table_info("{r.tabela}")')
+        r.existente = {rand["name"] for rand in randuri}
+        r.triggere = [rand["sql"] for rand in await db.execute_query_dict(r.sql_triggere_proprii())]
+
+
+def sql_blocant(reconstruiri: Sequence[Reconstruire]) -> str:
+    """Reconstruirile ca un singur script, într-o tranzacție (pentru aerich)."""
+    pasi = ["PRAGMA foreign_keys=OFF;", "BEGIN;"]
+    for r in reconstruiri:
+        pasi.append(f"{r.creare};")
+        pasi.append(
+            f'INSERT INTO "{r.noua}" ({r.lista_coloane()})\n'
+            f'    SELECT {r.valori(r.sursa)} FROM {r.sursa};'
+        )
+        if r.autoincrement():
+            pasi.extend(f"{instructiune};" for instructiune in r.sql_secventa())
+        pasi.append(f'DROP TABLE "{r.tabela}";')
+        pasi.append(f'ALTER TABLE "{r.noua}" RENAME TO "{r.tabela}";')
+        pasi.extend(f"{index};" for index in r.indecsi)
+        pasi.extend(f"{trigger};" for trigger in r.triggere)
+    pasi += ["COMMIT;", "PRAGMA foreign_keys=ON;"]
+    return "\n".join(pasi) + "\n"
+
+
+def _sql_triggere(r: Reconstruire) -> List[str]:
+    insereaza = f'INSERT OR REPLACE INTO "{r.noua}" ({r.lista_coloane()}) VALUES ({r.valori("NEW")});'
+    sterge = f'DELETE FROM "{r.noua}" WHERE "{r.cheie}" = OLD."{r.cheie}";'
+    return [
+        f'CREATE TRIGGER "{r.noua}_ai" AFTER INSERT ON "{r.tabela}" BEGIN {insereaza} END',
+        f'CREATE TRIGGER "{r.noua}_au" AFTER UPDATE ON "{r.tabela}" BEGIN {sterge} {insereaza} END',
+        f'CREATE TRIGGER "{r.noua}_ad" AFTER DELETE ON "{r.tabela}" BEGIN {sterge} END',
+    ]
+
+
+def _sql_curatare(r: Reconstruire) -> List[str]:
+    return [
+        f'DROP TRIGGER IF EXISTS "{r.noua}_ai"',
+        f'DROP TRIGGER IF EXISTS "{r.noua}_au"',
+        f'DROP TRIGGER IF EXISTS "{r.noua}_ad"',
+        f'DROP TABLE IF EXISTS "{r.noua}"',
+    ]
+
+
+class _Pasi:
+    """Tranzacții scurte cronometrate: cât a fost ținut lock-ul de scriere."""
+
+    def __init__(self, conn: sqlite3.Connection, raport: Callable[[str], None]):
+        self.conn = conn
+        self.raport = raport
+        self.pasi: List[dict] = []
+
+    def tranzactie(self, nume: str, instructiuni: Sequence[str], afiseaza: bool = True) -> float:
+        start = time.perf_counter()
+        self.conn.execute("BEGIN IMMEDIATE")
+        lock = time.perf_counter()
+        try:
+            for instructiune in instructiuni:
+                self.conn.execute(instructiune)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        sfarsit = time.perf_counter()
+        pas = {
+            "pas": nume,
+            "asteptare_ms": round((lock - start) * 1000, 1),
+            "lock_ms": round((sfarsit - lock) * 1000, 1),
+        }
+        self.pasi.append(pas)
+        if afiseaza:
+            self.raport(f"  {nume:40} lock {pas['lock_ms']:>8.1f} ms")
+        return pas["lock_ms"]
+
+
+def _copiaza(conn, pasi: "_Pasi", r: Reconstruire, bucata: int, pauza: float, raport) -> None:
+    bucati = 0
+    lock_total = 0.0
+    lock_maxim = 0.0
+    ultima: Optional[int] = None
+    copiere = (
+        f'INSERT OR IGNORE INTO "{r.noua}" ({r.lista_coloane()}) '
+        f'SELECT {r.valori(r.sursa)} FROM {r.sursa} '
+    )
+    while True:
+        # Capătul bucății se citește în afara tranzacției de scriere
+        conditie = f'WHERE "{r.cheie}" > {ultima}' if ultima is not None else "WHERE 1"
+        capat = conn.execute(
+            f'SELECT "{r.cheie}" FROM "{r.tabela}" {conditie} ORDER BY "{r.cheie}" '
+            f"LIMIT 1 OFFSET {bucata - 1}"
+        ).fetchone()
+        interval = conditie + (f' AND "{r.cheie}" <= {capat[0]}' if capat else "")
+        lock = pasi.tranzactie("copiere", [copiere + interval], afiseaza=False)
+        bucati += 1
+        lock_total += lock
+        lock_maxim = max(lock_maxim, lock)
+        if capat is None:
+            break
+        ultima = capat[0]
+        time.sleep(pauza)
+    copiate = conn.execute(f'SELECT count(*) FROM "{r.noua}"').fetchone()[0]
+    raport(f"  {'copiere':40} lock {lock_maxim:>8.1f} ms  maxim pe bucată; "
+           f"{bucati} bucăți, {lock_total:.0f} ms în total, {copiate} rânduri")
+
+    # Trigger-ele țin new_X la zi, deci numerele trebuie să fie egale
+    # (citite în același instantaneu)
+    vechi, noi = conn.execute(
+        f'SELECT (SELECT count(*) FROM "{r.tabela}"), (SELECT count(*) FROM "{r.noua}")'
+    ).fetchone()
+    if vechi != noi:
+        raise RuntimeError(f'"{r.tabela}": {vechi} rânduri, "{r.noua}": {noi}; reconstruire anulată')
+
+
+def _schimba(conn, pasi: "_Pasi", r: Reconstruire) -> None:
+    # Schimbul doar redenumește: DROP pe tabela veche eliberează toate
+    # paginile ei, deci se face separat, după ce aplicația folosește deja
+    # tabela nouă. legacy_alter_table ține cheile străine din celelalte
+    # tabele pe numele "X", nu pe "old_X". Trigger-ele lui X trec la
+    # RENAME pe old_X și ar dispărea cu ea: se recreează pe X, cu textul
+    # citit înainte de schimb (care se referă deja la "X").
+    triggere = conn.execute(r.sql_triggere_proprii()).fetchall()
+    schimb = [
+        f'DROP TRIGGER "{r.noua}_ai"',
+        f'DROP TRIGGER "{r.noua}_au"',
+        f'DROP TRIGGER "{r.noua}_ad"',
+    ]
+    if r.autoincrement():
+        schimb.extend(r.sql_secventa())
+    schimb += [
+        f'ALTER TABLE "{r.tabela}" RENAME TO "{r.veche}"',
+        f'ALTER TABLE "{r.noua}" RENAME TO "{r.tabela}"',
+    ]
+    for nume, creare in triggere:
+        schimb += [f'DROP TRIGGER "{nume}"', creare]
+    conn.execute("PRAGMA legacy_alter_table=ON")
+    try:
+        pasi.tranzactie("schimb (RENAME)", schimb)
+    finally:
+        conn.execute("PRAGMA legacy_alter_table=OFF")
+
+
+def _redenumeste_indecsii(conn, pasi: "_Pasi", indecsi: Sequence[tuple]) -> None:
+    """
+    new_<index> -> <index>, după ce DROP old_X a eliberat numele. SQLite nu
+    are ALTER INDEX ... RENAME, deci se modifică direct sqlite_master, după
+    procedura din documentația ALTER TABLE (writable_schema + schema_version
+    incrementat, ca celelalte conexiuni să recitească schema). Indexul nu se
+    reconstruiește: se schimbă doar numele și textul CREATE INDEX.
+    """
+    versiune = conn.execute("PRAGMA schema_version").fetchone()[0]
+    instructiuni = []
+    for nume, temporar, _ in indecsi:
+        nume_sql = nume.replace("'", "''")
+        temporar_sql = temporar.replace("'", "''")
+        instructiuni.append(
+            f"UPDATE sqlite_master SET name = '{nume_sql}', "
+            f"sql = replace(sql, '\"{temporar_sql}\"', '\"{nume_sql}\"') "
+            f"WHERE type = 'index' AND name = '{temporar_sql}'"
+        )
+    instructiuni.append(f"PRAGMA schema_version = {versiune + 1}")
+    conn.execute("PRAGMA writable_schema=ON")
+    try:
+        pasi.tranzactie("redenumire indecși", instructiuni)
+    finally:
+        conn.execute("PRAGMA writable_schema=OFF")
+
+
+def reconstruieste_online(
+    conn: sqlite3.Connection,
+    reconstruiri: Sequence[Reconstruire],
+    bucata: int = 5000,
+    pauza: float = 0.02,
+    raport: Callable[[str], None] = print,
+) -> List[dict]:
+    """
+    Rulează reconstruirile pe o conexiune sqlite3 în autocommit
+    (isolation_level=None). Returnează pașii cu timpii de lock.
+    """
+    conn.execute("PRAGMA foreign_keys=OFF")
+    pasi = _Pasi(conn, raport)
+
+    for r in reconstruiri:
+        raport(f'Reconstruire online "{r.tabela}" (bucăți de {bucata})')
+        r.existente = {rand[1] for rand in conn.execute(f'PRAGMA table_info("{r.tabela}")')}
+        indecsi = r.indecsi_noi()
+        # O rulare întreruptă anterior se reia de la capăt. Indecșii se creează
+        # pe tabela goală, deci fiecare bucată copiată îi completează
+        pasi.tranzactie("pregatire", [
+            *_sql_curatare(r),
+            f'DROP TABLE IF EXISTS "{r.veche}"',
+            r.creare,
+            *(creare for _, _, creare in indecsi),
+            *_sql_triggere(r),
+        ])
+        try:
+            _copiaza(conn, pasi, r, bucata, pauza, raport)
+            _schimba(conn, pasi, r)
+        except BaseException:
+            # Fără trigger-e orfane: ele ar face să eșueze orice scriere în X
+            raport(f'  reconstruire "{r.tabela}" anulată; șterg trigger-ele și "{r.noua}"')
+            pasi.tranzactie("curatare", _sql_curatare(r))
+            raise
+        pasi.tranzactie(f"DROP {r.veche}", [f'DROP TABLE "{r.veche}"'])
+        if indecsi:
+            _redenumeste_indecsii(conn, pasi, indecsi)
+
+    conn.execute("PRAGMA foreign_keys=ON")
+    return pasi.pasi
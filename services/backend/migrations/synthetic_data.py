@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Generator de date sintetice la scară (milioane de rânduri)
+
+Spre deosebire de test_data.py (câteva rânduri fixe, pentru demo), acest
+script generează determinist, pornind de la --seed, volume configurabile
+pentru Job, Persoane, PersoanaJob, Servicii, Programari și Users.
+Rândurile sunt inserate cu executemany în tranzacții mari, folosind
+instrucțiunea INSERT generată de Tortoise pentru fiecare model (deci
+parametrii corecți pentru backend-ul folosit), fără a instanția modele.
+Trigger-ele indexului de căutare și ale contoarelor din Statistici_zilnice
+sunt scoase cât durează încărcarea și refăcute la final, cu indexul și
+contoarele recalculate o singură dată. Dacă încărcarea se oprește la
+jumătate, aplicația le reface la pornire.
+
+    python migrations/synthetic_data.py --programari 1000000 --seed 1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dtime
+from typing import Any, Dict, Iterable, Iterator, List, Type
+
+# Add current directory to path
+sys.path.append('.')
+
+import bcrypt
+from tortoise import Tortoise
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
+
+from db.config import sincronizeaza_secventa
+from db.models import (
+    Job, PersoanaJob, Persoane, Programari, ProgramariArhiva, Servicii, StatisticiZilnice, Users,
+)
+from src import cautare, statistici
+
+
+NUME = [
+    "Popescu", "Ionescu", "Popa", "Pop", "Radu", "Dumitru", "Stan", "Stoica", "Gheorghe",
+    "Matei", "Ciobanu", "Rusu", "Munteanu", "Constantin", "Marin", "Florea", "Ilie",
+    "Tudor", "Dinu", "Barbu", "Moldovan", "Lungu", "Nistor", "Cristea", "Toma",
+]
+PRENUME = [
+    "Ion", "Maria", "Andrei", "Elena", "Alexandru", "Ioana", "Mihai", "Ana", "Stefan",
+    "Gabriela", "Cristian", "Alina", "Florin", "Roxana", "Adrian", "Diana", "Vlad",
+    "Raluca", "George", "Simona", "Bogdan", "Irina", "Razvan", "Oana", "Radu",
+]
+DOMENII = ["gmail.com", "yahoo.com", "example.ro", "outlook.com"]
+JOBURI = ["Stomatolog", "Mecanic Auto", "Electrician", "Instalator", "Frizer", "Cosmetician",
+          "Kinetoterapeut", "Veterinar", "Tehnician IT", "Croitor"]
+OBSERVATII = [None, None, None, "Client nou", "Preferă dimineața", "Revenire", "Urgent"]
+
+
+def _bucati(elemente: Iterable, marime: int) -> Iterator[List]:
+    bucata = []
+    for element in elemente:
+        bucata.append(element)
+        if len(bucata) >= marime:
+            yield bucata
+            bucata = []
+    if bucata:
+        yield bucata
+
+
+def _sloturi(start: str = "08:00", sfarsit: str = "18:00", durata_min: int = 30) -> List[dtime]:
+    curent = datetime.strptime(start, "%H:%M")
+    limita = datetime.strptime(sfarsit, "%H:%M")
+    sloturi = []
+    while curent + timedelta(minutes=durata_min) <= limita:
+        sloturi.append(curent.time())
+        curent += timedelta(minutes=durata_min)
+    return sloturi
+
+
+class InserareBulk:
+    """
+    INSERT-ul Tortoise al unui model, executat cu executemany pe bucăți.
+    Rândurile sunt tupluri în ordinea din `campuri`; coloanele lipsă primesc
+    valoarea implicită a câmpului.
+    """
+
+    def __init__(self, conn, model: Type[Model], campuri: List[str], cu_id: bool):
+        executor = conn.executor_class(model=model, db=conn)
+        if cu_id:
+            coloane, self.sql = executor.regular_columns_all, executor.insert_query_all
+        else:
+            coloane, self.sql = executor.regular_columns, executor.insert_query
+        self.conn = conn
+        self.sqlite = conn.capabilities.dialect == "sqlite"
+
+        acum = datetime.now(timezone.utc)
+        self.pozitii: List[int] = []
+        self.implicite: List[Any] = []
+        for coloana in coloane:
+            camp = model._meta.fields_map[coloana]
+            if getattr(camp, "auto_now", False) or getattr(camp, "auto_now_add", False):
+                implicit = acum
+            elif camp.default is not None and not callable(camp.default):
+                implicit = camp.default
+            else:
+                implicit = None
+            self.pozitii.append(campuri.index(coloana) if coloana in campuri else -1)
+            self.implicite.append(self.valoare_db(implicit))
+
+    def valoare_db(self, valoare: Any) -> Any:
+        if self.sqlite and isinstance(valoare, (date, datetime, dtime)):
+            return valoare.isoformat()
+        return valoare
+
+    async def executa(self, randuri: Iterable[tuple], marime_bucata: int) -> int:
+        coloane = list(zip(self.pozitii, self.implicite))
+        total = 0
+        for bucata in _bucati(randuri, marime_bucata):
+            valori = [[rand[p] if p >= 0 else implicit for p, implicit in coloane] for rand in bucata]
+            await self.conn.execute_many(self.sql, valori)
+            total += len(valori)
+        return total
+
+
+async def genereaza(args) -> Dict[str, Dict[str, float]]:
+    rnd = random.Random(args.seed)
+    raport: Dict[str, Dict[str, float]] = {}
+
+    async def insereaza(model, campuri, randuri, cu_id=True):
+        start = time.perf_counter()
+        async with in_transaction() as conn:
+            numar = await InserareBulk(conn, model, campuri, cu_id).executa(randuri, args.bucata)
+            if cu_id and conn.capabilities.dialect == "postgres":
+                # Id-urile explicite nu avansează secvența SERIAL
+                await sincronizeaza_secventa(conn, model)
+        durata = time.perf_counter() - start
+        raport[model._meta.db_table] = {"randuri": numar, "secunde": round(durata, 2)}
+        print(f"{model._meta.db_table:12} {numar:>10} rânduri în {durata:6.2f}s")
+
+    # Job
+    nume_joburi = [JOBURI[j] if j < len(JOBURI) else f"Job {j + 1}" for j in range(args.joburi)]
+    await insereaza(Job, ["id", "nume"], ((j + 1, nume) for j, nume in enumerate(nume_joburi)))
+
+    # Servicii: servicii_per_job pentru fiecare job
+    servicii_job: Dict[int, List[int]] = {}
+    randuri_servicii = []
+    for j in range(1, args.joburi + 1):
+        for k in range(args.servicii_per_job):
+            sid = len(randuri_servicii) + 1
+            servicii_job.setdefault(j, []).append(sid)
+            randuri_servicii.append((sid, f"{nume_joburi[j - 1]} - serviciu {k + 1}", j))
+    await insereaza(Servicii, ["id", "descriere", "job_id"], randuri_servicii)
+
+    # Persoane + PersoanaJob (job principal + până la joburi_per_persoana - 1 joburi suplimentare)
+    joburi_persoana: Dict[int, List[int]] = {}
+    randuri_persoane = []
+    for p in range(1, args.persoane + 1):
+        principal = rnd.randint(1, args.joburi)
+        extra = rnd.sample(range(1, args.joburi + 1), min(args.joburi, rnd.randint(0, args.joburi_per_persoana - 1)))
+        joburi_persoana[p] = [principal] + [j for j in extra if j != principal]
+        randuri_persoane.append((p, rnd.choice(NUME), rnd.choice(PRENUME), principal))
+    await insereaza(Persoane, ["id", "nume", "prenume", "job_id"], randuri_persoane)
+    await insereaza(PersoanaJob, ["persoana_id", "job_id"], (
+        (p, j) for p, joburi in joburi_persoana.items() for j in joburi
+    ), cu_id=False)
+
+    # Programari: sloturi unice (persoana, zi, ora), extrase fără repetiție
+    sloturi = _sloturi()
+    zile = args.zile_trecut + args.zile_viitor
+    capacitate = args.persoane * zile * len(sloturi)
+    if args.programari > capacitate:
+        raise SystemExit(f"--programari depășește capacitatea de {capacitate} sloturi; măriți --persoane sau intervalul")
+    prima_zi = date.today() - timedelta(days=args.zile_trecut)
+    chei = sorted(rnd.sample(range(capacitate), args.programari),
+                  key=lambda c: (c // len(sloturi)) % zile)  # inserare aproximativ ordonată după dată
+
+    # Valorile repetitive se calculează o singură dată, nu per rând
+    sqlite = Tortoise.get_connection("default").capabilities.dialect == "sqlite"
+    date_zile = [prima_zi + timedelta(days=z) for z in range(zile)]
+    if sqlite:
+        date_zile = [d.isoformat() for d in date_zile]
+        sloturi = [s.isoformat() for s in sloturi]
+    persoana_job_servicii = {
+        p: [(j, servicii_job[j]) for j in joburi] for p, joburi in joburi_persoana.items()
+    }
+    emailuri = [[f"{pr.lower()}.{n.lower()}" for pr in PRENUME] for n in NUME]
+    aleator = rnd.random
+
+    def randuri_programari():
+        n_sloturi, n_nume, n_prenume = len(sloturi), len(NUME), len(PRENUME)
+        n_domenii, n_observatii = len(DOMENII), len(OBSERVATII)
+        for cheie in chei:
+            persoana, rest = divmod(cheie, zile * n_sloturi)
+            zi, slot = divmod(rest, n_sloturi)
+            persoana += 1
+            optiuni = persoana_job_servicii[persoana]
+            job, servicii = optiuni[int(aleator() * len(optiuni))]
+            i_nume, i_prenume = int(aleator() * n_nume), int(aleator() * n_prenume)
+            yield (
+                persoana,
+                job,
+                servicii[int(aleator() * len(servicii))],
+                date_zile[zi],
+                sloturi[slot],
+                NUME[i_nume],
+                PRENUME[i_prenume],
+                f"{emailuri[i_nume][i_prenume]}{int(aleator() * 1000)}@{DOMENII[int(aleator() * n_domenii)]}",
+                f"07{int(aleator() * 10 ** 8):08d}",
+                OBSERVATII[int(aleator() * n_observatii)],
+            )
+
+    await insereaza(Programari, [
+        "persoana_id", "job_id", "serviciu_id", "data", "ora",
+        "nume", "prenume", "email", "telefon", "observatii",
+    ], randuri_programari(), cu_id=False)
+
+    # Users: un singur hash bcrypt, refolosit (parola comună pentru toți)
+    parola = bcrypt.hashpw(args.parola.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    await insereaza(Users, ["id", "username", "password", "email", "role"], (
+        (u, f"user{u}", parola, f"user{u}@programari.ro", "admin" if u == 1 else "user")
+        for u in range(1, args.utilizatori + 1)
+    ))
+
+    return raport
+
+
+async def opreste_triggerele(conn) -> None:
+    """
+    Fără trigger-ele FTS și ale contoarelor pe durata încărcării: altfel
+    fiecare rând inserat (sau șters de --sterge) le execută pe toate.
+    """
+    if conn.capabilities.dialect == "sqlite":
+        nume = [*cautare.TRIGGERE_SQLITE, *statistici.TRIGGERE_SQLITE]
+        await conn.execute_script("".join(f'DROP TRIGGER IF EXISTS "{trigger}";\n' for trigger in nume))
+    else:
+        await conn.execute_script("".join(
+            f'DROP TRIGGER IF EXISTS "{trigger}" ON "{tabela}";\n'
+            for trigger, tabela in statistici.TRIGGERE_POSTGRES
+        ))
+
+
+async def reface_triggerele(conn) -> None:
+    """Trigger-ele lipsă sunt recreate, iar indexul și contoarele recalculate."""
+    start = time.perf_counter()
+    await cautare.asigura_indexul(conn)
+    await statistici.asigura_contoarele(conn)
+    print(f"Index de căutare și contoare refăcute în {time.perf_counter() - start:.2f}s")
+
+
+async def main(args) -> None:
+    db_url = args.db_url or os.getenv("DATABASE_URL", "sqlite:///tmp/db/programari.db")
+    await Tortoise.init(db_url=db_url, modules={"models": ["db.models"]})
+    await Tortoise.generate_schemas(safe=True)
+
+    try:
+        exista = await Job.all().count() > 0
+        if exista and not args.sterge:
+            print("Baza de date conține deja date; folosiți --sterge pentru a le înlocui.")
+            return
+
+        conn = Tortoise.get_connection("default")
+        await opreste_triggerele(conn)
+        if exista:
+            # Și arhiva și contoarele: altfel statisticile ar număra programări
+            # care nu mai există
+            for model in (
+                Programari, ProgramariArhiva, StatisticiZilnice, PersoanaJob, Users, Servicii, Persoane, Job,
+            ):
+                await model.all().delete()
+
+        start = time.perf_counter()
+        raport = await genereaza(args)
+        await reface_triggerele(conn)
+        total = sum(r["randuri"] for r in raport.values())
+        print(f"{'TOTAL':12} {total:>10} rânduri în {time.perf_counter() - start:6.2f}s")
+    finally:
+        await Tortoise.close_connections()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--programari", type=int, default=100000)
+    parser.add_argument("--persoane", type=int, default=500)
+    parser.add_argument("--joburi", type=int, default=10)
+    parser.add_argument("--servicii-per-job", type=int, default=8)
+    parser.add_argument("--joburi-per-persoana", type=int, default=2, help="maxim, inclusiv jobul principal")
+    parser.add_argument("--utilizatori", type=int, default=100)
+    parser.add_argument("--zile-trecut", type=int, default=365, help="istoric generat înainte de azi")
+    parser.add_argument("--zile-viitor", type=int, default=365, help="programări generate după azi")
+    parser.add_argument("--parola", default="parola123", help="parola tuturor utilizatorilor generați")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bucata", type=int, default=50000, help="rânduri per executemany")
+    parser.add_argument("--db-url", default=None, help="implicit DATABASE_URL")
+    parser.add_argument("--sterge", action="store_true", help="șterge datele existente înainte")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
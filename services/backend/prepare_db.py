@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Pregătirea bazei de date la pornirea containerului.
+
+Rulează migrările (apply_migration.py), generarea schemelor Tortoise și datele
+de test (migrations/test_data.py) doar dacă amprenta schemei salvată în bază
+(db/amprenta.py) diferă de cea a codului curent. Când schema este la zi,
+scriptul se oprește după o singură citire SQLite, fără să importe Tortoise.
+Pe PostgreSQL amprenta se citește prin Tortoise, iar migrările rulează cu
+apply_migration_postgres().
+
+    python prepare_db.py              # pașii doar dacă amprenta s-a schimbat
+    python prepare_db.py --forteaza   # toți pașii, indiferent de amprentă
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from db.amprenta import BASE_DIR, calculeaza_amprenta, citeste_amprenta, salveaza_amprenta
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///tmp/db/programari.db")
+POSTGRES_SCHEMES = ("postgres://", "postgresql://", "asyncpg://")
+
+
+def cale_sqlite(url: str) -> str:
+    # Aceeași regulă ca db/config.py, fără importul Tortoise de acolo
+    cale = url[len("sqlite://"):]
+    if cale != ":memory:" and not os.path.isabs(cale):
+        cale = str(BASE_DIR / cale)
+    return cale
+
+
+async def genereaza_schemele() -> None:
+    from tortoise import Tortoise
+    from db.config import TORTOISE_APP
+
+    await Tortoise.init(config=TORTOISE_APP)
+    try:
+        await Tortoise.generate_schemas()
+    finally:
+        await Tortoise.close_connections()
+
+
+async def pregateste_postgres(forteaza: bool, start: float) -> int:
+    from tortoise import Tortoise
+    from apply_migration import apply_migration_postgres
+    from db.amprenta import amprenta_din_db, salveaza_amprenta_in_db
+    from db.config import TORTOISE_APP
+
+    amprenta = calculeaza_amprenta()
+    faze = {}
+    await Tortoise.init(config=TORTOISE_APP)
+    try:
+        conn = Tortoise.get_connection("default")
+        if not forteaza and await amprenta_din_db(conn) == amprenta:
+            print(f"Schema la zi ({amprenta[:12]}), migrări și date de test sărite "
+                  f"în {(time.perf_counter() - start) * 1000:.1f} ms")
+            return 0
+
+        faza = time.perf_counter()
+        if not await apply_migration_postgres(conn):
+            return 1
+        faze["migrari"] = time.perf_counter() - faza
+
+        faza = time.perf_counter()
+        await Tortoise.generate_schemas(safe=True)
+        faze["scheme"] = time.perf_counter() - faza
+    finally:
+        await Tortoise.close_connections()
+
+    # test_data.py își deschide și își închide singur conexiunile
+    faza = time.perf_counter()
+    from migrations.test_data import upgrade as date_de_test
+    print(await date_de_test())
+    faze["date_test"] = time.perf_counter() - faza
+
+    await Tortoise.init(config=TORTOISE_APP)
+    try:
+        await salveaza_amprenta_in_db(Tortoise.get_connection("default"), amprenta)
+    finally:
+        await Tortoise.close_connections()
+    durate = ", ".join(f"{nume} {secunde * 1000:.0f} ms" for nume, secunde in faze.items())
+    print(f"Baza pregătită ({amprenta[:12]}) în {(time.perf_counter() - start) * 1000:.0f} ms: {durate}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--forteaza", action="store_true", help="ignoră amprenta salvată")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if DATABASE_URL.startswith(POSTGRES_SCHEMES):
+        return asyncio.run(pregateste_postgres(args.forteaza, start))
+    if not DATABASE_URL.startswith("sqlite://"):
+        print(f"prepare_db: backend nesuportat ({DATABASE_URL.split(':', 1)[0]}), nimic de făcut")
+        return 0
+
+    cale = cale_sqlite(DATABASE_URL)
+    amprenta = calculeaza_amprenta()
+    if not args.forteaza and citeste_amprenta(cale) == amprenta:
+        print(f"Schema la zi ({amprenta[:12]}), migrări și date de test sărite "
+              f"în {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+
+    os.makedirs(os.path.dirname(cale), exist_ok=True)
+    faze = {}
+
+    faza = time.perf_counter()
+    from apply_migration import apply_migration
+    if not apply_migration(cale):
+        return 1
+    faze["migrari"] = time.perf_counter() - faza
+
+    # Schemele înaintea datelor de test: tabelele pe care migrările nu le
+    # creează există deja când test_data.py le populează
+    faza = time.perf_counter()
+    asyncio.run(genereaza_schemele())
+    faze["scheme"] = time.perf_counter() - faza
+
+    faza = time.perf_counter()
+    from migrations.test_data import upgrade as date_de_test
+    print(asyncio.run(date_de_test()))
+    faze["date_test"] = time.perf_counter() - faza
+
+    # Amprenta se scrie ultima: o pornire întreruptă reia toți pașii
+    salveaza_amprenta(cale, amprenta)
+    durate = ", ".join(f"{nume} {secunde * 1000:.0f} ms" for nume, secunde in faze.items())
+    print(f"Baza pregătită ({amprenta[:12]}) în {(time.perf_counter() - start) * 1000:.0f} ms: {durate}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Arhivarea în fundal a programărilor vechi.
+
+Programările cu data mai veche decât orizontul (ARHIVARE_ORIZONT_ZILE) sunt
+mutate din Programari în Programari_archive în bucăți, fiecare bucată într-o
+tranzacție proprie (INSERT în arhivă + DELETE din Programari), astfel încât
+lock-ul de scriere e ținut scurt și requesturile pot scrie între bucăți.
+Tabela fierbinte rămâne mică, iar interogările cu data__gte scanează doar
+intervalul util. Istoricul se citește din /programari/arhiva.
+
+Cu mai mulți workeri, fiecare își rulează propriul arhivator; o bucată
+mutată deja de alt worker eșuează pe cheia primară a arhivei, se anulează
+și este numărată în "erori", fără pierderi de date.
+"""
+
+import asyncio
+import os
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from tortoise.transactions import in_transaction
+
+from db.models import Programari, ProgramariArhiva
+from src.logger import get_logger
+
+
+ARHIVARE_ACTIVA = os.getenv("ARHIVARE_ACTIVA", "1") not in ("0", "false", "False")
+# Programările mai vechi de atâtea zile (față de azi) sunt arhivate
+ARHIVARE_ORIZONT_ZILE = int(os.getenv("ARHIVARE_ORIZONT_ZILE", "90"))
+ARHIVARE_INTERVAL_SECUNDE = float(os.getenv("ARHIVARE_INTERVAL_SECUNDE", "3600"))
+ARHIVARE_BUCATA = int(os.getenv("ARHIVARE_BUCATA", "1000"))
+# Pauza dintre bucăți, ca scrierile din requesturi să prindă lock-ul
+ARHIVARE_PAUZA_SECUNDE = float(os.getenv("ARHIVARE_PAUZA_SECUNDE", "0.01"))
+
+COLOANE = [
+    "id", "persoana_id", "job_id", "serviciu_id", "data", "ora",
+    "observatii", "nume", "prenume", "email", "telefon",
+]
+
+log = get_logger("arhivare")
+
+
+class Arhivator:
+    def __init__(self, orizont_zile: int, bucata: int, interval: float, pauza: float):
+        self.orizont_zile = orizont_zile
+        self.bucata = bucata
+        self.interval = interval
+        self.pauza = pauza
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        self.rulari = 0
+        self.erori = 0
+        self.total_mutate = 0
+        self.ultima_rulare_mutate = 0
+        self.ultima_rulare_secunde = 0.0
+        self.ultima_rulare_ts: Optional[float] = None
+
+    def limita(self) -> date:
+        return date.today() - timedelta(days=self.orizont_zile)
+
+    async def muta_bucata(self, limita: date) -> int:
+        """Mută o bucată de programări mai vechi decât limita; returnează numărul de rânduri."""
+        async with in_transaction("default") as conn:
+            randuri = await Programari.filter(data__lt=limita).using_db(conn).order_by(
+                "data", "ora", "id"
+            ).limit(self.bucata).values(*COLOANE)
+            if not randuri:
+                return 0
+            await ProgramariArhiva.bulk_create(
+                [ProgramariArhiva(**rand) for rand in randuri], using_db=conn
+            )
+            await Programari.filter(id__in=[rand["id"] for rand in randuri]).using_db(conn).delete()
+        return len(randuri)
+
+    async def ruleaza(self) -> dict:
+        """O trecere completă: mută bucăți până nu mai rămâne nimic sub orizont."""
+        async with self._lock:
+            limita = self.limita()
+            start = time.perf_counter()
+            mutate = 0
+            try:
+                while True:
+                    numar = await self.muta_bucata(limita)
+                    mutate += numar
+                    if numar < self.bucata:
+                        break
+                    await asyncio.sleep(self.pauza)
+            except Exception:
+                self.erori += 1
+                log.exception("Eroare la arhivarea programărilor", extra={"mutate": mutate})
+            finally:
+                durata = time.perf_counter() - start
+                self.rulari += 1
+                self.total_mutate += mutate
+                self.ultima_rulare_mutate = mutate
+                self.ultima_rulare_secunde = round(durata, 3)
+                self.ultima_rulare_ts = time.time()
+
+            log.info(
+                "Arhivare terminată",
+                extra={"mutate": mutate, "durata_s": self.ultima_rulare_secunde, "limita": str(limita)},
+            )
+            return {"mutate": mutate, "secunde": self.ultima_rulare_secunde, "limita": limita}
+
+    async def _bucla(self) -> None:
+        while True:
+            await self.ruleaza()
+            await asyncio.sleep(self.interval)
+
+    def porneste(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._bucla())
+
+    async def opreste(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "activ": self._task is not None,
+            "orizont_zile": self.orizont_zile,
+            "rulari": self.rulari,
+            "erori": self.erori,
+            "total_mutate": self.total_mutate,
+            "ultima_rulare_mutate": self.ultima_rulare_mutate,
+            "ultima_rulare_secunde": self.ultima_rulare_secunde,
+            "ultima_rulare_ts": self.ultima_rulare_ts,
+        }
+
+
+arhivator = Arhivator(
+    ARHIVARE_ORIZONT_ZILE, ARHIVARE_BUCATA, ARHIVARE_INTERVAL_SECUNDE, ARHIVARE_PAUZA_SECUNDE
+)
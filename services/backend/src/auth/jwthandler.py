@@ -9,6 +9,7 @@ from fastapi.security.utils import get_authorization_scheme_param
 from jose import JWTError, jwt
 from tortoise.exceptions import DoesNotExist
 
+from src.auth.cache import user_cache
 from src.schemas.token import TokenData
 from src.schemas.users import UserOutSchema
 from db.models import Users
@@ -82,6 +83,10 @@ async def get_current_user(token: str = Depends(security)):
     except JWTError:
         raise credentials_exception
 
+    user = user_cache.get(token_data.username)
+    if user is not None:
+        return user
+
     try:
         user = await UserOutSchema.from_queryset_single(
             Users.get(username=token_data.username)
@@ -89,4 +94,5 @@ async def get_current_user(token: str = Depends(security)):
     except DoesNotExist:
         raise credentials_exception
 
+    user_cache.set(token_data.username, user)
     return user
\ No newline at end of file
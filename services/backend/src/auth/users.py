@@ -1,21 +1,18 @@
 from fastapi import HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
-from passlib.context import CryptContext
 from tortoise.exceptions import DoesNotExist
 
 from db.models import Users
+from src.auth.hashing import password_hasher
 from src.schemas.users import UserDatabaseSchema
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_hasher.hash(password)
 
 
 async def get_user(username: str):
@@ -31,10 +28,15 @@ async def validate_user(user: OAuth2PasswordRequestForm = Depends()):
             detail="Incorrect username or password",
         )
 
-    if not verify_password(user.password, db_user.password):
+    valid, new_hash = await verify_password(user.password, db_user.password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
 
+    # The configured bcrypt cost changed: store the upgraded hash
+    if new_hash:
+        await Users.filter(id=db_user.id).update(password=new_hash)
+
     return db_user
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Cache read-through în proces pentru datele de catalog (Job, Persoane, Servicii).
+
+Fiecare intrare ține valoarea deja serializabilă și ETag-ul ei, calculat o
+singură dată la încărcare. Scrierile prin ORM pe modelele de catalog golesc
+tot cache-ul prin semnale Tortoise; TTL-ul acoperă scrierile făcute din alte
+procese (seed, migrări, alți workeri) sau prin operații bulk fără semnale.
+
+Cache-ul are cel mult CATALOG_MAX_INTRARI chei (LRU): fiecare job_id cerut la
+/persoane sau /servicii, chiar inexistent, are cheia lui. Id-urile de servicii
+necunoscute sunt păstrate și ele (ca None, cu același TTL), ca un id greșit
+trimis repetat să nu ajungă de fiecare dată în baza de date.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from tortoise.signals import post_delete, post_save
+
+from db.config import conexiune_citire
+from db.models import Job, PersoanaJob, Persoane, Servicii
+from src.raspunsuri import accepta_msgpack, dumps_json, raspuns
+
+
+CATALOG_TTL_SECUNDE = float(os.getenv("CATALOG_TTL_SECUNDE", "300"))
+CATALOG_MAX_INTRARI = int(os.getenv("CATALOG_MAX_INTRARI", "1024"))
+
+
+def calculeaza_etag(valoare: Any) -> str:
+    return '"' + hashlib.sha1(dumps_json(valoare, sortat=True)).hexdigest() + '"'
+
+
+class CacheCatalog:
+    def __init__(self, ttl: float, max_intrari: int):
+        self.ttl = ttl
+        self.max_intrari = max_intrari
+        # cheie -> (expiră la, valoare, etag), cea mai recent folosită la final
+        self._intrari: "OrderedDict[str, Tuple[float, Any, str]]" = OrderedDict()
+        # Crește la fiecare invalidare; o încărcare pornită înainte de
+        # invalidare nu își mai scrie rezultatul (ar fi deja învechit).
+        self._generatie = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evacuate = 0
+
+    def _citeste(self, cheie: str) -> Optional[Tuple[Any, str]]:
+        intrare = self._intrari.get(cheie)
+        if intrare is None or intrare[0] <= time.monotonic():
+            if intrare is not None:
+                del self._intrari[cheie]
+            self.misses += 1
+            return None
+        self._intrari.move_to_end(cheie)
+        self.hits += 1
+        return intrare[1], intrare[2]
+
+    def _scrie(self, cheie: str, valoare: Any, etag: str, generatie: int) -> None:
+        if generatie != self._generatie:
+            return
+        self._intrari[cheie] = (time.monotonic() + self.ttl, valoare, etag)
+        self._intrari.move_to_end(cheie)
+        while len(self._intrari) > self.max_intrari:
+            self._intrari.popitem(last=False)
+            self.evacuate += 1
+
+    async def obtine(self, cheie: str, incarca: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        """Returnează (valoare, etag), încărcând din baza de date la miss sau expirare."""
+        gasit = self._citeste(cheie)
+        if gasit is not None:
+            return gasit
+
+        generatie = self._generatie
+        valoare = await incarca()
+        etag = calculeaza_etag(valoare)
+        self._scrie(cheie, valoare, etag, generatie)
+        return valoare, etag
+
+    async def obtine_multe(
+        self,
+        prefix: str,
+        ids: Iterable[int],
+        incarca: Callable[[List[int]], Awaitable[Dict[int, Any]]],
+    ) -> Dict[int, Any]:
+        """
+        Valorile pentru `ids`, fiecare sub cheia "{prefix}:{id}". Lipsurile se
+        încarcă printr-un singur apel incarca(lipsa); un id pe care incarca nu
+        îl returnează este păstrat ca None (rezultat negativ, același TTL).
+        """
+        rezultat: Dict[int, Any] = {}
+        lipsa = []
+        for id_ in ids:
+            gasit = self._citeste(f"{prefix}:{id_}")
+            if gasit is None:
+                lipsa.append(id_)
+            else:
+                rezultat[id_] = gasit[0]
+        if lipsa:
+            generatie = self._generatie
+            incarcate = await incarca(lipsa)
+            for id_ in lipsa:
+                rezultat[id_] = incarcate.get(id_)
+                self._scrie(f"{prefix}:{id_}", rezultat[id_], "", generatie)
+        return rezultat
+
+    def invalideaza(self) -> None:
+        self._generatie += 1
+        self._intrari.clear()
+
+    def stats(self) -> dict:
+        return {
+            "intrari": len(self._intrari),
+            "max_intrari": self.max_intrari,
+            "ttl_secunde": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evacuate": self.evacuate,
+        }
+
+
+cache_catalog = CacheCatalog(CATALOG_TTL_SECUNDE, CATALOG_MAX_INTRARI)
+
+
+async def _incarca_servicii_job() -> Dict[int, Optional[int]]:
+    return dict(await Servicii.all().using_db(conexiune_citire()).values_list("id", "job_id"))
+
+
+async def _incarca_joburi(servicii_ids: List[int]) -> Dict[int, Optional[int]]:
+    return dict(await Servicii.filter(id__in=servicii_ids).using_db(conexiune_citire()).values_list("id", "job_id"))
+
+
+async def job_pentru_serviciu(serviciu_id: int) -> Optional[int]:
+    """
+    Maparea serviciu -> job, din cache. Un id necunoscut (serviciu adăugat din
+    alt proces sau inexistent) este căutat individual, fără să reîncarce toată
+    maparea, iar rezultatul rămâne în cache.
+    """
+    return (await joburi_pentru_servicii([serviciu_id]))[serviciu_id]
+
+
+async def joburi_pentru_servicii(servicii_ids: Iterable[int]) -> Dict[int, Optional[int]]:
+    """Ca job_pentru_serviciu, pentru mai multe id-uri; lipsurile se rezolvă într-o singură interogare."""
+    mapare, _ = await cache_catalog.obtine("servicii_job", _incarca_servicii_job)
+    rezultat = {sid: mapare[sid] for sid in servicii_ids if sid in mapare}
+    lipsa = [sid for sid in servicii_ids if sid not in mapare]
+    if lipsa:
+        rezultat.update(await cache_catalog.obtine_multe("serviciu_job", lipsa, _incarca_joburi))
+    return rezultat
+
+
+def raspuns_cu_etag(request: Request, valoare: Any, etag: str) -> Response:
+    """
+    Răspunde 304 dacă clientul are deja versiunea curentă, altfel JSON (sau
+    MessagePack) cu ETag. Fiecare reprezentare are propriul ETag.
+    """
+    if accepta_msgpack(request):
+        etag = etag[:-1] + '-msgpack"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag_uri = {e.strip().removeprefix("W/") for e in if_none_match.split(",")}
+        if etag in etag_uri or "*" in etag_uri:
+            return Response(status_code=304, headers=headers)
+    return raspuns(request, valoare, headers=headers)
+
+
+@post_save(Job, Persoane, Servicii, PersoanaJob)
+async def _invalideaza_la_salvare(sender, instance, created, using_db, update_fields) -> None:
+    cache_catalog.invalideaza()
+
+
+@post_delete(Job, Persoane, Servicii, PersoanaJob)
+async def _invalideaza_la_stergere(sender, instance, using_db) -> None:
+    cache_catalog.invalideaza()
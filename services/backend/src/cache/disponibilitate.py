@@ -0,0 +1,209 @@
+"""
+Index în memorie al ocupării pe (persoana, data).
+
+Indexul se construiește o singură dată la pornire din tabela Programari și
+este ținut la zi de create/update/delete_programare, astfel încât verificarea
+unui slot și calculul sloturilor libere nu mai ating baza de date. Indexul
+reține și slotul fiecărei programări, ca update-ul și ștergerea să știe ce
+slot eliberează fără să citească rândul.
+Fiecare programare ocupă intervalul [ora, ora + DURATA_SLOT_MIN), deci o oră
+din afara grilei (14:15 față de slotul de la 14:00) se suprapune cu sloturile
+vecine și nu poate dubla o programare existentă.
+Fiecare worker uvicorn are propriul index, deci indexul singur protejează
+doar un worker (SQLite). Pe PostgreSQL, cu mai mulți workeri sau noduri,
+constrângerea de excludere "Programari_fara_suprapuneri" (migrarea 12,
+asigura_constrangerea la pornire) refuză în baza de date aceeași suprapunere;
+API-ul o raportează tot ca 409.
+"""
+
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from db.config import conexiune_citire
+from db.models import Programari
+from src.logger import get_logger
+
+log = get_logger("disponibilitate")
+
+
+# Programul de lucru din care se generează sloturile
+PROGRAM_START = os.getenv("PROGRAM_START", "08:00")
+PROGRAM_SFARSIT = os.getenv("PROGRAM_SFARSIT", "18:00")
+DURATA_SLOT_MIN = int(os.getenv("DURATA_SLOT_MIN", "30"))
+
+# Interval maxim (în zile) acceptat de /disponibilitate într-un singur apel
+MAX_ZILE_INTERVAL = 62
+
+
+def genereaza_sloturi(start: str, sfarsit: str, durata_min: int) -> Tuple[time, ...]:
+    """Returnează orele de început ale sloturilor din intervalul [start, sfarsit)."""
+    curent = datetime.strptime(start, "%H:%M")
+    limita = datetime.strptime(sfarsit, "%H:%M")
+    pas = timedelta(minutes=durata_min)
+    sloturi = []
+    while curent + pas <= limita:
+        sloturi.append(curent.time())
+        curent += pas
+    return tuple(sloturi)
+
+
+# (persoana_id, data, ora)
+Slot = Tuple[int, date, time]
+
+
+def _secunde(ora: time) -> int:
+    return ora.hour * 3600 + ora.minute * 60 + ora.second
+
+
+def _ca_data(valoare: Union[str, date]) -> date:
+    if isinstance(valoare, date):
+        return valoare
+    return datetime.strptime(valoare, "%Y-%m-%d").date()
+
+
+class IndexOcupare:
+    """Mulțimea orelor ocupate pentru fiecare pereche (persoana_id, data)."""
+
+    def __init__(self, sloturi: Tuple[time, ...], durata_min: int):
+        self.sloturi = sloturi
+        self.durata = durata_min * 60
+        self._ocupate: Dict[Tuple[int, date], Set[time]] = {}
+        self._programari: Dict[int, Slot] = {}
+        self.incarcat = False
+
+    async def incarca(self) -> int:
+        """Reconstruiește indexul din programările de azi și din viitor."""
+        randuri = await Programari.filter(
+            persoana_id__isnull=False, data__gte=date.today()
+        ).using_db(conexiune_citire()).values_list("id", "persoana_id", "data", "ora")
+
+        ocupate: Dict[Tuple[int, date], Set[time]] = {}
+        programari: Dict[int, Slot] = {}
+        for programare_id, persoana_id, data, ora in randuri:
+            data = _ca_data(data)
+            ocupate.setdefault((persoana_id, data), set()).add(ora)
+            programari[programare_id] = (persoana_id, data, ora)
+
+        self._ocupate = ocupate
+        self._programari = programari
+        self.incarcat = True
+        return len(randuri)
+
+    def _suprapus(self, ore, ora: time) -> bool:
+        # O persoană are câteva programări pe zi, deci o parcurgere e suficientă
+        inceput = _secunde(ora)
+        return any(abs(_secunde(ocupata) - inceput) < self.durata for ocupata in ore)
+
+    def este_ocupat(self, persoana_id: int, data: Union[str, date], ora: time) -> bool:
+        return self._suprapus(self._ocupate.get((persoana_id, _ca_data(data)), ()), ora)
+
+    def ocupa(
+        self, persoana_id: int, data: Union[str, date], ora: time, exceptie: Optional[Slot] = None
+    ) -> bool:
+        """
+        Rezervă slotul în index.
+        Returnează False dacă intervalul se suprapune cu o programare existentă
+        (verificare + rezervare fără niciun await între ele, deci atomice în
+        event loop). `exceptie` este slotul pe care programarea mutată îl
+        eliberează (leaga), deci nu contează ca suprapunere.
+        """
+        cheie = (persoana_id, _ca_data(data))
+        ore = self._ocupate.setdefault(cheie, set())
+        verificate = ore
+        if exceptie is not None and (exceptie[0], exceptie[1]) == cheie:
+            verificate = ore - {exceptie[2]}
+        if self._suprapus(verificate, ora):
+            return False
+        ore.add(ora)
+        return True
+
+    def elibereaza(self, persoana_id: int, data: Union[str, date], ora: time) -> None:
+        cheie = (persoana_id, _ca_data(data))
+        ore = self._ocupate.get(cheie)
+        if ore is None:
+            return
+        ore.discard(ora)
+        if not ore:
+            del self._ocupate[cheie]
+
+    def slot_programare(self, programare_id: int) -> Optional[Slot]:
+        """Slotul ocupat de programare sau None dacă nu ocupă niciunul."""
+        return self._programari.get(programare_id)
+
+    def leaga(self, programare_id: int, persoana_id: Optional[int], data: Union[str, date], ora: time) -> None:
+        """
+        Asociază programarea cu slotul ei, deja rezervat cu ocupa(); slotul
+        ținut anterior de programare, dacă e altul, este eliberat.
+        """
+        slot = (persoana_id, _ca_data(data), ora) if persoana_id is not None else None
+        vechi = self._programari.pop(programare_id, None)
+        if vechi is not None and vechi != slot:
+            self.elibereaza(*vechi)
+        if slot is not None:
+            self._programari[programare_id] = slot
+
+    def uita(self, programare_id: int) -> None:
+        """Eliberează slotul unei programări șterse."""
+        vechi = self._programari.pop(programare_id, None)
+        if vechi is not None:
+            self.elibereaza(*vechi)
+
+    def sloturi_libere(self, persoana_id: int, data: Union[str, date]) -> List[time]:
+        ore = self._ocupate.get((persoana_id, _ca_data(data)), ())
+        return [slot for slot in self.sloturi if not self._suprapus(ore, slot)]
+
+
+index_ocupare = IndexOcupare(
+    genereaza_sloturi(PROGRAM_START, PROGRAM_SFARSIT, DURATA_SLOT_MIN), DURATA_SLOT_MIN
+)
+
+
+CONSTRANGERE_POSTGRES = "Programari_fara_suprapuneri"
+
+
+def sql_constrangere_postgres(durata_min: int = DURATA_SLOT_MIN) -> str:
+    """
+    Excluderea pe PostgreSQL: două programări ale aceleiași persoane nu pot
+    avea intervalele [data + ora, data + ora + durata) suprapuse, ca în
+    IndexOcupare._suprapus(). btree_gist permite "=" pe persoana_id în GiST.
+    """
+    interval = f""""data" + "ora", "data" + "ora" + interval '{durata_min} minutes'"""
+    return f"""
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE "Programari" DROP CONSTRAINT IF EXISTS "{CONSTRANGERE_POSTGRES}";
+ALTER TABLE "Programari" ADD CONSTRAINT "{CONSTRANGERE_POSTGRES}" EXCLUDE USING gist (
+    "persoana_id" WITH =,
+    tsrange({interval}) WITH &&
+) WHERE ("persoana_id" IS NOT NULL);
+"""
+
+
+def este_suprapunere(eroare: Exception) -> bool:
+    """IntegrityError venită din constrângerea de excludere."""
+    return CONSTRANGERE_POSTGRES in str(eroare)
+
+
+async def asigura_constrangerea(conn) -> bool:
+    """
+    Creează constrângerea pe bazele PostgreSQL fără migrarea 12 (scheme
+    generate de Tortoise). Dacă baza are deja programări suprapuse,
+    constrângerea nu poate fi creată: se raportează și rămâne doar indexul
+    din memorie. Returnează True dacă a creat-o.
+    """
+    if conn.capabilities.dialect != "postgres":
+        return False
+    exista = await conn.execute_query_dict(
+        "SELECT 1 FROM pg_constraint WHERE conname = $1", [CONSTRANGERE_POSTGRES]
+    )
+    if exista:
+        return False
+    try:
+        await conn.execute_script(sql_constrangere_postgres())
+    except Exception:
+        log.exception(
+            "Constrângerea de excludere nu a putut fi creată (programări suprapuse?)",
+            extra={"constrangere": CONSTRANGERE_POSTGRES},
+        )
+        return False
+    return True
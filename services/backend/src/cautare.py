@@ -0,0 +1,192 @@
+"""
+Căutarea programărilor după datele clientului (nume, prenume, email,
+telefon), pentru GET /programari/search.
+
+SQLite: tabela FTS5 "Programari_fts" (rowid = Programari.id), ținută la zi
+de trigger-e pe Programari, deci și la crearea în lot, la PUT și la mutarea
+în arhivă. Fiecare cuvânt căutat este un prefix ("pop" găsește "Popescu"),
+fără diacritice ("stefan" găsește "Ștefan"). Telefonul este indexat doar cu
+cifre, ca "0721 234 567" și "0721-234567" să fie găsite la fel, iar prefixul
+internațional +40/0040 devine 0 ("+40721234567" e găsit după "0721").
+
+PostgreSQL: un index GIN pg_trgm pe aceeași concatenare de coloane, fără
+diacritice (unaccent), cu ILIKE '%cuvânt%' pentru fiecare cuvânt, deci tot
+"stefan" găsește "Ștefan". Telefonul are acolo doar cifrele, iar căutarea
+unui subșir găsește "0721" și în "40721234567".
+
+SQL-ul de aici este singura sursă: migrările 9, 11 și 13 îl importă, iar
+asigura_indexul() îl aplică bazelor create din modele.
+
+Rezultatele sunt cele mai noi programări care se potrivesc (id descrescător):
+FTS5 parcurge potrivirile în ordinea rowid și se oprește după `limit`.
+"""
+
+import re
+from typing import List, Optional
+
+from tortoise import Tortoise
+
+from db.config import conexiune_citire
+
+TABELA_FTS = "Programari_fts"
+INDEX_TRGM = "idx_Programari_cautare_unaccent_trgm"
+# Indexul din migrarea 9, cu diacritice; înlocuit de INDEX_TRGM (migrarea 13)
+INDEX_TRGM_VECHI = "idx_Programari_cautare_trgm"
+# unaccent() este STABLE (depinde de dicționarul curent), deci nu poate fi
+# folosit într-un index; funcția IMMUTABLE fixează dicționarul
+FUNCTIE_UNACCENT = "programari_unaccent"
+
+# Cuvintele mai scurte nu sunt căutate (prefixele de 1 caracter nu sunt indexate)
+MIN_LUNGIME_CUVANT = 2
+MIN_CIFRE_TELEFON = 3
+
+_CUVANT = re.compile(r"[^\W_]+")
+_TELEFON = re.compile(r"[\d\s()+./-]+")
+
+
+PREFIXE_TARA = ("+40", "0040")
+
+
+def _cifre_sql(coloana: str) -> str:
+    """Telefonul ca în telefon_normalizat(): prefixul țării devine 0, apoi doar cifrele."""
+    expresie = f"coalesce({coloana}, '')"
+    for caracter in (" ", "-", ".", "(", ")"):
+        expresie = f"replace({expresie}, '{caracter}', '')"
+    cazuri = " ".join(
+        f"WHEN {expresie} LIKE '{prefix}%' THEN '0' || ltrim(substr({expresie}, {len(prefix) + 1}), '0')"
+        for prefix in PREFIXE_TARA
+    )
+    return f"CASE {cazuri} ELSE replace({expresie}, '+', '') END"
+
+
+def _valori_fts(rand: str) -> str:
+    return f'{rand}."nume", {rand}."prenume", {rand}."email", ' + _cifre_sql(f'{rand}."telefon"')
+
+
+TRIGGERE_SQLITE = {
+    f"{TABELA_FTS}_ai": f"""CREATE TRIGGER "{TABELA_FTS}_ai" AFTER INSERT ON "Programari" BEGIN
+    INSERT INTO "{TABELA_FTS}" (rowid, nume, prenume, email, telefon) VALUES (NEW."id", {_valori_fts("NEW")});
+END""",
+    f"{TABELA_FTS}_au": f"""CREATE TRIGGER "{TABELA_FTS}_au" AFTER UPDATE OF "nume", "prenume", "email", "telefon" ON "Programari" BEGIN
+    DELETE FROM "{TABELA_FTS}" WHERE rowid = OLD."id";
+    INSERT INTO "{TABELA_FTS}" (rowid, nume, prenume, email, telefon) VALUES (NEW."id", {_valori_fts("NEW")});
+END""",
+    f"{TABELA_FTS}_ad": f"""CREATE TRIGGER "{TABELA_FTS}_ad" AFTER DELETE ON "Programari" BEGIN
+    DELETE FROM "{TABELA_FTS}" WHERE rowid = OLD."id";
+END""",
+}
+
+# Aceleași instrucțiuni ca migrările 9 și 11; IF NOT EXISTS, deci pot rula la
+# fiecare pornire (o reconstruire a tabelei Programari îi elimină trigger-ele)
+SQL_SQLITE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS "{TABELA_FTS}" USING fts5(
+    nume, prenume, email, telefon,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+""" + "".join(
+    creare.replace("CREATE TRIGGER", "CREATE TRIGGER IF NOT EXISTS", 1) + ";\n"
+    for creare in TRIGGERE_SQLITE.values()
+)
+
+SQL_SQLITE_POPULARE = f"""
+DELETE FROM "{TABELA_FTS}";
+INSERT INTO "{TABELA_FTS}" (rowid, nume, prenume, email, telefon)
+    SELECT "id", {_valori_fts('"Programari"')} FROM "Programari";
+INSERT INTO "{TABELA_FTS}" ("{TABELA_FTS}") VALUES ('optimize');
+"""
+
+EXPRESIE_POSTGRES = (
+    f'"{FUNCTIE_UNACCENT}"'
+    """(coalesce("nume", '') || ' ' || coalesce("prenume", '') || ' ' || coalesce("email", '')"""
+    """ || ' ' || regexp_replace(coalesce("telefon", ''), '\\D', '', 'g'))"""
+)
+
+SQL_POSTGRES = f"""
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE OR REPLACE FUNCTION "{FUNCTIE_UNACCENT}"(text) RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+DROP INDEX IF EXISTS "{INDEX_TRGM_VECHI}";
+CREATE INDEX IF NOT EXISTS "{INDEX_TRGM}" ON "Programari" USING GIN ({EXPRESIE_POSTGRES} gin_trgm_ops);
+"""
+
+
+def telefon_normalizat(telefon: str) -> str:
+    """Doar cifrele, cu prefixul +40/0040 (și un 0 după el) înlocuit cu 0."""
+    telefon = re.sub(r"[\s().-]", "", telefon)
+    for prefix in PREFIXE_TARA:
+        if telefon.startswith(prefix):
+            telefon = "0" + telefon[len(prefix):].lstrip("0")
+            break
+    return re.sub(r"\D", "", telefon)
+
+
+def cuvinte_cautate(q: str) -> List[str]:
+    """
+    Cuvintele căutate: un singur număr de telefon (telefon_normalizat) dacă
+    textul arată ca un telefon, altfel cuvintele de cel puțin
+    MIN_LUNGIME_CUVANT litere.
+    """
+    cifre = telefon_normalizat(q)
+    if _TELEFON.fullmatch(q.strip()) and len(cifre) >= MIN_CIFRE_TELEFON:
+        return [cifre]
+    return [cuvant for cuvant in _CUVANT.findall(q) if len(cuvant) >= MIN_LUNGIME_CUVANT]
+
+
+async def cauta_iduri(q: str, limit: int) -> Optional[List[int]]:
+    """Id-urile programărilor găsite (cele mai noi întâi); None dacă `q` nu are cuvinte căutabile."""
+    cuvinte = cuvinte_cautate(q)
+    if not cuvinte:
+        return None
+    conn = conexiune_citire() or Tortoise.get_connection("default")
+
+    if conn.capabilities.dialect == "sqlite":
+        # Cuvintele conțin doar litere și cifre, deci ghilimelele nu au ce escapa
+        potrivire = " AND ".join(f'"{cuvant}"*' for cuvant in cuvinte)
+        if len(cuvinte) == 1 and cuvinte[0].isdigit():
+            potrivire = f"telefon : {potrivire}"
+        sql = (
+            f'SELECT rowid AS "id" FROM "{TABELA_FTS}" WHERE "{TABELA_FTS}" MATCH ? '
+            f"ORDER BY rowid DESC LIMIT ?"
+        )
+        randuri = await conn.execute_query_dict(sql, [potrivire, limit])
+    else:
+        conditii = " AND ".join(
+            f'{EXPRESIE_POSTGRES} ILIKE "{FUNCTIE_UNACCENT}"(${i + 1})' for i in range(len(cuvinte))
+        )
+        sql = f'SELECT "id" FROM "Programari" WHERE {conditii} ORDER BY "id" DESC LIMIT ${len(cuvinte) + 1}'
+        randuri = await conn.execute_query_dict(sql, [f"%{cuvant}%" for cuvant in cuvinte] + [limit])
+    return [rand["id"] for rand in randuri]
+
+
+async def asigura_indexul(conn) -> bool:
+    """
+    Creează indexul de căutare pe bazele fără migrarea 9 (scheme generate de
+    Tortoise) și repune trigger-ele SQLite. Trigger-ele dintr-o versiune
+    anterioară (alt format al telefonului) sunt înlocuite și indexul este
+    repopulat; la fel dacă lipsea vreun trigger (scrierile de până acum nu
+    au ajuns în index). Returnează True dacă l-a populat.
+    """
+    if conn.capabilities.dialect == "sqlite":
+        exista = await conn.execute_query_dict(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [TABELA_FTS]
+        )
+        triggere = await conn.execute_query_dict(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN (?, ?, ?)",
+            list(TRIGGERE_SQLITE),
+        )
+        vechi = [
+            rand["name"] for rand in triggere
+            if rand["sql"].split() != TRIGGERE_SQLITE[rand["name"]].split()
+        ]
+        stergere = "".join(f'DROP TRIGGER "{nume}";\n' for nume in vechi)
+        lipsa = len(triggere) < len(TRIGGERE_SQLITE)
+        populare = SQL_SQLITE_POPULARE if not exista or vechi or lipsa else ""
+        await conn.execute_script(f"BEGIN;\n{stergere}{SQL_SQLITE}{populare}COMMIT;")
+        return bool(populare)
+
+    exista = await conn.execute_query_dict("SELECT 1 FROM pg_indexes WHERE indexname = $1", [INDEX_TRGM])
+    if not exista:
+        await conn.execute_script(SQL_POSTGRES)
+    return not exista
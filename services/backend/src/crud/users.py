@@ -1,17 +1,15 @@
 from fastapi import HTTPException
-from passlib.context import CryptContext
 from tortoise.exceptions import DoesNotExist, IntegrityError
 
 from db.models import Users
+from src.auth.cache import user_cache
+from src.auth.hashing import password_hasher
 from src.schemas.token import Status  # NEW
 from src.schemas.users import UserOutSchema
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 async def create_user(user) -> UserOutSchema:
-    user.password = pwd_context.encrypt(user.password)
+    user.password = await password_hasher.hash(user.password)
 
     try:
         user_obj = await Users.create(**user.dict(exclude_unset=True))
@@ -29,6 +27,7 @@ async def delete_user(user_id, current_user) -> Status:  # UPDATED
 
     if db_user.id == current_user.id:
         deleted_count = await Users.filter(id=user_id).delete()
+        user_cache.invalidate(db_user.username)
         if not deleted_count:
             raise HTTPException(status_code=404, detail=f"User {user_id} not found")
         return Status(message=f"Deleted user {user_id}")  # UPDATED
@@ -0,0 +1,205 @@
+"""
+Magistrală pub/sub în proces pentru modificările programărilor, servită ca
+Server-Sent Events pe /programari/stream.
+
+create/update/delete_programare publică rândul modificat; fiecare client SSE
+are o coadă limitată proprie și primește doar evenimentele care se potrivesc
+filtrului lui (persoana_id / job_id). Abonații sunt indexați după filtru, deci
+publicarea atinge doar cozile interesate, iar o conexiune inactivă costă doar
+o corutină suspendată și o coadă goală. Un client prea lent (coada plină) este
+deconectat și își reface lista la reconectare, în loc să țină memorie nelimitată.
+
+Ultimele evenimente sunt păstrate într-un buffer circular, astfel încât un
+client care se reconectează cu Last-Event-ID primește ce a pierdut; dacă
+id-ul a ieșit deja din buffer sau vine de la alt proces (id-urile sunt
+prefixate cu o epocă per proces), primește un eveniment "resync".
+Fiecare worker uvicorn are propria magistrală: cu mai mulți workeri
+(PostgreSQL) un client vede doar modificările făcute prin workerul lui.
+"""
+
+import asyncio
+import os
+import uuid
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+from src.raspunsuri import dumps_json
+
+
+SSE_COADA_ABONAT = int(os.getenv("SSE_COADA_ABONAT", "256"))
+SSE_ISTORIC = int(os.getenv("SSE_ISTORIC", "1000"))
+SSE_HEARTBEAT_SECUNDE = float(os.getenv("SSE_HEARTBEAT_SECUNDE", "15"))
+
+COLOANE = [
+    "id", "persoana_id", "job_id", "serviciu_id", "data", "ora",
+    "observatii", "nume", "prenume", "email", "telefon", "version",
+]
+
+# (id eveniment, persoane vizate, joburi vizate, linia SSE gata formatată)
+Eveniment = Tuple[int, Set[Optional[int]], Set[Optional[int]], bytes]
+
+_DECONECTAT = object()
+
+
+def rand_programare(programare) -> dict:
+    """Rândul trimis clienților, cu aceleași chei ca GET /programari."""
+    return {coloana: getattr(programare, coloana) for coloana in COLOANE}
+
+
+class Abonament:
+    __slots__ = ("persoana_id", "job_id", "coada")
+
+    def __init__(self, persoana_id: Optional[int], job_id: Optional[int], marime: int):
+        self.persoana_id = persoana_id
+        self.job_id = job_id
+        self.coada: asyncio.Queue = asyncio.Queue(marime)
+
+    def potriveste(self, persoane: Set[Optional[int]], joburi: Set[Optional[int]]) -> bool:
+        return (
+            (self.persoana_id is None or self.persoana_id in persoane)
+            and (self.job_id is None or self.job_id in joburi)
+        )
+
+
+class MagistralaEvenimente:
+    def __init__(self, marime_coada: int, istoric: int):
+        self.marime_coada = marime_coada
+        self.epoca = uuid.uuid4().hex[:8]
+        self._ultimul_id = 0
+        self._istoric: Deque[Eveniment] = deque(maxlen=istoric)
+        # Abonații indexați după filtrul cel mai selectiv
+        self._dupa_persoana: Dict[int, Set[Abonament]] = {}
+        self._dupa_job: Dict[int, Set[Abonament]] = {}
+        self._toti: Set[Abonament] = set()
+
+        self.abonati = 0
+        self.publicate = 0
+        self.livrate = 0
+        self.deconectati_lenti = 0
+
+    def _grup(self, abonament: Abonament) -> Set[Abonament]:
+        if abonament.persoana_id is not None:
+            return self._dupa_persoana.setdefault(abonament.persoana_id, set())
+        if abonament.job_id is not None:
+            return self._dupa_job.setdefault(abonament.job_id, set())
+        return self._toti
+
+    def aboneaza(self, persoana_id: Optional[int] = None, job_id: Optional[int] = None) -> Abonament:
+        abonament = Abonament(persoana_id, job_id, self.marime_coada)
+        self._grup(abonament).add(abonament)
+        self.abonati += 1
+        return abonament
+
+    def dezaboneaza(self, abonament: Abonament) -> None:
+        grup = self._grup(abonament)
+        if abonament in grup:
+            grup.discard(abonament)
+            self.abonati -= 1
+        if not grup:
+            if abonament.persoana_id is not None:
+                self._dupa_persoana.pop(abonament.persoana_id, None)
+            elif abonament.job_id is not None:
+                self._dupa_job.pop(abonament.job_id, None)
+
+    def publica(self, tip: str, rand: dict, anterior: Optional[dict] = None) -> None:
+        """
+        Trimite evenimentul abonaților potriviți. La update, `anterior` este
+        rândul dinainte, ca abonații vechii persoane/vechiului job să afle că
+        programarea a plecat de la ei.
+        """
+        self._ultimul_id += 1
+        id_eveniment = self._ultimul_id
+        persoane = {rand.get("persoana_id")}
+        joburi = {rand.get("job_id")}
+        if anterior is not None:
+            persoane.add(anterior.get("persoana_id"))
+            joburi.add(anterior.get("job_id"))
+
+        continut = dumps_json({"tip": tip, "programare": rand}).decode()
+        linie = f"id: {self.epoca}-{id_eveniment}\nevent: {tip}\ndata: {continut}\n\n".encode()
+        self._istoric.append((id_eveniment, persoane, joburi, linie))
+        self.publicate += 1
+
+        candidati = list(self._toti)
+        for persoana_id in persoane:
+            if persoana_id is not None:
+                candidati.extend(self._dupa_persoana.get(persoana_id, ()))
+        for job_id in joburi:
+            if job_id is not None:
+                candidati.extend(self._dupa_job.get(job_id, ()))
+
+        for abonament in candidati:
+            if not abonament.potriveste(persoane, joburi):
+                continue
+            try:
+                abonament.coada.put_nowait(linie)
+                self.livrate += 1
+            except asyncio.QueueFull:
+                # Clientul nu ține pasul: îl scoatem, se va reconecta și resincroniza
+                self.dezaboneaza(abonament)
+                self.deconectati_lenti += 1
+                while not abonament.coada.empty():
+                    abonament.coada.get_nowait()
+                abonament.coada.put_nowait(_DECONECTAT)
+
+    def _pierdute(self, abonament: Abonament, last_event_id: str) -> Optional[list]:
+        """Evenimentele de după last_event_id sau None dacă nu mai pot fi reconstituite."""
+        epoca, _, numar = last_event_id.partition("-")
+        if epoca != self.epoca or not numar.isdigit() or int(numar) > self._ultimul_id:
+            return None
+        ultimul_primit = int(numar)
+        if ultimul_primit == self._ultimul_id:
+            return []
+        if not self._istoric or self._istoric[0][0] > ultimul_primit + 1:
+            return None
+        return [
+            linie for id_eveniment, persoane, joburi, linie in self._istoric
+            if id_eveniment > ultimul_primit and abonament.potriveste(persoane, joburi)
+        ]
+
+    async def flux(
+        self,
+        persoana_id: Optional[int] = None,
+        job_id: Optional[int] = None,
+        last_event_id: Optional[str] = None,
+        heartbeat: float = SSE_HEARTBEAT_SECUNDE,
+    ) -> AsyncIterator[bytes]:
+        """Generatorul SSE pentru un client; se oprește la deconectare (anulare)."""
+        # Abonarea și citirea istoricului fără await între ele: fiecare
+        # eveniment ajunge fie în lista de recuperat, fie în coadă, nu în ambele
+        abonament = self.aboneaza(persoana_id, job_id)
+        pierdute = self._pierdute(abonament, last_event_id) if last_event_id else None
+        try:
+            if pierdute is not None:
+                yield b"retry: 3000\n\n"
+                for linie in pierdute:
+                    yield linie
+            else:
+                # Id-ul curent devine punctul de reluare al clientului
+                yield f"retry: 3000\nid: {self.epoca}-{self._ultimul_id}\n\n".encode()
+                if last_event_id:
+                    yield b"event: resync\ndata: {}\n\n"
+
+            while True:
+                try:
+                    linie = await asyncio.wait_for(abonament.coada.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    # Comentariu SSE: ține conexiunea deschisă prin proxy-uri
+                    yield b": ping\n\n"
+                    continue
+                if linie is _DECONECTAT:
+                    return
+                yield linie
+        finally:
+            self.dezaboneaza(abonament)
+
+    def stats(self) -> dict:
+        return {
+            "abonati": self.abonati,
+            "publicate": self.publicate,
+            "livrate": self.livrate,
+            "deconectati_lenti": self.deconectati_lenti,
+        }
+
+
+magistrala = MagistralaEvenimente(SSE_COADA_ABONAT, SSE_ISTORIC)
@@ -0,0 +1,61 @@
+"""
+Export în flux (NDJSON sau CSV) al programărilor.
+
+Rândurile sunt citite în bucăți ordonate după (data, ora, id), cu paginare
+keyset între bucăți, și trimise clientului pe măsură ce sosesc. Memoria
+folosită este cea a unei singure bucăți, indiferent de numărul de rânduri.
+"""
+
+import csv
+import io
+from typing import AsyncIterator, Dict, List
+
+from db.config import conexiune_citire
+from db.models import Programari
+from src.paginare import dupa_cheie
+from src.raspunsuri import dumps_json
+
+
+MARIME_BUCATA = 1000
+
+COLOANE = [
+    "id", "data", "ora", "persoana_id", "job_id", "serviciu_id",
+    "nume", "prenume", "email", "telefon", "observatii",
+]
+
+FORMATE = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def citeste_bucati(filters: Dict, marime: int = MARIME_BUCATA) -> AsyncIterator[List[dict]]:
+    """Generează listele de rânduri, câte o interogare pe bucată."""
+    query = Programari.filter(**filters).using_db(conexiune_citire()).order_by("data", "ora", "id")
+    bucata = await query.limit(marime).values(*COLOANE)
+    while bucata:
+        yield bucata
+        if len(bucata) < marime:
+            return
+        ultim = bucata[-1]
+        bucata = await query.filter(
+            dupa_cheie(ultim["data"], ultim["ora"], ultim["id"])
+        ).limit(marime).values(*COLOANE)
+
+
+async def export_ndjson(filters: Dict) -> AsyncIterator[bytes]:
+    async for bucata in citeste_bucati(filters):
+        yield b"".join(dumps_json(rand) + b"\n" for rand in bucata)
+
+
+async def export_csv(filters: Dict) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLOANE)
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+
+    async for bucata in citeste_bucati(filters):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(bucata)
+        yield buffer.getvalue().encode()
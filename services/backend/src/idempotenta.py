@@ -0,0 +1,238 @@
+"""
+Idempotency-Key pentru scrieri (POST /programari, /programari/batch, PUT,
+DELETE etc.).
+
+Un client care reîncearcă după o conexiune căzută trimite același header
+Idempotency-Key. IdempotentaMiddleware (ASGI simplu) păstrează răspunsul
+primului request, iar reîncercările îl primesc înapoi, cu header-ul
+Idempotent-Replayed: true, dintr-o singură căutare în memorie: fără
+handler, fără rate limiting și fără INSERT. Un duplicat sosit cât primul
+request încă rulează îl așteaptă (cel mult IDEMPOTENTA_ASTEPTARE_SECUNDE) în
+loc să insereze din nou.
+
+- Cheia este (metodă, cale, token de autentificare, Idempotency-Key), deci
+  aceeași cheie de la alt utilizator nu primește răspunsul altcuiva.
+- Aceeași cheie cu alt corp sau alt query string primește 422.
+- Răspunsurile 5xx și 429 nu se păstrează: reîncercarea rulează din nou.
+- Store-ul e limitat (IDEMPOTENTA_MAX_CHEI, LRU) și cu TTL; fiecare worker
+  are store-ul lui, deci reîncercările trebuie să ajungă la același proces
+  (un singur worker, ca SQLite, sau sticky sessions).
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.limitare import METODE_SCRIERE, raspuns_eroare, token_din_headere
+
+
+IDEMPOTENTA_MAX_CHEI = int(os.getenv("IDEMPOTENTA_MAX_CHEI", "10000"))
+IDEMPOTENTA_TTL_SECUNDE = float(os.getenv("IDEMPOTENTA_TTL_SECUNDE", "86400"))
+# Cât așteaptă un duplicat după requestul original aflat încă în curs
+IDEMPOTENTA_ASTEPTARE_SECUNDE = float(os.getenv("IDEMPOTENTA_ASTEPTARE_SECUNDE", "30"))
+# Răspunsurile mai mari nu sunt păstrate (batch-ul maxim are ~50 KB)
+IDEMPOTENTA_MAX_OCTETI = int(os.getenv("IDEMPOTENTA_MAX_OCTETI", "262144"))
+LUNGIME_MAXIMA_CHEIE = 255
+
+RUTE_EXCLUSE = {"/login", "/logout"}
+HEADER = b"idempotency-key"
+
+
+class Raspuns:
+    __slots__ = ("expira", "amprenta", "status", "headere", "corp")
+
+    def __init__(self, expira: float, amprenta: str, status: int, headere: List[Tuple[bytes, bytes]], corp: bytes):
+        self.expira = expira
+        self.amprenta = amprenta
+        self.status = status
+        self.headere = headere
+        self.corp = corp
+
+
+class InCurs:
+    __slots__ = ("amprenta", "terminat")
+
+    def __init__(self, amprenta: str):
+        self.amprenta = amprenta
+        self.terminat = asyncio.Event()
+
+
+class StoreIdempotenta:
+    def __init__(self, max_chei: int, ttl: float):
+        self.max_chei = max_chei
+        self.ttl = ttl
+        self._raspunsuri: "OrderedDict[str, Raspuns]" = OrderedDict()
+        self._in_curs: dict = {}
+
+        self.stocate = 0
+        self.reluate = 0
+        self.asteptari = 0
+        self.conflicte = 0
+        self.evacuate = 0
+        self.nestocate = 0
+
+    def raspuns(self, cheie: str) -> Optional[Raspuns]:
+        intrare = self._raspunsuri.get(cheie)
+        if intrare is None:
+            return None
+        if intrare.expira <= time.monotonic():
+            del self._raspunsuri[cheie]
+            return None
+        self._raspunsuri.move_to_end(cheie)
+        return intrare
+
+    def in_curs(self, cheie: str) -> Optional[InCurs]:
+        return self._in_curs.get(cheie)
+
+    def incepe(self, cheie: str, amprenta: str) -> None:
+        self._in_curs[cheie] = InCurs(amprenta)
+
+    def termina(self, cheie: str, raspuns: Optional[Raspuns]) -> None:
+        """Păstrează răspunsul (dacă există) și trezește duplicatele care îl așteaptă."""
+        if raspuns is not None:
+            self._raspunsuri[cheie] = raspuns
+            self._raspunsuri.move_to_end(cheie)
+            self.stocate += 1
+            while len(self._raspunsuri) > self.max_chei:
+                self._raspunsuri.popitem(last=False)
+                self.evacuate += 1
+        else:
+            self.nestocate += 1
+        self._in_curs.pop(cheie).terminat.set()
+
+    def stats(self) -> dict:
+        return {
+            "chei": len(self._raspunsuri),
+            "max_chei": self.max_chei,
+            "ttl_secunde": self.ttl,
+            "in_curs": len(self._in_curs),
+            "stocate": self.stocate,
+            "nestocate": self.nestocate,
+            "reluate": self.reluate,
+            "asteptari": self.asteptari,
+            "conflicte": self.conflicte,
+            "evacuate": self.evacuate,
+        }
+
+
+store_idempotenta = StoreIdempotenta(IDEMPOTENTA_MAX_CHEI, IDEMPOTENTA_TTL_SECUNDE)
+
+
+def _header(headere: list, nume: bytes) -> Optional[str]:
+    for cheie, valoare in headere:
+        if cheie == nume:
+            return valoare.decode("latin-1")
+    return None
+
+
+async def _citeste_corpul(receive) -> Optional[bytes]:
+    """Tot corpul requestului; None dacă clientul s-a deconectat."""
+    bucati = []
+    while True:
+        mesaj = await receive()
+        if mesaj["type"] == "http.disconnect":
+            return None
+        bucati.append(mesaj.get("body", b""))
+        if not mesaj.get("more_body", False):
+            return b"".join(bucati)
+
+
+async def _trimite(send, raspuns: Raspuns) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": raspuns.status,
+        "headers": raspuns.headere + [(b"idempotent-replayed", b"true")],
+    })
+    await send({"type": "http.response.body", "body": raspuns.corp})
+
+
+class IdempotentaMiddleware:
+    def __init__(self, app, store: StoreIdempotenta = store_idempotenta):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in METODE_SCRIERE or scope["path"] in RUTE_EXCLUSE:
+            await self.app(scope, receive, send)
+            return
+        cheie_client = _header(scope["headers"], HEADER)
+        if cheie_client is None:
+            await self.app(scope, receive, send)
+            return
+        if not cheie_client or len(cheie_client) > LUNGIME_MAXIMA_CHEIE:
+            await raspuns_eroare(send, 400, f"Idempotency-Key trebuie să aibă între 1 și {LUNGIME_MAXIMA_CHEIE} caractere")
+            return
+
+        corp = await _citeste_corpul(receive)
+        if corp is None:
+            return
+        token = token_din_headere(scope["headers"]) or ""
+        cheie = "\0".join((
+            scope["method"], scope["path"], hashlib.sha256(token.encode()).hexdigest(), cheie_client
+        ))
+        amprenta = hashlib.sha256(scope.get("query_string", b"") + b"\0" + corp).hexdigest()
+
+        store = self.store
+        while True:
+            raspuns = store.raspuns(cheie)
+            in_curs = store.in_curs(cheie) if raspuns is None else None
+            original = raspuns or in_curs
+            if original is not None and original.amprenta != amprenta:
+                store.conflicte += 1
+                await raspuns_eroare(send, 422, "Idempotency-Key a fost folosit deja pentru un alt request")
+                return
+            if raspuns is not None:
+                store.reluate += 1
+                await _trimite(send, raspuns)
+                return
+            if in_curs is None:
+                break
+            # Duplicat al unui request în curs: după ce se termină, răspunsul
+            # lui e reluat; dacă nu a fost păstrat (5xx, 429), rulează acesta
+            store.asteptari += 1
+            try:
+                await asyncio.wait_for(in_curs.terminat.wait(), IDEMPOTENTA_ASTEPTARE_SECUNDE)
+            except asyncio.TimeoutError:
+                await raspuns_eroare(send, 409, "Un request cu același Idempotency-Key este încă în curs", 1)
+                return
+
+        store.incepe(cheie, amprenta)
+        await self._ruleaza(scope, corp, receive, send, cheie, amprenta)
+
+    async def _ruleaza(self, scope, corp: bytes, receive, send, cheie: str, amprenta: str) -> None:
+        corp_trimis = False
+
+        async def receive_cu_corp():
+            nonlocal corp_trimis
+            if not corp_trimis:
+                corp_trimis = True
+                return {"type": "http.request", "body": corp, "more_body": False}
+            return await receive()
+
+        start: dict = {}
+        bucati: List[bytes] = []
+        marime = 0
+
+        async def send_capturat(mesaj):
+            nonlocal marime
+            if mesaj["type"] == "http.response.start":
+                start.update(mesaj)
+            elif mesaj["type"] == "http.response.body" and marime <= IDEMPOTENTA_MAX_OCTETI:
+                bucati.append(mesaj.get("body", b""))
+                marime += len(bucati[-1])
+            await send(mesaj)
+
+        raspuns = None
+        try:
+            await self.app(scope, receive_cu_corp, send_capturat)
+            status = start.get("status", 500)
+            if status < 500 and status != 429 and marime <= IDEMPOTENTA_MAX_OCTETI:
+                raspuns = Raspuns(
+                    time.monotonic() + self.store.ttl, amprenta, status,
+                    list(start.get("headers", [])), b"".join(bucati),
+                )
+        finally:
+            self.store.termina(cheie, raspuns)
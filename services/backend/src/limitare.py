@@ -0,0 +1,213 @@
+"""
+Controlul admiterii pentru scrieri: rate limiting per client și o limită
+globală de scrieri concurente.
+
+POST /programari și POST /programari/batch nu cer autentificare, deci un
+client (sau bot) le poate inunda și ține ocupat scriitorul bazei de date
+pentru toată lumea. LimitareMiddleware (ASGI simplu, ca MetricsMiddleware):
+
+- pe rutele din RUTE_LIMITATE, fiecare request consumă un token din găleata
+  IP-ului clientului și, dacă trimite un token de autentificare, din găleata
+  token-ului (un token furat, folosit de pe multe IP-uri, e limitat și el);
+- pe orice scriere (POST/PUT/PATCH/DELETE, fără login/logout), cel mult
+  SCRIERI_MAX_CONCURENTE requesturi rulează simultan.
+
+Peste limite, requestul primește imediat 429 cu Retry-After, în loc să stea
+la coadă și să crească latența tuturor. Contoarele sunt exportate în /metrics.
+IP-ul este cel din conexiune; în spatele unui proxy, uvicorn --proxy-headers
+îl ia din X-Forwarded-For. Gălețile și contorul de scrieri sunt per worker:
+cu N workeri (doar pe PostgreSQL, vezi verifica_workerii din main.py)
+limitele efective sunt de N ori mai mari.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi.security.utils import get_authorization_scheme_param
+
+
+LIMITARE_ACTIVA = os.getenv("LIMITARE_ACTIVA", "1") not in ("0", "false", "False")
+# Requesturi pe secundă (reumplerea găleții) și rafala maximă, per IP și per token
+LIMITARE_IP_RATA = float(os.getenv("LIMITARE_IP_RATA", "5"))
+LIMITARE_IP_RAFALA = float(os.getenv("LIMITARE_IP_RAFALA", "20"))
+LIMITARE_TOKEN_RATA = float(os.getenv("LIMITARE_TOKEN_RATA", "5"))
+LIMITARE_TOKEN_RAFALA = float(os.getenv("LIMITARE_TOKEN_RAFALA", "20"))
+# Câte găleți sunt ținute în memorie; cele mai vechi sunt uitate primele
+LIMITARE_MAX_CHEI = int(os.getenv("LIMITARE_MAX_CHEI", "100000"))
+# Scrieri în curs simultan, pe proces; 0 = fără limită
+SCRIERI_MAX_CONCURENTE = int(os.getenv("SCRIERI_MAX_CONCURENTE", "64"))
+# Retry-After pentru scrierile respinse din cauza concurenței
+SCRIERI_RETRY_AFTER_SECUNDE = int(os.getenv("SCRIERI_RETRY_AFTER_SECUNDE", "1"))
+
+RUTE_LIMITATE = {("POST", "/programari"), ("POST", "/programari/batch")}
+METODE_SCRIERE = {"POST", "PUT", "PATCH", "DELETE"}
+RUTE_FARA_LIMITA_SCRIERI = {"/login", "/logout"}
+
+
+class GaletiTokeni:
+    """
+    Token bucket per cheie: fiecare cheie are cel mult `rafala` tokeni și
+    primește `rata` tokeni pe secundă. Cel mult `max_chei` găleți (LRU).
+    """
+
+    def __init__(self, rata: float, rafala: float, max_chei: int):
+        self.rata = rata
+        self.rafala = rafala
+        self.max_chei = max_chei
+        # cheie -> (tokeni, momentul ultimei actualizări)
+        self._galeti: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.respinse = 0
+
+    def _tokeni(self, cheie: str, acum: float) -> float:
+        galeata = self._galeti.get(cheie)
+        if galeata is None:
+            return self.rafala
+        tokeni, ultima = galeata
+        return min(self.rafala, tokeni + (acum - ultima) * self.rata)
+
+    def asteptare(self, cheie: str, acum: float) -> float:
+        """Secundele până la primul token disponibil (0 dacă există deja unul)."""
+        lipsa = 1 - self._tokeni(cheie, acum)
+        return 0.0 if lipsa <= 0 else lipsa / self.rata
+
+    def consuma(self, cheie: str, acum: float) -> None:
+        self._galeti[cheie] = (self._tokeni(cheie, acum) - 1, acum)
+        self._galeti.move_to_end(cheie)
+        if len(self._galeti) > self.max_chei:
+            self._galeti.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._galeti)
+
+
+class Limitator:
+    def __init__(self, ip: GaletiTokeni, token: GaletiTokeni, scrieri_max: int):
+        self.ip = ip
+        self.token = token
+        self.scrieri_max = scrieri_max
+        self.scrieri_in_curs = 0
+
+        self.permise = 0
+        self.respinse_concurenta = 0
+        self.scrieri_in_curs_maxim = 0
+
+    def admite(self, ip: str, token: Optional[str]) -> float:
+        """
+        Consumă câte un token din găleata IP-ului și a token-ului. Dacă una
+        dintre ele e goală nu consumă nimic și returnează secundele de
+        așteptare (Retry-After); altfel 0. Găleata token-ului are drept cheie
+        sha256 al lui, ca token-urile să nu stea în clar în memorie.
+        """
+        acum = time.monotonic()
+        if token:
+            token = hashlib.sha256(token.encode()).hexdigest()
+        asteptare_ip = self.ip.asteptare(ip, acum)
+        asteptare_token = self.token.asteptare(token, acum) if token else 0.0
+        if asteptare_ip or asteptare_token:
+            if asteptare_ip:
+                self.ip.respinse += 1
+            if asteptare_token:
+                self.token.respinse += 1
+            return max(asteptare_ip, asteptare_token)
+        self.ip.consuma(ip, acum)
+        if token:
+            self.token.consuma(token, acum)
+        self.permise += 1
+        return 0.0
+
+    def incepe_scrierea(self) -> bool:
+        if self.scrieri_max and self.scrieri_in_curs >= self.scrieri_max:
+            self.respinse_concurenta += 1
+            return False
+        self.scrieri_in_curs += 1
+        self.scrieri_in_curs_maxim = max(self.scrieri_in_curs_maxim, self.scrieri_in_curs)
+        return True
+
+    def termina_scrierea(self) -> None:
+        self.scrieri_in_curs -= 1
+
+    def stats(self) -> dict:
+        return {
+            "activ": LIMITARE_ACTIVA,
+            "permise": self.permise,
+            "respinse_ip": self.ip.respinse,
+            "respinse_token": self.token.respinse,
+            "respinse_concurenta": self.respinse_concurenta,
+            "chei_ip": len(self.ip),
+            "chei_token": len(self.token),
+            "scrieri_in_curs": self.scrieri_in_curs,
+            "scrieri_in_curs_maxim": self.scrieri_in_curs_maxim,
+            "scrieri_max": self.scrieri_max,
+        }
+
+
+limitator = Limitator(
+    GaletiTokeni(LIMITARE_IP_RATA, LIMITARE_IP_RAFALA, LIMITARE_MAX_CHEI),
+    GaletiTokeni(LIMITARE_TOKEN_RATA, LIMITARE_TOKEN_RAFALA, LIMITARE_MAX_CHEI),
+    SCRIERI_MAX_CONCURENTE,
+)
+
+
+def token_din_headere(headere: list) -> Optional[str]:
+    # Același token ca src/auth/jwthandler.py: cookie-ul "Authorization",
+    # sau header-ul Authorization pentru clienții API
+    for nume, valoare in headere:
+        if nume == b"authorization":
+            _, token = get_authorization_scheme_param(valoare.decode("latin-1"))
+            if token:
+                return token
+        elif nume == b"cookie":
+            for bucata in valoare.decode("latin-1").split(";"):
+                cheie, _, continut = bucata.strip().partition("=")
+                if cheie == "Authorization":
+                    _, token = get_authorization_scheme_param(continut.strip('"'))
+                    if token:
+                        return token
+    return None
+
+
+async def raspuns_eroare(send, status: int, detaliu: str, retry_after: Optional[float] = None) -> None:
+    """Răspuns JSON {"detail": ...} trimis direct din middleware, ca HTTPException."""
+    corp = json.dumps({"detail": detaliu}, ensure_ascii=False).encode()
+    headere = [(b"content-type", b"application/json"), (b"content-length", str(len(corp)).encode())]
+    if retry_after is not None:
+        headere.append((b"retry-after", str(max(1, math.ceil(retry_after))).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headere})
+    await send({"type": "http.response.body", "body": corp})
+
+
+class LimitareMiddleware:
+    def __init__(self, app, limitator: Limitator = limitator):
+        self.app = app
+        self.limitator = limitator
+
+    async def __call__(self, scope, receive, send):
+        metoda = scope.get("method")
+        if scope["type"] != "http" or not LIMITARE_ACTIVA or metoda not in METODE_SCRIERE:
+            await self.app(scope, receive, send)
+            return
+
+        cale = scope["path"]
+        if (metoda, cale) in RUTE_LIMITATE:
+            client = scope.get("client")
+            ip = client[0] if client else "necunoscut"
+            asteptare = self.limitator.admite(ip, token_din_headere(scope["headers"]))
+            if asteptare:
+                await raspuns_eroare(send, 429, "Prea multe requesturi; reîncercați mai târziu", asteptare)
+                return
+
+        if cale in RUTE_FARA_LIMITA_SCRIERI:
+            await self.app(scope, receive, send)
+            return
+        if not self.limitator.incepe_scrierea():
+            await raspuns_eroare(send, 429, "Serverul este ocupat; reîncercați mai târziu", SCRIERI_RETRY_AFTER_SECUNDE)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limitator.termina_scrierea()
@@ -0,0 +1,159 @@
+"""
+Logging structurat (JSON pe linie) fără blocarea event loop-ului.
+
+Requesturile doar pun înregistrările într-o coadă limitată (QueueHandler);
+un fir separat (QueueListener) le formatează și le scrie pe stdout. Dacă
+coada e plină, înregistrarea se pierde și se numără, în loc să blocheze
+requestul. Liniile DEBUG sunt eșantionate, iar fiecare linie primește
+request_id-ul requestului curent.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Fracțiunea de linii DEBUG păstrate (1.0 = toate)
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Atributele standard ale LogRecord; restul vin din extra={...}
+_ATRIBUTE_STANDARD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        linie = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for cheie, valoare in vars(record).items():
+            if cheie not in _ATRIBUTE_STANDARD:
+                linie[cheie] = valoare
+        return json.dumps(linie, default=str, ensure_ascii=False)
+
+
+class _ContextFilter(logging.Filter):
+    """Eșantionează DEBUG și adaugă request_id; rulează în contextul requestului."""
+
+    def __init__(self, rata_debug: float):
+        super().__init__()
+        self.rata_debug = rata_debug
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and random.random() >= self.rata_debug:
+            return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class _QueueHandlerNeblocant(QueueHandler):
+    def __init__(self, coada: queue.Queue):
+        super().__init__(coada)
+        self.pierdute = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pierdute += 1
+
+
+_coada: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+_handler = _QueueHandlerNeblocant(_coada)
+_handler.addFilter(_ContextFilter(LOG_DEBUG_SAMPLE_RATE))
+
+_iesire = logging.StreamHandler(sys.stdout)
+_iesire.setFormatter(JsonFormatter())
+_listener = QueueListener(_coada, _iesire, respect_handler_level=False)
+
+log = logging.getLogger("programari")
+log.setLevel(LOG_LEVEL)
+log.addHandler(_handler)
+log.propagate = False
+
+_listener.start()
+
+
+def opreste_logging() -> None:
+    """Golește coada și oprește firul de scriere (apelat la shutdown)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(opreste_logging)
+
+
+def get_logger(nume: str) -> logging.Logger:
+    return log.getChild(nume)
+
+
+def statistici_logging() -> dict:
+    return {"in_coada": _coada.qsize(), "pierdute": _handler.pierdute}
+
+
+class RequestIdMiddleware:
+    """
+    Setează request_id pentru logging din header-ul X-Request-ID (sau unul nou)
+    și îl trimite înapoi în răspuns. Scrie o linie DEBUG (eșantionată) per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.log = get_logger("http")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for nume, valoare in scope["headers"]:
+            if nume == b"x-request-id":
+                request_id = valoare.decode("latin-1")[:64]
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status = {"cod": 500}
+
+        async def send_cu_id(message):
+            if message["type"] == "http.response.start":
+                status["cod"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_cu_id)
+        finally:
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug(
+                    "request terminat",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status["cod"],
+                        "durata_ms": round((time.perf_counter() - start) * 1000, 2),
+                    },
+                )
+            request_id_var.reset(token)
@@ -1,20 +1,57 @@
 
-from fastapi import FastAPI, HTTPException, Depends
+# Primul import: cronometrul pornirii include și importurile de mai jos
+from src.pornire import PORNIRE_BUGET_MS, cronometru_pornire
+
+import logging
+import os
+
+from fastapi import FastAPI, HTTPException, Depends, Body, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from tortoise.contrib.fastapi import register_tortoise
 from tortoise import Tortoise
-from pydantic import BaseModel, EmailStr, Field, validator
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+from pydantic import BaseModel, EmailStr, Field, ValidationError, validator
 from datetime import datetime
-from typing import Optional
-from db.models import Programari, Persoane, Servicii, Job, PersoanaJob
-from datetime import datetime, date
-from fastapi.responses import JSONResponse
+from typing import Any, Dict, List, Optional, Tuple
+from db.amprenta import amprenta_din_db, calculeaza_amprenta
+from db.config import TORTOISE_APP, conexiune_citire, deschide_conexiunile, este_postgres, rezerva_iduri
+from db.models import Programari, ProgramariArhiva, Persoane, Servicii, Job, PersoanaJob
+from datetime import datetime, date, time, timedelta
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from src.arhivare import ARHIVARE_ACTIVA, arhivator
 
 # Import auth routes
 from src.routes import users
+from src.auth.cache import user_cache
+from src.auth.hashing import password_hasher
 from src.auth.jwthandler import get_current_user
-
-app = FastAPI(title="Programari API")
+from src.cautare import asigura_indexul, cauta_iduri
+from src.cache.catalog import cache_catalog, job_pentru_serviciu, joburi_pentru_servicii, raspuns_cu_etag
+from src.cache.disponibilitate import asigura_constrangerea, este_suprapunere, index_ocupare, MAX_ZILE_INTERVAL
+from src.evenimente import magistrala, rand_programare
+from src.export import FORMATE, export_csv, export_ndjson
+from src.idempotenta import IdempotentaMiddleware, store_idempotenta
+from src.limitare import LimitareMiddleware, limitator
+from src.logger import RequestIdMiddleware, get_logger, opreste_logging, statistici_logging
+from src.metrics import MetricsMiddleware, metrici
+from src.paginare import LIMITA_IMPLICITA, LIMITA_MAXIMA, codifica_cursor, dupa_cursor
+from src.raspunsuri import RaspunsJSON, raspuns
+from src.statistici import GRUPARI, MAX_ZILE_STATISTICI, asigura_contoarele, citeste_statistici
+from src.versiuni import actualizeaza_programarea, etag_versiune, versiune_din_if_match
+
+# orjson pentru toate răspunsurile; listele mari ocolesc și jsonable_encoder prin raspuns()
+app = FastAPI(title="Programari API", default_response_class=RaspunsJSON)
+log = get_logger("api")
+
+# Numărul maxim de programări acceptate într-un singur POST /programari/batch
+MAX_PROGRAMARI_BATCH = 500
+
+# Workerii serverului (uvicorn --workers și gunicorn citesc WEB_CONCURRENCY).
+# Indexul de ocupare, idempotența, limitarea și magistrala SSE sunt în
+# memoria fiecărui proces; vezi verifica_workerii()
+WORKERI = int(os.getenv("WEB_CONCURRENCY", "1"))
 
 # enable schemas to read relationship between models
 Tortoise.init_models(["db.models"], "models")  # NEW
@@ -23,27 +60,49 @@ origins = [
     "http://localhost:8080",   # frontend-ul Vue
     "http://127.0.0.1:8080"
 ]
+# Rate limiting și limita de scrieri concurente; în interiorul CORS, ca
+# frontend-ul să poată citi 429-urile, și al metricilor, care le numără
+app.add_middleware(LimitareMiddleware)
+# Idempotency-Key: în afara limitării, ca reîncercările deja răspunse să nu
+# consume tokeni sau locuri de scriere
+app.add_middleware(IdempotentaMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "ETag", "Retry-After", "Idempotent-Replayed"],
 )
+# Metrici per rută (/metrics); adăugat ultimul ca să măsoare tot lanțul
+app.add_middleware(MetricsMiddleware)
+# request_id pentru log-uri; cel mai din exterior, ca să acopere și metricile
+app.add_middleware(RequestIdMiddleware)
+metrici.adauga_colector("user_cache", user_cache.stats)
+metrici.adauga_colector("password_hashing", password_hasher.stats)
+metrici.adauga_colector("logging", statistici_logging)
+metrici.adauga_colector("arhivare", arhivator.stats)
+metrici.adauga_colector("sse", magistrala.stats)
+metrici.adauga_colector("pornire", cronometru_pornire.stats)
+metrici.adauga_colector("limitare", limitator.stats)
+metrici.adauga_colector("idempotenta", store_idempotenta.stats)
+metrici.adauga_colector("catalog", cache_catalog.stats)
+
 # Include auth routes - authentication is optional for now
 app.include_router(users.router, tags=["Authentication"])
 
 async def filtreaza_programari_data_curenta():
     """
     Filtrează programările pentru a afișa doar cele din data curentă și viitoare.
-    Programările din trecut rămân în baza de date dar nu sunt afișate.
+    Programările din trecut rămân în baza de date dar nu sunt afișate, până
+    când arhivatorul (src/arhivare.py) le mută în Programari_archive.
     """
     try:
         azi = date.today()
         # Nu ștergem programările, doar le filtrăm la afișare
         return azi
     except Exception as e:
-        print(f"Eroare la obținerea datei curente: {e}")
+        log.error("Eroare la obținerea datei curente", exc_info=e)
         return None
 
 
@@ -54,7 +113,7 @@ class ProgramareIn(BaseModel):
         description="Data programării în format YYYY-MM-DD",
         example="2025-10-15"
     )
-    ora: str = Field(
+    ora: time = Field(
         ...,
         description="Ora programării în format HH:MM",
         example="14:30"
@@ -143,13 +202,14 @@ class ProgramareIn(BaseModel):
                 raise ValueError('Formatul datei trebuie să fie YYYY-MM-DD')
             raise e
 
-    @validator('ora')
+    @validator('ora', pre=True)
     def validate_ora(cls, v):
-        """Verifică că ora este în format corect."""
-        try:
-            datetime.strptime(v, '%H:%M')
+        """Verifică formatul orei (HH:MM sau HH:MM:SS) și o păstrează ca time."""
+        if isinstance(v, time):
             return v
-        except ValueError:
+        try:
+            return time.fromisoformat(v)
+        except (TypeError, ValueError):
             raise ValueError('Formatul orei trebuie să fie HH:MM (ex: 14:30)')
 
     # @validator('nume', 'prenume')
@@ -173,6 +233,26 @@ class ProgramareIn(BaseModel):
         }
 
 
+def date_programare(prog: ProgramareIn) -> dict:
+    """Câmpurile de salvat pentru o programare nouă (fără job_id, dedus din serviciu)."""
+    programare_data = {
+        "data": prog.data,
+        "ora": prog.ora,
+        "observatii": prog.observatii,
+        "nume": prog.nume,
+        "prenume": prog.prenume,
+        "email": prog.email,
+        "telefon": prog.telefon
+    }
+
+    # Adaugă relațiile directe
+    if prog.persoana_id is not None:
+        programare_data["persoana_id"] = prog.persoana_id
+    if prog.serviciu_id is not None:
+        programare_data["serviciu_id"] = prog.serviciu_id
+    return programare_data
+
+
 @app.get("/")
 async def root():
     """
@@ -189,97 +269,414 @@ async def root():
         }
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Metricile aplicației în format text Prometheus."""
+    return PlainTextResponse(metrici.exporta(), media_type="text/plain; version=0.0.4")
+
 @app.get("/jobs")
-async def get_jobs():
-    jobs = await Job.all().values()
-    return jobs
+async def get_jobs(request: Request):
+    async def incarca():
+        return await Job.all().using_db(conexiune_citire()).values()
+
+    jobs, etag = await cache_catalog.obtine("jobs", incarca)
+    return raspuns_cu_etag(request, jobs, etag)
 
 @app.get("/persoane")
-async def get_persoane(job_id: Optional[int] = None):
-    if job_id is not None:
-        # Găsește persoanele calificate pentru acest job prin PersoanaJob
-        persoane_job = await PersoanaJob.filter(job_id=job_id).prefetch_related('persoana')
-        persoane_ids = [pj.persoana_id for pj in persoane_job]
-        persoane = await Persoane.filter(id__in=persoane_ids).values()
-    else:
-        persoane = await Persoane.all().values()
-    return persoane
+async def get_persoane(request: Request, job_id: Optional[int] = None):
+    async def incarca():
+        if job_id is not None:
+            # Persoanele calificate pentru acest job: un singur JOIN cu PersoanaJob
+            return await Persoane.filter(joburi_relation__job_id=job_id).using_db(conexiune_citire()).values(
+                "id", "nume", "prenume", "job_id"
+            )
+        return await Persoane.all().using_db(conexiune_citire()).values()
+
+    persoane, etag = await cache_catalog.obtine(f"persoane:{job_id}", incarca)
+    return raspuns_cu_etag(request, persoane, etag)
 
 @app.get("/servicii")
-async def get_servicii(job_id: Optional[int] = None):
-    if job_id is not None:
-        servicii = await Servicii.filter(job_id=job_id).values()
-    else:
-        servicii = await Servicii.all().values()
-    return servicii
+async def get_servicii(request: Request, job_id: Optional[int] = None):
+    async def incarca():
+        if job_id is not None:
+            return await Servicii.filter(job_id=job_id).using_db(conexiune_citire()).values()
+        return await Servicii.all().using_db(conexiune_citire()).values()
+
+    servicii, etag = await cache_catalog.obtine(f"servicii:{job_id}", incarca)
+    return raspuns_cu_etag(request, servicii, etag)
+
+@app.get("/disponibilitate")
+async def get_disponibilitate(
+    request: Request,
+    persoana_id: int,
+    de_la: date = Query(..., alias="from", description="Prima zi, YYYY-MM-DD"),
+    pana_la: Optional[date] = Query(None, alias="to", description="Ultima zi (inclusiv), YYYY-MM-DD"),
+):
+    """
+    Returnează sloturile libere ale unei persoane pentru fiecare zi din interval.
+    Răspunsul vine din indexul de ocupare din memorie, fără interogări în baza de date.
+    """
+    if pana_la is None:
+        pana_la = de_la
+    if pana_la < de_la:
+        raise HTTPException(status_code=400, detail="'to' nu poate fi înainte de 'from'")
+    numar_zile = (pana_la - de_la).days + 1
+    if numar_zile > MAX_ZILE_INTERVAL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Intervalul maxim este de {MAX_ZILE_INTERVAL} zile",
+        )
+
+    zile = []
+    for i in range(numar_zile):
+        zi = de_la + timedelta(days=i)
+        zile.append({"data": zi, "sloturi_libere": index_ocupare.sloturi_libere(persoana_id, zi)})
+
+    return raspuns(request, {"persoana_id": persoana_id, "zile": zile})
 
 @app.get("/programari")
-async def get_programari(persoana_id: Optional[int] = None, job_id: Optional[int] = None):
+async def get_programari(
+    request: Request,
+    persoana_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    de_la: Optional[date] = Query(None, alias="from", description="Prima zi inclusă, YYYY-MM-DD"),
+    pana_la: Optional[date] = Query(None, alias="to", description="Ultima zi inclusă, YYYY-MM-DD"),
+    cursor: Optional[str] = Query(None, description="Valoarea din header-ul X-Next-Cursor"),
+    ora_de_la: Optional[time] = Query(None, alias="ora_from", description="Prima oră inclusă, HH:MM"),
+    ora_pana_la: Optional[time] = Query(None, alias="ora_to", description="Ultima oră inclusă, HH:MM"),
+    limit: int = Query(LIMITA_IMPLICITA, ge=1, le=LIMITA_MAXIMA),
+):
    """
-   Returnează programările din data curentă și viitoare.
-   Poate filtra după persoana_id și/sau job_id.
+   Returnează programările din data curentă și viitoare, ordonate după (data, ora, id).
+   Poate filtra după persoana_id, job_id, intervalul from/to și fereastra
+   orară ora_from/ora_to (aplicată fiecărei zile, din indexul (data, ora)).
+   Rezultatele sunt paginate keyset: dacă mai există rânduri, header-ul
+   X-Next-Cursor conține cursorul pentru pagina următoare.
    """
    # Obține data curentă pentru filtrare
    data_curenta = await filtreaza_programari_data_curenta()
 
    # Construiește filtrele
    filters = {}
-   if data_curenta:
+   if de_la is not None:
+       filters['data__gte'] = de_la
+   elif data_curenta:
        filters['data__gte'] = data_curenta
+   if pana_la is not None:
+       filters['data__lte'] = pana_la
    if persoana_id is not None:
        filters['persoana_id'] = persoana_id
    if job_id is not None:
        filters['job_id'] = job_id
+   if ora_de_la is not None and ora_pana_la is not None and ora_pana_la < ora_de_la:
+       raise HTTPException(status_code=400, detail="'ora_to' nu poate fi înainte de 'ora_from'")
+   if ora_de_la is not None:
+       filters['ora__gte'] = ora_de_la
+   if ora_pana_la is not None:
+       filters['ora__lte'] = ora_pana_la
+
+   # Aplică filtrele și cursorul
+   query = Programari.filter(**filters).using_db(conexiune_citire())
+   if cursor:
+       query = query.filter(dupa_cursor(cursor))
+
+   # Cerem un rând în plus ca să știm dacă există pagina următoare
+   programari = await query.order_by("data", "ora", "id").limit(limit + 1).values()
+   headers = {}
+   if len(programari) > limit:
+       programari = programari[:limit]
+       headers["X-Next-Cursor"] = codifica_cursor(programari[-1])
+
+   if log.isEnabledFor(logging.DEBUG):
+       log.debug(
+           "Programări afișate",
+           extra={"numar": len(programari), "persoana_id": persoana_id, "job_id": job_id, "cu_cursor": cursor is not None},
+       )
+   return raspuns(request, programari, headers=headers)
+
+
+@app.get("/programari/search")
+async def cauta_programari(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=100, description="Nume, prenume, email sau telefon (prefixe)"),
+    limit: int = Query(LIMITA_IMPLICITA, ge=1, le=LIMITA_MAXIMA),
+    current_user = Depends(get_current_user),
+):
+    """
+    Caută programările după datele clientului (doar pentru utilizatori
+    autentificați). Fiecare cuvânt din `q` trebuie să fie începutul unui nume,
+    prenume sau al unei părți din email; un număr de telefon este căutat doar
+    după cifre. Returnează cele mai noi `limit` programări găsite.
+    """
+    ids = await cauta_iduri(q, limit)
+    if ids is None:
+        raise HTTPException(status_code=400, detail="Textul căutat trebuie să conțină un cuvânt de cel puțin 2 caractere")
+    pozitii = {id_: pozitie for pozitie, id_ in enumerate(ids)}
+    programari = await Programari.filter(id__in=ids).using_db(conexiune_citire()).values() if ids else []
+    programari.sort(key=lambda rand: pozitii[rand["id"]])
+    return raspuns(request, programari)
+
+
+@app.get("/programari/export")
+async def export_programari(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    persoana_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    de_la: Optional[date] = Query(None, alias="from", description="Prima zi inclusă, YYYY-MM-DD"),
+    pana_la: Optional[date] = Query(None, alias="to", description="Ultima zi inclusă, YYYY-MM-DD"),
+    current_user = Depends(get_current_user),
+):
+    """
+    Exportă programările (inclusiv cele din trecut, încă nearhivate) ca NDJSON
+    sau CSV, în flux (doar pentru utilizatori autentificați).
+    """
+    filters = {}
+    if de_la is not None:
+        filters['data__gte'] = de_la
+    if pana_la is not None:
+        filters['data__lte'] = pana_la
+    if persoana_id is not None:
+        filters['persoana_id'] = persoana_id
+    if job_id is not None:
+        filters['job_id'] = job_id
 
-   # Aplică filtrele
-   if filters:
-       programari = await Programari.filter(**filters).values()
-       print(f"Displayed {len(programari)} appointments with filters: {filters}")
-   else:
-       programari = await Programari.all().values()
-       print("Showing all appointments (no filters)")
+    generator = export_csv(filters) if format == "csv" else export_ndjson(filters)
+    return StreamingResponse(
+        generator,
+        media_type=FORMATE[format],
+        headers={"Content-Disposition": f'attachment; filename="programari.{format}"'},
+    )
 
-   return programari
+
+@app.get("/programari/stream")
+async def stream_programari(
+    persoana_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events cu programările create, actualizate sau șterse
+    (evenimentele "creata", "actualizata", "stearsa"), filtrate opțional după
+    persoana_id și/sau job_id. Fiecare eveniment conține doar rândul modificat.
+    La reconectare, EventSource trimite Last-Event-ID și primește evenimentele
+    pierdute sau "resync" dacă lista trebuie reîncărcată.
+    """
+    return StreamingResponse(
+        magistrala.flux(persoana_id, job_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/programari/arhiva")
+async def get_programari_arhiva(
+    request: Request,
+    persoana_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    de_la: Optional[date] = Query(None, alias="from", description="Prima zi inclusă, YYYY-MM-DD"),
+    pana_la: Optional[date] = Query(None, alias="to", description="Ultima zi inclusă, YYYY-MM-DD"),
+    cursor: Optional[str] = Query(None, description="Valoarea din header-ul X-Next-Cursor"),
+    limit: int = Query(LIMITA_IMPLICITA, ge=1, le=LIMITA_MAXIMA),
+    current_user = Depends(get_current_user),
+):
+    """
+    Istoricul programărilor mutate în arhivă (doar pentru utilizatori autentificați),
+    cu aceleași filtre și aceeași paginare keyset ca GET /programari.
+    """
+    filters = {}
+    if de_la is not None:
+        filters['data__gte'] = de_la
+    if pana_la is not None:
+        filters['data__lte'] = pana_la
+    if persoana_id is not None:
+        filters['persoana_id'] = persoana_id
+    if job_id is not None:
+        filters['job_id'] = job_id
+
+    query = ProgramariArhiva.filter(**filters).using_db(conexiune_citire())
+    if cursor:
+        query = query.filter(dupa_cursor(cursor))
+
+    programari = await query.order_by("data", "ora", "id").limit(limit + 1).values()
+    headers = {}
+    if len(programari) > limit:
+        programari = programari[:limit]
+        headers["X-Next-Cursor"] = codifica_cursor(programari[-1])
+    return raspuns(request, programari, headers=headers)
+
+
+@app.get("/programari/arhiva/statistici")
+async def get_statistici_arhivare(current_user = Depends(get_current_user)):
+    """Câte programări a mutat arhivatorul și cât a durat ultima rulare."""
+    return arhivator.stats()
+
+
+@app.post("/programari/arhiva/ruleaza")
+async def ruleaza_arhivare(current_user = Depends(get_current_user)):
+    """Rulează imediat o trecere de arhivare (în afara intervalului programat)."""
+    return await arhivator.ruleaza()
+
+
+@app.get("/statistici")
+async def get_statistici(
+    request: Request,
+    de_la: date = Query(..., alias="from", description="Prima zi, YYYY-MM-DD"),
+    pana_la: Optional[date] = Query(None, alias="to", description="Ultima zi (inclusiv), YYYY-MM-DD"),
+    grupare: str = Query("zi,job,persoana", description="Oricare dintre zi, job, persoana, separate prin virgulă"),
+    job_id: Optional[int] = None,
+    persoana_id: Optional[int] = None,
+    current_user = Depends(get_current_user),
+):
+    """
+    Numărul de programări (inclusiv cele arhivate) pe zi, job și/sau persoană.
+    Citește contoarele din Statistici_zilnice, nu programările, deci durata nu
+    crește cu istoricul.
+    """
+    if pana_la is None:
+        pana_la = de_la
+    if pana_la < de_la:
+        raise HTTPException(status_code=400, detail="'to' nu poate fi înainte de 'from'")
+    if (pana_la - de_la).days + 1 > MAX_ZILE_STATISTICI:
+        raise HTTPException(status_code=400, detail=f"Intervalul maxim este de {MAX_ZILE_STATISTICI} zile")
+    grupari = [nume.strip() for nume in grupare.split(",") if nume.strip()]
+    necunoscute = [nume for nume in grupari if nume not in GRUPARI]
+    if necunoscute:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Grupare necunoscută: {', '.join(necunoscute)} (valori posibile: {', '.join(GRUPARI)})",
+        )
+
+    randuri = await citeste_statistici(de_la, pana_la, grupari, job_id=job_id, persoana_id=persoana_id)
+    return raspuns(request, {
+        "from": de_la,
+        "to": pana_la,
+        "grupare": [nume for nume in GRUPARI if nume in grupari],
+        "total": sum(rand["numar"] for rand in randuri),
+        "randuri": randuri,
+    })
 
 
 @app.post("/programari")
-async def create_programare(prog: ProgramareIn):
+async def create_programare(prog: ProgramareIn, response: Response):
     """
     Creează o programare nouă cu structura actualizată.
     O persoană poate avea multiple job-uri, iar programarea se face pentru un job specific.
     """
     try:
         # Pregătește datele pentru structura actuală
-        programare_data = {
-            "data": prog.data,
-            "ora": prog.ora,
-            "observatii": prog.observatii,
-            "nume": prog.nume,
-            "prenume": prog.prenume,
-            "email": prog.email,
-            "telefon": prog.telefon
-        }
+        programare_data = date_programare(prog)
 
-        # Adaugă relațiile directe
-        if prog.persoana_id is not None:
-            programare_data["persoana_id"] = prog.persoana_id
+        # Determină job-ul pe baza serviciului selectat (din cache-ul de catalog)
         if prog.serviciu_id is not None:
-            programare_data["serviciu_id"] = prog.serviciu_id
+            job_id = await job_pentru_serviciu(prog.serviciu_id)
+            if job_id is not None:
+                programare_data["job_id"] = job_id
 
-        # Determină job-ul pe baza serviciului selectat
-        if prog.serviciu_id is not None:
-            serviciu = await Servicii.get_or_none(id=prog.serviciu_id)
-            if serviciu:
-                programare_data["job_id"] = serviciu.job_id
+        # Rezervă slotul în indexul de ocupare (fără scanarea tabelei)
+        if prog.persoana_id is not None:
+            if not index_ocupare.ocupa(prog.persoana_id, prog.data, prog.ora):
+                raise HTTPException(status_code=409, detail="Slotul este deja ocupat pentru această persoană")
 
         # Creează programarea
-        p = await Programari.create(**programare_data)
+        try:
+            p = await Programari.create(**programare_data)
+        except Exception as e:
+            if prog.persoana_id is not None:
+                index_ocupare.elibereaza(prog.persoana_id, prog.data, prog.ora)
+            # Slotul ocupat de alt worker: refuzat de constrângerea PostgreSQL
+            if isinstance(e, IntegrityError) and este_suprapunere(e):
+                raise HTTPException(status_code=409, detail="Slotul este deja ocupat pentru această persoană")
+            raise
+        if prog.persoana_id is not None:
+            index_ocupare.leaga(p.id, prog.persoana_id, prog.data, prog.ora)
+        magistrala.publica("creata", rand_programare(p))
+        response.headers["ETag"] = etag_versiune(p.version)
         return {"status": "success", "id": p.id, "message": "Programare creată cu succes"}
 
+    except HTTPException:
+        raise
     except Exception as e:
+        log.exception("Eroare la crearea programării")
         raise HTTPException(status_code=500, detail=f"Eroare la crearea programării: {str(e)}")
 
 
+@app.post("/programari/batch")
+async def create_programari_batch(
+    items: List[Dict[str, Any]] = Body(..., max_items=MAX_PROGRAMARI_BATCH),
+):
+    """
+    Creează mai multe programări într-o singură tranzacție.
+    Fiecare element este validat separat; cele invalide sau cu slotul ocupat
+    sunt raportate în "rezultate" și nu blochează restul.
+    """
+    rezultate: List[Optional[dict]] = [None] * len(items)
+    valide: List[Tuple[int, ProgramareIn]] = []
+
+    for index, item in enumerate(items):
+        try:
+            valide.append((index, ProgramareIn.parse_obj(item)))
+        except ValidationError as e:
+            rezultate[index] = {"index": index, "status": "error", "detail": e.errors()}
+
+    # Toate mapările serviciu -> job dintr-o dată
+    joburi = await joburi_pentru_servicii(
+        {prog.serviciu_id for _, prog in valide if prog.serviciu_id is not None}
+    )
+
+    de_creat: List[Tuple[int, ProgramareIn]] = []
+    for index, prog in valide:
+        if prog.persoana_id is not None and not index_ocupare.ocupa(prog.persoana_id, prog.data, prog.ora):
+            rezultate[index] = {
+                "index": index,
+                "status": "error",
+                "detail": "Slotul este deja ocupat pentru această persoană",
+            }
+            continue
+        de_creat.append((index, prog))
+
+    date_obiecte = []
+    for _, prog in de_creat:
+        programare_data = date_programare(prog)
+        if prog.serviciu_id is not None and joburi.get(prog.serviciu_id) is not None:
+            programare_data["job_id"] = joburi[prog.serviciu_id]
+        date_obiecte.append(programare_data)
+
+    try:
+        if date_obiecte:
+            async with in_transaction("default") as conn:
+                # bulk_create nu întoarce id-urile: se rezervă întâi și se scriu
+                # explicit, deci fiecare id aparține elementului lui
+                ids = await rezerva_iduri(conn, Programari, len(date_obiecte))
+                obiecte = [Programari(id=id_, **valori) for id_, valori in zip(ids, date_obiecte)]
+                await Programari.bulk_create(obiecte, using_db=conn)
+            for (index, _), obiect, id_ in zip(de_creat, obiecte, ids):
+                rezultate[index] = {"index": index, "status": "success", "id": id_}
+                obiect.id = id_
+                if obiect.persoana_id is not None:
+                    index_ocupare.leaga(id_, obiect.persoana_id, obiect.data, obiect.ora)
+                magistrala.publica("creata", rand_programare(obiect))
+    except Exception as e:
+        for _, prog in de_creat:
+            if prog.persoana_id is not None:
+                index_ocupare.elibereaza(prog.persoana_id, prog.data, prog.ora)
+        if isinstance(e, IntegrityError) and este_suprapunere(e):
+            # Un slot a fost ocupat între timp de alt worker; tranzacția e
+            # anulată, deci niciun element nu a fost creat
+            raise HTTPException(
+                status_code=409, detail="Un slot din lot este deja ocupat; nicio programare nu a fost creată"
+            )
+        log.exception("Eroare la crearea programărilor")
+        raise HTTPException(status_code=500, detail=f"Eroare la crearea programărilor: {str(e)}")
+
+    create = len(de_creat)
+    return {
+        "status": "success" if create == len(items) else "partial",
+        "create": create,
+        "erori": len(items) - create,
+        "rezultate": rezultate,
+    }
+
+
 @app.delete("/programari/{programare_id}")
 async def delete_programare(programare_id: int, current_user = Depends(get_current_user)):
     """
@@ -291,21 +688,32 @@ async def delete_programare(programare_id: int, current_user = Depends(get_curre
             raise HTTPException(status_code=404, detail="Programarea nu a fost găsită")
 
         await programare.delete()
+        index_ocupare.uita(programare.id)
+        magistrala.publica("stearsa", rand_programare(programare))
         return {"status": "success", "message": "Programare ștearsă cu succes"}
+    except HTTPException:
+        raise
     except Exception as e:
+        log.exception("Eroare la ștergerea programării")
         raise HTTPException(status_code=500, detail=f"Eroare la ștergerea programării: {str(e)}")
 
 
 @app.put("/programari/{programare_id}")
-async def update_programare(programare_id: int, prog: ProgramareIn, current_user = Depends(get_current_user)):
+async def update_programare(
+    programare_id: int,
+    prog: ProgramareIn,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user = Depends(get_current_user),
+):
     """
     Actualizează o programare (doar pentru utilizatori autentificați).
+    Cu If-Match (ETag-ul primit la creare, la PUT sau câmpul "version" din
+    GET /programari), update-ul se aplică doar dacă programarea nu a fost
+    modificată între timp; altfel răspunde 412.
     """
+    versiune = versiune_din_if_match(if_match)
     try:
-        programare = await Programari.get_or_none(id=programare_id)
-        if not programare:
-            raise HTTPException(status_code=404, detail="Programarea nu a fost găsită")
-
         # Update programare data
         update_data = {
             "data": prog.data,
@@ -323,24 +731,144 @@ async def update_programare(programare_id: int, prog: ProgramareIn, current_user
         if prog.serviciu_id is not None:
             update_data["serviciu_id"] = prog.serviciu_id
 
-        await programare.update_from_dict(update_data)
-        await programare.save()
+        # Slotul vechi vine din indexul de ocupare, nu dintr-un SELECT. Rândul
+        # se citește doar când programarea nu ocupă niciun slot și persoana
+        # nu e trimisă (rămâne cea din baza de date).
+        slot_vechi = index_ocupare.slot_programare(programare_id)
+        if slot_vechi is not None:
+            persoana_veche = slot_vechi[0]
+        elif prog.persoana_id is None:
+            persoana_veche = await Programari.filter(id=programare_id).first().values_list("persoana_id", flat=True)
+        else:
+            persoana_veche = None
+
+        # Mută slotul în indexul de ocupare dacă persoana, data sau ora se schimbă
+        persoana_noua = update_data.get("persoana_id", persoana_veche)
+        slot_nou = (persoana_noua, datetime.strptime(prog.data, '%Y-%m-%d').date(), prog.ora)
+        rezerva_slot = persoana_noua is not None and slot_nou != slot_vechi
+        if rezerva_slot:
+            if not index_ocupare.ocupa(*slot_nou, exceptie=slot_vechi):
+                raise HTTPException(status_code=409, detail="Slotul este deja ocupat pentru această persoană")
 
-        return {"status": "success", "message": "Programare actualizată cu succes"}
+        try:
+            programare = await actualizeaza_programarea(programare_id, versiune, update_data)
+        except Exception as e:
+            if rezerva_slot:
+                index_ocupare.elibereaza(*slot_nou)
+            if isinstance(e, IntegrityError) and este_suprapunere(e):
+                raise HTTPException(status_code=409, detail="Slotul este deja ocupat pentru această persoană")
+            raise
+
+        if programare is None:
+            if rezerva_slot:
+                index_ocupare.elibereaza(*slot_nou)
+            # Niciun rând potrivit: lipsește sau are altă versiune
+            if versiune is None or not await Programari.exists(id=programare_id):
+                raise HTTPException(status_code=404, detail="Programarea nu a fost găsită")
+            raise HTTPException(
+                status_code=412,
+                detail="Programarea a fost modificată între timp; reîncărcați-o și încercați din nou",
+            )
+
+        index_ocupare.leaga(programare.id, programare.persoana_id, programare.data, programare.ora)
+        # Update-ul nu schimbă job-ul, deci rândul anterior diferă doar prin persoană
+        anterior = {"persoana_id": persoana_veche, "job_id": programare.job_id}
+        magistrala.publica("actualizata", rand_programare(programare), anterior)
+
+        response.headers["ETag"] = etag_versiune(programare.version)
+        return {"status": "success", "version": programare.version, "message": "Programare actualizată cu succes"}
+    except HTTPException:
+        raise
     except Exception as e:
+        log.exception("Eroare la actualizarea programării")
         raise HTTPException(status_code=500, detail=f"Eroare la actualizarea programării: {str(e)}")
 
 
-import os
-from pathlib import Path
+cronometru_pornire.marcheaza("import")
 
-# Use DATABASE_URL from environment
-db_url = os.getenv("DATABASE_URL", "sqlite:///tmp/db/programari.db")
 
+# Conexiunile (scriere + citire) și profilul SQLite vin din db/config.py.
+# Schemele sunt generate de genereaza_schemele(), doar când e nevoie.
 register_tortoise(
     app,
-    db_url=db_url,
-    modules={"models": ["db.models"]},
-    generate_schemas=True,  # Generate schemas from models
+    config=TORTOISE_APP,
+    generate_schemas=False,
     add_exception_handlers=True,
 )
+
+
+@app.on_event("startup")
+async def verifica_workerii():
+    """
+    Pe SQLite singura protecție contra programărilor suprapuse este indexul
+    de ocupare al procesului, deci aplicația refuză să pornească cu mai mulți
+    workeri. Pe PostgreSQL constrângerea de excludere ține locul indexului,
+    dar cheile de idempotență, limitele și evenimentele SSE rămân per worker.
+    """
+    if WORKERI <= 1:
+        return
+    if not este_postgres():
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={WORKERI}: cu SQLite backend-ul rulează cu un singur worker"
+        )
+    log.warning(
+        "Mai mulți workeri: idempotența, limitarea și SSE sunt per worker",
+        extra={"workeri": WORKERI},
+    )
+
+
+@app.on_event("startup")
+async def deschide_conexiunile_db():
+    """Conexiunile (inclusiv cele de citire) deschise înainte de primul request."""
+    cronometru_pornire.marcheaza("init_orm")
+    await deschide_conexiunile()
+    cronometru_pornire.marcheaza("conexiuni")
+
+
+@app.on_event("startup")
+async def genereaza_schemele():
+    """
+    Generează schemele doar dacă baza nu a fost pregătită de prepare_db.py
+    pentru codul curent (amprenta din db/amprenta.py diferă sau lipsește).
+    """
+    conn = Tortoise.get_connection("default")
+    la_zi = await amprenta_din_db(conn) == calculeaza_amprenta()
+    if not la_zi:
+        await Tortoise.generate_schemas()
+    # Indexul de căutare lipsește pe bazele fără migrări; trigger-ele SQLite
+    # se repun oricum (câteva CREATE ... IF NOT EXISTS)
+    await asigura_indexul(conn)
+    # La fel trigger-ele contoarelor; tabela goală se populează o singură dată
+    await asigura_contoarele(conn)
+    # PostgreSQL: suprapunerile refuzate și în baza de date (mai mulți workeri)
+    await asigura_constrangerea(conn)
+    cronometru_pornire.scheme_generate = not la_zi
+    cronometru_pornire.marcheaza("scheme")
+
+
+@app.on_event("startup")
+async def incarca_index_ocupare():
+    """Construiește indexul de ocupare după ce Tortoise a fost inițializat."""
+    await index_ocupare.incarca()
+    cronometru_pornire.marcheaza("index_ocupare")
+
+
+@app.on_event("startup")
+async def porneste_arhivarea():
+    if ARHIVARE_ACTIVA:
+        arhivator.porneste()
+    cronometru_pornire.marcheaza("arhivare")
+
+    total = cronometru_pornire.termina()
+    extra = {"total_ms": total, "faze_ms": dict(cronometru_pornire.faze_ms)}
+    if cronometru_pornire.peste_buget():
+        log.warning("Pornire peste buget", extra={**extra, "buget_ms": PORNIRE_BUGET_MS})
+    else:
+        log.info("Aplicația a pornit", extra=extra)
+
+
+@app.on_event("shutdown")
+async def opreste_executor_parole():
+    await arhivator.opreste()
+    password_hasher.shutdown()
+    opreste_logging()
@@ -0,0 +1,210 @@
+"""
+Metrici per rută în format text Prometheus.
+
+MetricsMiddleware este un middleware ASGI simplu (fără BaseHTTPMiddleware, ca să
+nu bufferizeze răspunsurile în flux) care măsoară latența, dimensiunea
+răspunsului și numărul de interogări ORM pentru fiecare request. Interogările
+sunt numărate de metodele execute_* ale clienților Tortoise (SQLite,
+PostgreSQL), învelite o singură dată (numara_interogari); nivelul de log al
+"tortoise.db_client" rămâne neschimbat, deci SQL-ul și parametrii lui nu
+devin înregistrări de log.
+"""
+
+import functools
+import importlib
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+BUCKETS_LATENTA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_DIMENSIUNE = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+BUCKETS_INTEROGARI = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+class Histograma:
+    __slots__ = ("buckets", "contoare", "suma", "numar")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.contoare = [0] * (len(buckets) + 1)
+        self.suma = 0.0
+        self.numar = 0
+
+    def observa(self, valoare: float) -> None:
+        self.contoare[bisect_left(self.buckets, valoare)] += 1
+        self.suma += valoare
+        self.numar += 1
+
+    def linii(self, nume: str, etichete: str) -> List[str]:
+        linii = []
+        cumulat = 0
+        for limita, contor in zip(self.buckets, self.contoare):
+            cumulat += contor
+            linii.append(f'{nume}_bucket{{{etichete},le="{limita}"}} {cumulat}')
+        linii.append(f'{nume}_bucket{{{etichete},le="+Inf"}} {self.numar}')
+        linii.append(f"{nume}_sum{{{etichete}}} {self.suma}")
+        linii.append(f"{nume}_count{{{etichete}}} {self.numar}")
+        return linii
+
+
+class _Contor:
+    __slots__ = ("valoare",)
+
+    def __init__(self):
+        self.valoare = 0
+
+
+_interogari_request: ContextVar[Optional[_Contor]] = ContextVar("interogari_request", default=None)
+# True în interiorul unei interogări numărate: un execute_* care apelează
+# implementarea clasei de bază (super()) nu este numărat a doua oară
+_in_interogare: ContextVar[bool] = ContextVar("in_interogare", default=False)
+
+METODE_EXECUTE = ("execute_query", "execute_query_dict", "execute_insert", "execute_many", "execute_script")
+# Clasele care definesc execute_*; backend-urile neinstalate sunt sărite
+CLIENTI_TORTOISE = (
+    ("tortoise.backends.sqlite.client", ("SqliteClient", "TransactionWrapper")),
+    ("tortoise.backends.base_postgres.client", ("BasePostgresClient",)),
+    ("tortoise.backends.asyncpg.client", ("AsyncpgDBClient", "TransactionWrapper")),
+)
+
+
+def _numarata(metoda):
+    @functools.wraps(metoda)
+    async def numarata(self, *args, **kwargs):
+        contor = _interogari_request.get()
+        if contor is None or _in_interogare.get():
+            return await metoda(self, *args, **kwargs)
+        contor.valoare += 1
+        token = _in_interogare.set(True)
+        try:
+            return await metoda(self, *args, **kwargs)
+        finally:
+            _in_interogare.reset(token)
+
+    numarata.numarata = True
+    return numarata
+
+
+def numara_interogari() -> None:
+    """Învelește execute_* ale clienților Tortoise; apelurile repetate nu mai schimbă nimic."""
+    for modul, clase in CLIENTI_TORTOISE:
+        try:
+            modul = importlib.import_module(modul)
+        except ImportError:
+            continue
+        for nume_clasa in clase:
+            clasa = getattr(modul, nume_clasa)
+            for nume in METODE_EXECUTE:
+                metoda = clasa.__dict__.get(nume)
+                if metoda is not None and not getattr(metoda, "numarata", False):
+                    setattr(clasa, nume, _numarata(metoda))
+
+
+def _escape(valoare: str) -> str:
+    return valoare.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrici:
+    def __init__(self):
+        self.latenta: Dict[Tuple[str, str], Histograma] = {}
+        self.dimensiune: Dict[Tuple[str, str], Histograma] = {}
+        self.interogari: Dict[Tuple[str, str], Histograma] = {}
+        self.requesturi: Dict[Tuple[str, str, int], int] = {}
+        self.in_curs = 0
+        self._colectori: List[Tuple[str, Callable[[], dict]]] = []
+
+    def adauga_colector(self, prefix: str, functie: Callable[[], dict]) -> None:
+        """Exportă valorile numerice din functie() ca gauge-uri <prefix>_<cheie>."""
+        self._colectori.append((prefix, functie))
+
+    def inregistreaza(self, metoda: str, ruta: str, status: int, durata: float,
+                      octeti: int, interogari: int) -> None:
+        cheie = (metoda, ruta)
+        latenta = self.latenta.get(cheie)
+        if latenta is None:
+            latenta = self.latenta[cheie] = Histograma(BUCKETS_LATENTA)
+            self.dimensiune[cheie] = Histograma(BUCKETS_DIMENSIUNE)
+            self.interogari[cheie] = Histograma(BUCKETS_INTEROGARI)
+        latenta.observa(durata)
+        self.dimensiune[cheie].observa(octeti)
+        self.interogari[cheie].observa(interogari)
+        cheie_status = (metoda, ruta, status)
+        self.requesturi[cheie_status] = self.requesturi.get(cheie_status, 0) + 1
+
+    def exporta(self) -> str:
+        linii = [
+            "# HELP http_requests_in_flight Requesturi HTTP în curs de procesare",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_curs}",
+            "# HELP http_requests_total Requesturi HTTP terminate",
+            "# TYPE http_requests_total counter",
+        ]
+        for (metoda, ruta, status), numar in sorted(self.requesturi.items()):
+            linii.append(
+                f'http_requests_total{{method="{metoda}",route="{_escape(ruta)}",status="{status}"}} {numar}'
+            )
+
+        for nume, descriere, histograme in (
+            ("http_request_duration_seconds", "Latența requesturilor pe rută", self.latenta),
+            ("http_response_size_bytes", "Dimensiunea corpului răspunsului", self.dimensiune),
+            ("http_request_db_queries", "Interogări ORM per request", self.interogari),
+        ):
+            linii.append(f"# HELP {nume} {descriere}")
+            linii.append(f"# TYPE {nume} histogram")
+            for (metoda, ruta), histograma in sorted(histograme.items()):
+                linii.extend(histograma.linii(nume, f'method="{metoda}",route="{_escape(ruta)}"'))
+
+        for prefix, functie in self._colectori:
+            for cheie, valoare in functie().items():
+                if isinstance(valoare, (int, float)) and not isinstance(valoare, bool):
+                    linii.append(f"# TYPE {prefix}_{cheie} gauge")
+                    linii.append(f"{prefix}_{cheie} {valoare}")
+
+        return "\n".join(linii) + "\n"
+
+
+metrici = Metrici()
+
+
+class MetricsMiddleware:
+    def __init__(self, app, registru: Metrici = metrici):
+        self.app = app
+        self.registru = registru
+        numara_interogari()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registru = self.registru
+        contor = _Contor()
+        token = _interogari_request.set(contor)
+        stare = {"status": 500, "octeti": 0}
+
+        async def send_masurat(message):
+            if message["type"] == "http.response.start":
+                stare["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                stare["octeti"] += len(message.get("body", b""))
+            await send(message)
+
+        registru.in_curs += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_masurat)
+        finally:
+            durata = time.perf_counter() - start
+            registru.in_curs -= 1
+            _interogari_request.reset(token)
+            ruta = scope.get("route")
+            registru.inregistreaza(
+                scope["method"],
+                ruta.path if ruta is not None else "<nepotrivita>",
+                stare["status"],
+                durata,
+                stare["octeti"],
+                contor.valoare,
+            )
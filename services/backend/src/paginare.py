@@ -0,0 +1,54 @@
+"""
+Cursoare opace pentru paginarea keyset a programărilor.
+
+Cursorul codifică cheia (data, ora, id) a ultimului rând din pagină, astfel
+încât pagina următoare pornește direct din index, indiferent cât de departe
+este în listă.
+"""
+
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Tuple
+
+from fastapi import HTTPException
+from tortoise.expressions import Q
+
+
+LIMITA_IMPLICITA = 100
+LIMITA_MAXIMA = 1000
+# Cel mai mare id pe care baza de date îl poate compara (INTEGER pe 64 de biți)
+ID_MAXIM = 2 ** 63 - 1
+
+
+def codifica_cursor(rand: dict) -> str:
+    cheie = [str(rand["data"]), rand["ora"].isoformat(), rand["id"]]
+    return base64.urlsafe_b64encode(json.dumps(cheie).encode()).decode()
+
+
+def decodifica_cursor(cursor: str) -> Tuple[date, time, int]:
+    """Cheia din cursor; orice cursor care nu vine de la codifica_cursor() dă 400."""
+    try:
+        data, ora, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cheie = datetime.strptime(data, "%Y-%m-%d").date(), time.fromisoformat(ora), int(id_)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor invalid")
+    # Un id în afara INTEGER-ului bazei ar eșua abia la execuția interogării (500)
+    if not 0 <= cheie[2] <= ID_MAXIM:
+        raise HTTPException(status_code=400, detail="Cursor invalid")
+    return cheie
+
+
+def dupa_cheie(data: date, ora: time, id_: int) -> Q:
+    """
+    Condiția (data, ora, id) > (data, ora, id_).
+    Termenul data >= data ține interogarea pe un range scan al indexului.
+    """
+    return Q(
+        Q(data__gt=data) | Q(data=data, ora__gt=ora) | Q(data=data, ora=ora, id__gt=id_),
+        data__gte=data,
+    )
+
+
+def dupa_cursor(cursor: str) -> Q:
+    return dupa_cheie(*decodifica_cursor(cursor))
@@ -0,0 +1,49 @@
+"""
+Durata pornirii aplicației (cold start), pe faze.
+
+Cronometrul pornește la importul acestui modul (primul import din
+src/main.py), iar handler-ele de startup marchează fiecare fază. Totalul
+este scris în log la final, comparat cu PORNIRE_BUGET_MS și expus în
+/metrics, ca regresiile de pornire să se vadă fără profilare manuală.
+Profilul detaliat al importurilor: benchmarks/profil_pornire.py.
+"""
+
+import os
+from time import perf_counter
+from typing import Dict, Optional
+
+
+# Bugetul de pornire (import + startup); 0 = fără verificare
+PORNIRE_BUGET_MS = float(os.getenv("PORNIRE_BUGET_MS", "0"))
+
+
+class CronometruPornire:
+    def __init__(self):
+        self._start = perf_counter()
+        self._ultima = self._start
+        self.faze_ms: Dict[str, float] = {}
+        self.total_ms: Optional[float] = None
+        self.scheme_generate: Optional[bool] = None
+
+    def marcheaza(self, faza: str) -> None:
+        acum = perf_counter()
+        self.faze_ms[faza] = round((acum - self._ultima) * 1000, 1)
+        self._ultima = acum
+
+    def termina(self) -> float:
+        self.total_ms = round((self._ultima - self._start) * 1000, 1)
+        return self.total_ms
+
+    def peste_buget(self) -> bool:
+        return bool(PORNIRE_BUGET_MS) and self.total_ms is not None and self.total_ms > PORNIRE_BUGET_MS
+
+    def stats(self) -> dict:
+        # Valori numerice plate: /metrics exportă doar numere
+        stats = {"total_ms": self.total_ms, "buget_ms": PORNIRE_BUGET_MS}
+        stats.update({f"faza_{faza}_ms": durata for faza, durata in self.faze_ms.items()})
+        if self.scheme_generate is not None:
+            stats["scheme_generate"] = int(self.scheme_generate)
+        return stats
+
+
+cronometru_pornire = CronometruPornire()
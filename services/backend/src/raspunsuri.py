@@ -0,0 +1,71 @@
+"""
+Serializarea rapidă a răspunsurilor: JSON cu orjson și MessagePack la cerere.
+
+RaspunsJSON este clasa de răspuns implicită a aplicației. FastAPI trece însă
+orice valoare returnată dintr-un endpoint prin jsonable_encoder, care
+parcurge recursiv fiecare dict; endpointurile cu liste mari (rezultate
+.values(), deja formate din tipuri simple) returnează direct raspuns(...),
+care serializează lista o singură dată, fără encoderul generic.
+
+Clienții interni pot cere MessagePack cu `Accept: application/msgpack`;
+browserele și restul clienților primesc JSON.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Mapping, Optional
+
+import msgpack
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+MEDIA_MSGPACK = "application/msgpack"
+_TIPURI_MSGPACK = (MEDIA_MSGPACK, "application/x-msgpack")
+
+
+def _implicit(valoare: Any) -> Any:
+    """Tipurile pe care orjson/msgpack nu le știu nativ."""
+    if isinstance(valoare, (datetime, date, time)):
+        return valoare.isoformat()
+    if isinstance(valoare, Decimal):
+        return float(valoare)
+    if isinstance(valoare, BaseModel):
+        return valoare.dict()
+    if isinstance(valoare, (set, frozenset, tuple)):
+        return list(valoare)
+    raise TypeError(f"Tip neserializabil: {type(valoare).__name__}")
+
+
+def dumps_json(valoare: Any, sortat: bool = False) -> bytes:
+    optiuni = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sortat else 0)
+    return orjson.dumps(valoare, default=_implicit, option=optiuni)
+
+
+class RaspunsJSON(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class RaspunsMsgpack(Response):
+    media_type = MEDIA_MSGPACK
+
+    def render(self, content: Any) -> bytes:
+        # datetime-urile ca șiruri ISO, ca în JSON, nu ca extensia Timestamp
+        return msgpack.packb(content, default=_implicit, use_bin_type=True, datetime=False)
+
+
+def accepta_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return any(tip in accept for tip in _TIPURI_MSGPACK)
+
+
+def raspuns(request: Request, continut: Any, status_code: int = 200,
+            headers: Optional[Mapping[str, str]] = None) -> Response:
+    """JSON sau MessagePack după header-ul Accept, fără jsonable_encoder."""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept"
+    clasa = RaspunsMsgpack if accepta_msgpack(request) else RaspunsJSON
+    return clasa(content=continut, status_code=status_code, headers=headers)
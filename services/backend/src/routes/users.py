@@ -8,6 +8,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 from tortoise.contrib.fastapi import HTTPNotFoundError
 
 import src.crud.users as crud
+from src.auth.cache import user_cache
+from src.auth.hashing import password_hasher
 from src.auth.users import validate_user
 from src.schemas.token import Status
 from src.schemas.users import UserInSchema, UserOutSchema
@@ -17,14 +19,18 @@ from src.auth.jwthandler import (
     get_current_user,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
+from src.logger import get_logger
 
 
 router = APIRouter()
+log = get_logger("auth")
 
 
 @router.post("/register", response_model=UserOutSchema)
 async def create_user(user: UserInSchema) -> UserOutSchema:
-    return await crud.create_user(user)
+    created = await crud.create_user(user)
+    log.info("User registered", extra={"username": created.username})
+    return created
 
 
 @router.post("/login")
@@ -42,6 +48,7 @@ async def login(user: OAuth2PasswordRequestForm = Depends()):
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
+    log.info("User logged in", extra={"username": user.username})
     token = jsonable_encoder(access_token)
     content = {"message": "You've successfully logged in. Welcome back!"}
     response = JSONResponse(content=content)
@@ -65,6 +72,18 @@ async def read_users_me(current_user: UserOutSchema = Depends(get_current_user))
     return current_user
 
 
+@router.get("/users/cache-stats", dependencies=[Depends(get_current_user)])
+async def read_user_cache_stats():
+    """Hit/miss counters of the authenticated-user cache"""
+    return user_cache.stats()
+
+
+@router.get("/users/hashing-stats", dependencies=[Depends(get_current_user)])
+async def read_hashing_stats():
+    """Queue depth and throughput of the password hashing executor"""
+    return password_hasher.stats()
+
+
 @router.delete(
     "/user/{user_id}",
     response_model=Status,
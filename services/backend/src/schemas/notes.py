@@ -1,18 +1,38 @@
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from pydantic import BaseModel
 from tortoise.contrib.pydantic import pydantic_model_creator
 
-from db.models import Notes
 
+def _note_in_schema() -> type:
+    from db.models import Notes
+    return pydantic_model_creator(
+        Notes, name="NoteIn", exclude=["author_id"], exclude_readonly=True)
 
-NoteInSchema = pydantic_model_creator(
-    Notes, name="NoteIn", exclude=["author_id"], exclude_readonly=True)
-NoteOutSchema = pydantic_model_creator(
-    Notes, name="Note", exclude =[
-      "modified_at", "author.password", "author.created_at", "author.modified_at"
-    ]
-)
+
+def _note_out_schema() -> type:
+    from db.models import Notes
+    return pydantic_model_creator(
+        Notes, name="Note", exclude =[
+          "modified_at", "author.password", "author.created_at", "author.modified_at"
+        ]
+    )
+
+
+# Built on first access: db.models has no Notes model, so building them at
+# import time would break every import of this module
+_SCHEME: Dict[str, Callable[[], type]] = {
+    "NoteInSchema": _note_in_schema,
+    "NoteOutSchema": _note_out_schema,
+}
+
+
+def __getattr__(name: str) -> type:
+    if name not in _SCHEME:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    schema = _SCHEME[name]()
+    globals()[name] = schema
+    return schema
 
 
 class UpdateNote(BaseModel):
@@ -11,4 +11,4 @@ UserOutSchema = pydantic_model_creator(
 )
 UserDatabaseSchema = pydantic_model_creator(
     Users, name="User", exclude=["created_at", "modified_at"]
-)
\ No newline at end of file
+)
@@ -0,0 +1,225 @@
+"""
+Statistici de ocupare: numărul de programări pe zi, job și persoană.
+
+Contoarele stau în tabela Statistici_zilnice (db/models.py) și sunt ținute la
+zi de trigger-e pe Programari, deci în aceeași tranzacție cu fiecare creare
+(inclusiv în lot), PUT, ștergere sau persoană ștearsă (persoana_id devine
+NULL). Arhivatorul mută programările în Programari_archive: ștergerea scade
+contorul, inserarea în arhivă îl crește la loc, deci istoricul rămâne numărat.
+
+GET /statistici însumează contoarele din intervalul cerut, deci costul depinde
+de numărul de zile, joburi și persoane, nu de numărul de programări.
+Contoarele se pot recalcula de la zero:
+
+    python -m src.statistici
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from typing import List, Optional, Sequence
+
+from tortoise import Tortoise
+
+from db.config import conexiune_citire
+
+TABELA = "Statistici_zilnice"
+TABELE_SURSA = ("Programari", "Programari_archive")
+CHEIE = ("data", "job_id", "persoana_id")
+GRUPARI = ("zi", "job", "persoana")
+COLOANA_GRUPARE = {"zi": "data", "job": "job_id", "persoana": "persoana_id"}
+
+# Intervalul maxim pentru GET /statistici
+MAX_ZILE_STATISTICI = 366
+
+
+def _upsert(rand: str, delta: int) -> str:
+    coloane = ", ".join(f'"{coloana}"' for coloana in CHEIE)
+    return (
+        f'INSERT INTO "{TABELA}" ({coloane}, "numar") '
+        f'VALUES ({rand}."data", coalesce({rand}."job_id", 0), coalesce({rand}."persoana_id", 0), {delta}) '
+        f'ON CONFLICT ({coloane}) DO UPDATE SET "numar" = "{TABELA}"."numar" + excluded."numar";'
+    )
+
+
+def _cheie_schimbata(operator: str) -> str:
+    return " OR ".join(f'OLD."{coloana}" {operator} NEW."{coloana}"' for coloana in CHEIE)
+
+
+def _triggere_sqlite(tabela: str) -> str:
+    coloane = ", ".join(f'"{coloana}"' for coloana in CHEIE)
+    return f"""
+CREATE TRIGGER IF NOT EXISTS "{TABELA}_{tabela}_ai" AFTER INSERT ON "{tabela}" BEGIN
+    {_upsert("NEW", 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS "{TABELA}_{tabela}_au" AFTER UPDATE OF {coloane} ON "{tabela}"
+WHEN {_cheie_schimbata("IS NOT")} BEGIN
+    {_upsert("OLD", -1)}
+    {_upsert("NEW", 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS "{TABELA}_{tabela}_ad" AFTER DELETE ON "{tabela}" BEGIN
+    {_upsert("OLD", -1)}
+END;
+"""
+
+
+# Aceleași instrucțiuni ca migrarea 10; IF NOT EXISTS, deci pot rula la fiecare
+# pornire (o reconstruire a tabelei Programari îi elimină trigger-ele)
+SQL_SQLITE = "".join(_triggere_sqlite(tabela) for tabela in TABELE_SURSA)
+TRIGGERE_SQLITE = [f"{TABELA}_{tabela}_{sufix}" for tabela in TABELE_SURSA for sufix in ("ai", "au", "ad")]
+
+FUNCTIE_POSTGRES = f"{TABELA}_actualizeaza"
+# (trigger, tabelă)
+TRIGGERE_POSTGRES = [
+    (f"{TABELA}_{tabela}{sufix}", tabela) for tabela in TABELE_SURSA for sufix in ("", "_au")
+]
+
+SQL_POSTGRES = f"""
+CREATE OR REPLACE FUNCTION "{FUNCTIE_POSTGRES}"() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        {_upsert("OLD", -1)}
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        {_upsert("NEW", 1)}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""" + "".join(
+    f"""
+DROP TRIGGER IF EXISTS "{TABELA}_{tabela}" ON "{tabela}";
+CREATE TRIGGER "{TABELA}_{tabela}" AFTER INSERT OR DELETE ON "{tabela}"
+    FOR EACH ROW EXECUTE FUNCTION "{FUNCTIE_POSTGRES}"();
+DROP TRIGGER IF EXISTS "{TABELA}_{tabela}_au" ON "{tabela}";
+CREATE TRIGGER "{TABELA}_{tabela}_au" AFTER UPDATE OF {", ".join(f'"{coloana}"' for coloana in CHEIE)} ON "{tabela}"
+    FOR EACH ROW WHEN ({_cheie_schimbata("IS DISTINCT FROM")}) EXECUTE FUNCTION "{FUNCTIE_POSTGRES}"();
+"""
+    for tabela in TABELE_SURSA
+)
+
+SQL_RECONSTRUIRE = f"""
+DELETE FROM "{TABELA}";
+INSERT INTO "{TABELA}" ("data", "job_id", "persoana_id", "numar")
+    SELECT "data", coalesce("job_id", 0), coalesce("persoana_id", 0), count(*) FROM (
+        {" UNION ALL ".join(f'SELECT "data", "job_id", "persoana_id" FROM "{tabela}"' for tabela in TABELE_SURSA)}
+    ) AS sursa
+    GROUP BY 1, 2, 3;
+"""
+
+
+async def reconstruieste(conn=None) -> int:
+    """
+    Recalculează toate contoarele din Programari și Programari_archive, într-o
+    singură tranzacție. Returnează numărul de rânduri de contoare.
+    """
+    conn = conn or Tortoise.get_connection("default")
+    if conn.capabilities.dialect == "sqlite":
+        # BEGIN IMMEDIATE: nicio scriere nu se strecoară între DELETE și INSERT
+        await conn.execute_script(f"BEGIN IMMEDIATE;\n{SQL_RECONSTRUIRE}COMMIT;")
+    else:
+        # Trigger-ele tranzacțiilor concurente așteaptă lock-ul și se aplică
+        # peste contoarele recalculate
+        await conn.execute_script(
+            f'BEGIN;\nLOCK TABLE "{TABELA}" IN EXCLUSIVE MODE;\n{SQL_RECONSTRUIRE}COMMIT;'
+        )
+    randuri = await conn.execute_query_dict(f'SELECT count(*) AS "numar" FROM "{TABELA}"')
+    return randuri[0]["numar"]
+
+
+async def asigura_contoarele(conn) -> bool:
+    """
+    Creează trigger-ele lipsă (baze fără migrarea 10, tabele reconstruite) și
+    recalculează contoarele dacă lipsea vreun trigger (scrierile de până acum
+    n-au fost numărate) sau dacă tabela lor e goală, dar există programări.
+    Returnează True dacă le-a recalculat.
+    """
+    if conn.capabilities.dialect == "sqlite":
+        existente = await conn.execute_query_dict(
+            f"SELECT count(*) AS \"numar\" FROM sqlite_master WHERE type = 'trigger' "
+            f"AND name IN ({', '.join('?' for _ in TRIGGERE_SQLITE)})",
+            TRIGGERE_SQLITE,
+        )
+        lipsa = existente[0]["numar"] < len(TRIGGERE_SQLITE)
+        await conn.execute_script(f"BEGIN;\n{SQL_SQLITE}COMMIT;")
+    else:
+        exista = await conn.execute_query_dict(
+            "SELECT 1 FROM pg_trigger WHERE tgname = $1", [f"{TABELA}_Programari"]
+        )
+        lipsa = not exista
+        if lipsa:
+            await conn.execute_script(SQL_POSTGRES)
+
+    if not lipsa:
+        surse = " OR ".join(f'EXISTS (SELECT 1 FROM "{tabela}")' for tabela in TABELE_SURSA)
+        randuri = await conn.execute_query_dict(
+            f'SELECT (NOT EXISTS (SELECT 1 FROM "{TABELA}") AND ({surse})) AS "goala"'
+        )
+        if not randuri[0]["goala"]:
+            return False
+    await reconstruieste(conn)
+    return True
+
+
+async def citeste_statistici(
+    de_la: date,
+    pana_la: date,
+    grupare: Sequence[str],
+    job_id: Optional[int] = None,
+    persoana_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    Numărul de programări din intervalul [de_la, pana_la], grupat după
+    `grupare` (submulțime din GRUPARI). Job-ul și persoana lipsă apar ca null.
+    """
+    conn = conexiune_citire() or Tortoise.get_connection("default")
+    postgres = conn.capabilities.dialect != "sqlite"
+
+    def parametru(pozitie: int) -> str:
+        return f"${pozitie}" if postgres else "?"
+
+    conditii = [f'"data" >= {parametru(1)}', f'"data" <= {parametru(2)}']
+    valori: list = [de_la, pana_la] if postgres else [de_la.isoformat(), pana_la.isoformat()]
+    for coloana, valoare in (("job_id", job_id), ("persoana_id", persoana_id)):
+        if valoare is not None:
+            valori.append(valoare)
+            conditii.append(f'"{coloana}" = {parametru(len(valori))}')
+
+    coloane = [COLOANA_GRUPARE[nume] for nume in GRUPARI if nume in grupare]
+    selectie = "".join(f'"{coloana}", ' for coloana in coloane)
+    grupuri = f'GROUP BY {", ".join(coloane)} ORDER BY {", ".join(coloane)}' if coloane else ""
+    sql = (
+        f'SELECT {selectie}sum("numar") AS "numar" FROM "{TABELA}" '
+        f'WHERE {" AND ".join(conditii)} {grupuri}'
+    )
+    randuri = await conn.execute_query_dict(sql, valori)
+
+    rezultat = []
+    for rand in randuri:
+        rand = dict(rand)
+        if not rand["numar"]:
+            continue
+        for coloana in ("job_id", "persoana_id"):
+            if rand.get(coloana) == 0:
+                rand[coloana] = None
+        if isinstance(rand.get("data"), str):
+            rand["data"] = date.fromisoformat(rand["data"])
+        rezultat.append(rand)
+    return rezultat
+
+
+async def _main() -> None:
+    from db.config import TORTOISE_APP
+
+    await Tortoise.init(config=TORTOISE_APP)
+    try:
+        conn = Tortoise.get_connection("default")
+        await asigura_contoarele(conn)
+        print(f"Statistici recalculate: {await reconstruieste(conn)} rânduri de contoare")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    asyncio.run(_main())
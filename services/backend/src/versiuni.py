@@ -0,0 +1,76 @@
+"""
+Concurență optimistă pentru PUT /programari/{id}.
+
+Fiecare programare are o coloană `version`, servită ca ETag ("3"). Clientul
+o trimite înapoi în If-Match, iar update-ul devine un singur
+`UPDATE ... WHERE id=? AND version=? RETURNING ...`: dacă altcineva a
+modificat programarea între timp, nu se potrivește niciun rând și API-ul
+răspunde 412, fără lock-uri și fără SELECT-ul dinaintea update-ului.
+
+RETURNING cere SQLite >= 3.35; imaginea Docker (python:3.11-buster) are
+SQLite 3.27, unde update-ul condiționat rulează fără RETURNING, iar rândul
+este recitit în aceeași tranzacție doar dacă update-ul a modificat ceva.
+"""
+
+import sqlite3
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from tortoise import Tortoise
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from db.models import Programari
+
+SQLITE_ARE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def etag_versiune(versiune: int) -> str:
+    return f'"{versiune}"'
+
+
+def versiune_din_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Versiunea cerută prin If-Match ("3" sau W/"3"); None dacă header-ul
+    lipsește sau este "*" (orice versiune).
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    valoare = if_match.strip()
+    if valoare.startswith("W/"):
+        valoare = valoare[2:]
+    valoare = valoare.strip('"')
+    if not valoare.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match trebuie să fie ETag-ul programării, de forma \"3\"")
+    return int(valoare)
+
+
+async def actualizeaza_programarea(
+    programare_id: int, versiune: Optional[int], valori: Dict[str, Any]
+) -> Optional[Programari]:
+    """
+    Aplică `valori` și incrementează versiunea într-un singur round trip.
+    Cu `versiune`, rândul se modifică doar dacă are încă acea versiune.
+    Returnează programarea actualizată sau None dacă niciun rând nu s-a
+    potrivit (programare inexistentă sau versiune depășită).
+    """
+    conn = Tortoise.get_connection("default")
+    filtre = {"id": programare_id}
+    if versiune is not None:
+        filtre["version"] = versiune
+    if conn.capabilities.dialect == "sqlite" and not SQLITE_ARE_RETURNING:
+        async with in_transaction("default") as tx:
+            modificate = await Programari.filter(**filtre).using_db(tx).update(**valori, version=F("version") + 1)
+            if not modificate:
+                return None
+            return await Programari.get(id=programare_id).using_db(tx)
+
+    query = Programari.filter(**filtre).using_db(conn).update(**valori, version=F("version") + 1)
+    # SQL-ul generat de Tortoise (cu parametri), plus RETURNING: rândul nou
+    # vine înapoi în același round trip (SQLite >= 3.35, PostgreSQL)
+    coloane = ", ".join(f'"{coloana}"' for coloana in Programari._meta.db_fields)
+    sql = f"{query.sql()} RETURNING {coloane}"
+    randuri = await conn.execute_query_dict(sql, query.values)
+    if not randuri:
+        return None
+    return Programari._init_from_db(**randuri[0])
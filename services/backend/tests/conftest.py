@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+# Configurația se citește la import (db/config.py, src/limitare.py), deci
+# mediul se setează înainte de primul import din aplicație
+_DIRECTOR = tempfile.mkdtemp(prefix="programari-teste-")
+os.environ["DATABASE_URL"] = "sqlite://" + os.path.join(_DIRECTOR, "teste.db")
+os.environ.setdefault("SECRET_KEY", "teste")
+os.environ["LIMITARE_ACTIVA"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from passlib.hash import bcrypt  # noqa: E402
+
+from db.models import Job, PersoanaJob, Persoane, Servicii, Users  # noqa: E402
+from src.main import app  # noqa: E402
+
+
+async def _populeaza() -> dict:
+    job = await Job.create(nume="Teste")
+    persoana = await Persoane.create(nume="Popescu", prenume="Ion", job=job)
+    await PersoanaJob.create(persoana=persoana, job=job)
+    serviciu = await Servicii.create(descriere="Consultație", job=job)
+    await Users.create(username="admin", password=bcrypt.hash("parola123"), email="admin@example.com")
+    return {"job_id": job.id, "persoana_id": persoana.id, "serviciu_id": serviciu.id}
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        c.date = c.portal.call(_populeaza)
+        yield c
+
+
+@pytest.fixture
+def autentificat(client):
+    client.post("/login", data={"username": "admin", "password": "parola123"})
+    yield client
+    client.cookies.clear()
+
+
+@pytest.fixture
+def maine() -> str:
+    return (date.today() + timedelta(days=1)).isoformat()
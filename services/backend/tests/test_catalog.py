@@ -0,0 +1,75 @@
+import asyncio
+
+from tortoise import Tortoise
+
+from src.cache import catalog
+from src.cache.catalog import CacheCatalog
+
+
+def test_cache_limitat_lru():
+    cache = CacheCatalog(ttl=60, max_intrari=2)
+    incarcari = []
+
+    async def cere(cheie):
+        async def incarca():
+            incarcari.append(cheie)
+            return [cheie]
+        return await cache.obtine(cheie, incarca)
+
+    async def scenariu():
+        for cheie in ("persoane:1", "persoane:2", "persoane:1", "persoane:3", "persoane:1", "persoane:2"):
+            await cere(cheie)
+
+    asyncio.run(scenariu())
+    # persoane:2 a fost evacuată (cea mai veche folosită) când a venit persoane:3
+    assert incarcari == ["persoane:1", "persoane:2", "persoane:3", "persoane:2"]
+    assert cache.stats()["intrari"] == 2
+    assert cache.stats()["evacuate"] == 2
+
+
+def test_id_necunoscut_pastrat_ca_none():
+    cache = CacheCatalog(ttl=60, max_intrari=10)
+    cereri = []
+
+    async def incarca(ids):
+        cereri.append(sorted(ids))
+        return {1: 7}
+
+    async def scenariu():
+        return [await cache.obtine_multe("serviciu_job", [1, 99], incarca) for _ in range(3)]
+
+    rezultate = asyncio.run(scenariu())
+    assert rezultate == [{1: 7, 99: None}] * 3
+    assert cereri == [[1, 99]]
+
+    cache.invalideaza()
+    asyncio.run(cache.obtine_multe("serviciu_job", [99], incarca))
+    assert cereri == [[1, 99], [99]]
+
+
+def test_id_necunoscut_expira_dupa_ttl():
+    cache = CacheCatalog(ttl=0, max_intrari=10)
+    cereri = []
+
+    async def incarca(ids):
+        cereri.append(list(ids))
+        return {}
+
+    asyncio.run(cache.obtine_multe("serviciu_job", [5], incarca))
+    asyncio.run(cache.obtine_multe("serviciu_job", [5], incarca))
+    assert cereri == [[5], [5]]
+
+
+def test_joburile_citite_de_pe_conexiunea_de_citire(client, monkeypatch):
+    folosite = []
+
+    def conexiune_citire():
+        folosite.append(conexiune)
+        return conexiune
+
+    conexiune = Tortoise.get_connection("read_0")
+    monkeypatch.setattr(catalog, "conexiune_citire", conexiune_citire)
+    serviciu_id = client.date["serviciu_id"]
+    joburi = client.portal.call(catalog._incarca_joburi, [serviciu_id, 999999])
+    assert joburi == {serviciu_id: client.date["job_id"]}
+    assert folosite == [conexiune]
@@ -0,0 +1,59 @@
+import pytest
+from tortoise import Tortoise
+
+from src.cautare import asigura_indexul, cuvinte_cautate
+
+
+@pytest.mark.parametrize("q, cuvinte", [
+    ("0712", ["0712"]),
+    ("+40712", ["0712"]),
+    ("0040 712 345 678", ["0712345678"]),
+    ("+40 (0) 712-345", ["0712345"]),
+    ("pop ion", ["pop", "ion"]),
+])
+def test_cuvinte_cautate_telefon_cu_prefixul_tarii(q, cuvinte):
+    assert cuvinte_cautate(q) == cuvinte
+
+
+def _cauta(client, q):
+    raspuns = client.get("/programari/search", params={"q": q})
+    assert raspuns.status_code == 200, raspuns.text
+    return {rand["id"] for rand in raspuns.json()}
+
+
+def test_cautare_telefon_in_ambele_forme(autentificat, maine):
+    ids = [
+        autentificat.post("/programari", json={"data": maine, "ora": "12:00", "telefon": telefon}).json()["id"]
+        for telefon in ("+40712345678", "0040 733 444 555", "0744-111-222")
+    ]
+    assert ids[0] in _cauta(autentificat, "0712")
+    assert ids[0] in _cauta(autentificat, "+40 712 345")
+    assert ids[1] in _cauta(autentificat, "0733 444")
+    assert ids[1] in _cauta(autentificat, "+40733")
+    assert ids[2] in _cauta(autentificat, "+40744111222")
+    assert ids[2] not in _cauta(autentificat, "0712")
+
+
+async def _triggere_migrarea_9():
+    conn = Tortoise.get_connection("default")
+    cifre = "replace(replace(coalesce(NEW.\"telefon\", ''), ' ', ''), '+', '')"
+    await conn.execute_script(f"""
+        DROP TRIGGER "Programari_fts_ai";
+        CREATE TRIGGER "Programari_fts_ai" AFTER INSERT ON "Programari" BEGIN
+            INSERT INTO "Programari_fts" (rowid, nume, prenume, email, telefon)
+                VALUES (NEW."id", NEW."nume", NEW."prenume", NEW."email", {cifre});
+        END;
+    """)
+
+
+def test_trigger_vechi_inlocuit_la_pornire(autentificat, maine):
+    autentificat.portal.call(_triggere_migrarea_9)
+    programare_id = autentificat.post(
+        "/programari", json={"data": maine, "ora": "13:00", "telefon": "+40755000111"}
+    ).json()["id"]
+    assert programare_id not in _cauta(autentificat, "0755")
+
+    assert autentificat.portal.call(asigura_indexul, Tortoise.get_connection("default"))
+    assert programare_id in _cauta(autentificat, "0755")
+    # Trigger-ele sunt la zi: la următoarea pornire indexul nu mai e repopulat
+    assert not autentificat.portal.call(asigura_indexul, Tortoise.get_connection("default"))
@@ -0,0 +1,92 @@
+import asyncio
+from datetime import date, time, timedelta
+
+import pytest
+
+from src.cache.disponibilitate import (
+    CONSTRANGERE_POSTGRES,
+    IndexOcupare,
+    este_suprapunere,
+    genereaza_sloturi,
+    sql_constrangere_postgres,
+)
+
+
+def _index() -> IndexOcupare:
+    return IndexOcupare(genereaza_sloturi("08:00", "18:00", 30), 30)
+
+
+def test_ora_din_afara_grilei_se_suprapune():
+    index = _index()
+    zi = date(2030, 1, 7)
+    assert index.ocupa(1, zi, time(14, 0))
+    assert not index.ocupa(1, zi, time(14, 15))
+    assert not index.ocupa(1, zi, time(13, 45))
+    assert index.ocupa(1, zi, time(14, 30))
+    assert index.ocupa(2, zi, time(14, 15))
+    assert index.este_ocupat(1, zi, time(14, 20))
+
+
+def test_sloturi_libere_exclud_suprapunerile():
+    index = _index()
+    zi = date(2030, 1, 7)
+    assert index.ocupa(1, zi, time(9, 15))
+    libere = index.sloturi_libere(1, zi)
+    assert time(9, 0) not in libere and time(9, 30) not in libere
+    assert time(8, 30) in libere and time(10, 0) in libere
+
+
+def test_mutarea_programarii_ignora_slotul_propriu():
+    index = _index()
+    zi = date(2030, 1, 7)
+    assert index.ocupa(1, zi, time(10, 0))
+    index.leaga(5, 1, zi, time(10, 0))
+    slot_vechi = index.slot_programare(5)
+    assert not index.ocupa(1, zi, time(10, 15))
+    assert index.ocupa(1, zi, time(10, 15), exceptie=slot_vechi)
+    index.leaga(5, 1, zi, time(10, 15))
+    assert index.sloturi_libere(1, zi)[:6] == [
+        time(8, 0), time(8, 30), time(9, 0), time(9, 30), time(11, 0), time(11, 30),
+    ]
+
+
+def test_api_refuza_dublarea_cu_ora_din_afara_grilei(autentificat):
+    zi = (date.today() + timedelta(days=3)).isoformat()
+    persoana_id = autentificat.date["persoana_id"]
+
+    def creeaza(ora):
+        return autentificat.post("/programari", json={"data": zi, "ora": ora, "persoana_id": persoana_id})
+
+    prima = creeaza("14:00")
+    assert prima.status_code == 200, prima.text
+    assert creeaza("14:15").status_code == 409
+    a_doua = creeaza("14:30")
+    assert a_doua.status_code == 200, a_doua.text
+
+    # PUT mută programarea cu mai puțin de un slot, peste propriul interval
+    mutata = autentificat.put(
+        f"/programari/{a_doua.json()['id']}", json={"data": zi, "ora": "14:45", "persoana_id": persoana_id}
+    )
+    assert mutata.status_code == 200, mutata.text
+
+    libere = autentificat.get("/disponibilitate", params={"persoana_id": persoana_id, "from": zi}).json()
+    sloturi = libere["zile"][0]["sloturi_libere"]
+    assert "14:00:00" not in sloturi and "14:30:00" not in sloturi and "15:00:00" not in sloturi
+    assert "13:30:00" in sloturi and "15:30:00" in sloturi
+
+
+def test_mai_multi_workeri_refuzati_pe_sqlite(monkeypatch):
+    import src.main as main
+
+    monkeypatch.setattr(main, "WORKERI", 2)
+    with pytest.raises(RuntimeError, match="un singur worker"):
+        asyncio.run(main.verifica_workerii())
+    monkeypatch.setattr(main, "WORKERI", 1)
+    asyncio.run(main.verifica_workerii())
+
+
+def test_constrangerea_postgres_aceeasi_durata_ca_indexul():
+    sql = sql_constrangere_postgres(45)
+    assert "interval '45 minutes'" in sql and '"persoana_id" WITH =' in sql
+    assert este_suprapunere(Exception(f'violates exclusion constraint "{CONSTRANGERE_POSTGRES}"'))
+    assert not este_suprapunere(Exception('violates unique constraint "aerich_pkey"'))
@@ -0,0 +1,148 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from db.models import Programari
+from src import idempotenta
+from src.idempotenta import IdempotentaMiddleware, StoreIdempotenta
+
+
+async def _numar_programari():
+    return await Programari.all().count()
+
+
+def _cheie():
+    return {"Idempotency-Key": uuid4().hex}
+
+
+def test_reincercarea_primeste_raspunsul_pastrat(client, maine):
+    date = {"data": maine, "ora": "11:00", "nume": "Idempotent"}
+    cheie = _cheie()
+    prima = client.post("/programari", json=date, headers=cheie)
+    assert prima.status_code == 200, prima.text
+    assert "idempotent-replayed" not in prima.headers
+    numar = client.portal.call(_numar_programari)
+
+    reluata = client.post("/programari", json=date, headers=cheie)
+    assert reluata.status_code == 200
+    assert reluata.headers["idempotent-replayed"] == "true"
+    assert reluata.json() == prima.json()
+    assert reluata.headers["etag"] == prima.headers["etag"]
+    assert client.portal.call(_numar_programari) == numar
+
+
+def test_aceeasi_cheie_alt_request_422(client, maine):
+    date = {"data": maine, "ora": "11:30", "nume": "Idempotent"}
+    cheie = _cheie()
+    assert client.post("/programari", json=date, headers=cheie).status_code == 200
+    numar = client.portal.call(_numar_programari)
+
+    alt_corp = client.post("/programari", json={**date, "nume": "Altul"}, headers=cheie)
+    assert alt_corp.status_code == 422
+    alt_query = client.post("/programari?x=1", json=date, headers=cheie)
+    assert alt_query.status_code == 422
+    assert client.portal.call(_numar_programari) == numar
+
+
+def test_cheia_e_separata_pe_token(client, maine):
+    date = {"data": maine, "ora": "12:30", "nume": "Idempotent"}
+    cheie = _cheie()
+    ids = [
+        client.post("/programari", json=date, headers={**cheie, "Authorization": f"Bearer {token}"}).json()["id"]
+        for token in ("token-a", "token-b", "token-a")
+    ]
+    # Alt utilizator cu aceeași cheie nu primește răspunsul primului
+    assert ids[0] != ids[1]
+    assert ids[2] == ids[0]
+
+
+async def _cere(middleware, corp=b"{}", cheie="k", token=None):
+    headere = [(b"idempotency-key", cheie.encode())]
+    if token:
+        headere.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {"type": "http", "method": "POST", "path": "/programari", "query_string": b"", "headers": headere}
+    primite = []
+
+    async def receive():
+        return {"type": "http.request", "body": corp, "more_body": False}
+
+    async def send(mesaj):
+        primite.append(mesaj)
+
+    await middleware(scope, receive, send)
+    start, corp_raspuns = primite[0], primite[1].get("body", b"")
+    return start["status"], dict(start["headers"]), corp_raspuns
+
+
+class _Aplicatie:
+    """Aplicație ASGI de test: numără apelurile și răspunde cu statusul dat."""
+
+    def __init__(self, *statusuri):
+        self.statusuri = list(statusuri)
+        self.apeluri = 0
+        self.elibereaza = asyncio.Event()
+        self.elibereaza.set()
+
+    async def __call__(self, scope, receive, send):
+        self.apeluri += 1
+        status = self.statusuri.pop(0)
+        await receive()
+        await self.elibereaza.wait()
+        corp = json.dumps({"apel": self.apeluri}).encode()
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": corp})
+
+
+def test_duplicatul_in_curs_asteapta_primul_request():
+    async def scenariu():
+        aplicatie = _Aplicatie(201)
+        aplicatie.elibereaza.clear()
+        middleware = IdempotentaMiddleware(aplicatie, StoreIdempotenta(100, 60))
+        primul = asyncio.create_task(_cere(middleware))
+        await asyncio.sleep(0)
+        duplicat = asyncio.create_task(_cere(middleware))
+        await asyncio.sleep(0.01)
+        assert not duplicat.done()
+        aplicatie.elibereaza.set()
+        return await primul, await duplicat, aplicatie.apeluri, middleware.store.stats()
+
+    primul, duplicat, apeluri, stats = asyncio.run(scenariu())
+    assert apeluri == 1
+    assert primul[0] == duplicat[0] == 201
+    assert duplicat[2] == primul[2]
+    assert duplicat[1][b"idempotent-replayed"] == b"true"
+    assert stats["asteptari"] == 1 and stats["reluate"] == 1
+
+
+def test_duplicatul_in_curs_prea_mult_409(monkeypatch):
+    monkeypatch.setattr(idempotenta, "IDEMPOTENTA_ASTEPTARE_SECUNDE", 0.01)
+
+    async def scenariu():
+        aplicatie = _Aplicatie(201)
+        aplicatie.elibereaza.clear()
+        middleware = IdempotentaMiddleware(aplicatie, StoreIdempotenta(100, 60))
+        primul = asyncio.create_task(_cere(middleware))
+        await asyncio.sleep(0)
+        duplicat = await _cere(middleware)
+        aplicatie.elibereaza.set()
+        await primul
+        return duplicat
+
+    status, headere, _ = asyncio.run(scenariu())
+    assert status == 409
+    assert headere[b"retry-after"] == b"1"
+
+
+def test_5xx_si_429_nu_se_pastreaza():
+    async def scenariu():
+        aplicatie = _Aplicatie(500, 429, 200, 200)
+        middleware = IdempotentaMiddleware(aplicatie, StoreIdempotenta(100, 60))
+        return [await _cere(middleware) for _ in range(4)], aplicatie.apeluri
+
+    raspunsuri, apeluri = asyncio.run(scenariu())
+    assert [status for status, _, _ in raspunsuri] == [500, 429, 200, 200]
+    # Reîncercările după 500 și 429 rulează din nou; după 200, răspunsul e reluat
+    assert apeluri == 3
+    assert b"idempotent-replayed" not in raspunsuri[2][1]
+    assert raspunsuri[3][1][b"idempotent-replayed"] == b"true"
+    assert raspunsuri[3][2] == raspunsuri[2][2]
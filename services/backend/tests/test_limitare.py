@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from src import limitare
+from src.limitare import GaletiTokeni, LimitareMiddleware, Limitator
+
+
+def test_galeata_se_goleste_si_se_reumple():
+    galeti = GaletiTokeni(rata=2, rafala=3, max_chei=10)
+    for _ in range(3):
+        assert galeti.asteptare("a", 100.0) == 0
+        galeti.consuma("a", 100.0)
+    assert galeti.asteptare("a", 100.0) == pytest.approx(0.5)
+    assert galeti.asteptare("a", 100.25) == pytest.approx(0.25)
+    assert galeti.asteptare("a", 100.5) == 0
+    # Alt client are găleata lui, plină
+    assert galeti.asteptare("b", 100.0) == 0
+    # Reumplerea se oprește la rafală
+    galeti.consuma("a", 200.0)
+    assert galeti._tokeni("a", 200.0) == 2
+
+
+def test_galetile_vechi_uitate():
+    galeti = GaletiTokeni(rata=1, rafala=1, max_chei=2)
+    for cheie in ("a", "b", "c"):
+        galeti.consuma(cheie, 0.0)
+    assert len(galeti) == 2
+    # "a" a fost uitată, deci are din nou găleata plină
+    assert galeti.asteptare("a", 0.0) == 0
+    assert galeti.asteptare("c", 0.0) == 1
+
+
+class _Aplicatie:
+    def __init__(self):
+        self.elibereaza = asyncio.Event()
+        self.elibereaza.set()
+
+    async def __call__(self, scope, receive, send):
+        await self.elibereaza.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _cere(middleware, ip="10.0.0.1", token=None, metoda="POST", cale="/programari"):
+    headere = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {"type": "http", "method": metoda, "path": cale, "headers": headere, "client": (ip, 1234)}
+    primite = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(mesaj):
+        primite.append(mesaj)
+
+    await middleware(scope, receive, send)
+    return primite[0]["status"], dict(primite[0]["headers"])
+
+
+@pytest.fixture
+def activa(monkeypatch):
+    monkeypatch.setattr(limitare, "LIMITARE_ACTIVA", True)
+
+
+def _limitator(scrieri_max=0):
+    return Limitator(
+        GaletiTokeni(rata=0.5, rafala=2, max_chei=100),
+        GaletiTokeni(rata=0.5, rafala=1, max_chei=100),
+        scrieri_max,
+    )
+
+
+def test_429_cu_retry_after_pe_ip_si_pe_token(activa):
+    limitator = _limitator()
+    middleware = LimitareMiddleware(_Aplicatie(), limitator)
+
+    async def scenariu():
+        return [
+            await _cere(middleware, ip="10.0.0.1", token="secret"),
+            # Același token de pe alt IP: găleata token-ului e goală
+            await _cere(middleware, ip="10.0.0.2", token="secret"),
+            await _cere(middleware, ip="10.0.0.2"),
+            await _cere(middleware, ip="10.0.0.1"),
+            # Găleata IP-ului 10.0.0.1 e goală, indiferent de token
+            await _cere(middleware, ip="10.0.0.1", token="altul"),
+            # Rutele nelimitate nu consumă tokeni
+            await _cere(middleware, ip="10.0.0.1", metoda="PUT", cale="/programari/1"),
+            await _cere(middleware, ip="10.0.0.1", metoda="GET"),
+        ]
+
+    raspunsuri = asyncio.run(scenariu())
+    assert [status for status, _ in raspunsuri] == [200, 429, 200, 200, 429, 200, 200]
+    assert raspunsuri[1][1][b"retry-after"] == b"2"
+    assert raspunsuri[4][1][b"retry-after"] == b"2"
+    stats = limitator.stats()
+    assert stats["respinse_token"] == 1 and stats["respinse_ip"] == 1 and stats["permise"] == 3
+
+    # Token-ul nu e păstrat în clar
+    assert "secret" not in limitator.token._galeti
+    assert hashlib.sha256(b"secret").hexdigest() in limitator.token._galeti
+
+
+def test_limita_scrierilor_concurente(activa):
+    aplicatie = _Aplicatie()
+    aplicatie.elibereaza.clear()
+    limitator = _limitator(scrieri_max=1)
+    middleware = LimitareMiddleware(aplicatie, limitator)
+
+    async def scenariu():
+        prima = asyncio.create_task(_cere(middleware, metoda="PUT", cale="/programari/1"))
+        await asyncio.sleep(0)
+        a_doua = await _cere(middleware, metoda="DELETE", cale="/programari/2")
+        login = asyncio.create_task(_cere(middleware, cale="/login"))
+        await asyncio.sleep(0)
+        aplicatie.elibereaza.set()
+        return await prima, a_doua, await login, await _cere(middleware, metoda="PUT", cale="/programari/1")
+
+    prima, a_doua, login, dupa = asyncio.run(scenariu())
+    assert prima[0] == 200
+    assert a_doua[0] == 429
+    assert a_doua[1][b"retry-after"] == str(limitare.SCRIERI_RETRY_AFTER_SECUNDE).encode()
+    assert login[0] == 200
+    assert dupa[0] == 200
+    assert limitator.stats()["respinse_concurenta"] == 1
+    assert limitator.scrieri_in_curs == 0
@@ -0,0 +1,23 @@
+import logging
+
+from src.cache.catalog import cache_catalog
+
+
+def _suma_interogari(client, ruta):
+    prefix = f'http_request_db_queries_sum{{method="GET",route="{ruta}"}} '
+    for linie in client.get("/metrics").text.splitlines():
+        if linie.startswith(prefix):
+            return float(linie[len(prefix):])
+    return 0.0
+
+
+def test_interogari_numarate_fara_log_sql(client):
+    inainte = _suma_interogari(client, "/jobs")
+    cache_catalog.invalideaza()
+    assert client.get("/jobs").status_code == 200
+    # Din cache: nicio interogare
+    assert client.get("/jobs").status_code == 200
+    assert _suma_interogari(client, "/jobs") - inainte == 1
+
+    # SQL-ul cu parametri (emailuri, telefoane, hash-uri) nu ajunge în log
+    assert not logging.getLogger("tortoise.db_client").isEnabledFor(logging.DEBUG)
@@ -0,0 +1,114 @@
+import shutil
+import sqlite3
+
+import pytest
+
+import apply_migration
+from migrations import reconstruire
+from src import cautare
+
+
+def _baza_pana_la_migrarea_5(tmp_path):
+    """Baza creată de migrările 1-5, ca înainte de reconstruirea din migrarea 6."""
+    director = tmp_path / "1-5"
+    director.mkdir()
+    for fisier in apply_migration.migration_files(apply_migration.MIGRATIONS_DIR):
+        if int(fisier.rsplit("/", 1)[-1].split("_", 1)[0]) <= 5:
+            shutil.copy(fisier, director)
+    baza = str(tmp_path / "migrari.db")
+    assert apply_migration.apply_migration(baza, str(director))
+    return baza
+
+
+@pytest.mark.parametrize("sufix", ["_client", ""])
+def test_migrarea_6_pastreaza_datele_clientului(tmp_path, sufix):
+    # "_client": coloanele create de migrările 1-2; "": baze create din modele
+    baza = _baza_pana_la_migrarea_5(tmp_path)
+    conn = sqlite3.connect(baza)
+    if not sufix:
+        for coloana in ("nume", "prenume", "email", "telefon"):
+            conn.execute(f'ALTER TABLE "Programari" RENAME COLUMN "{coloana}_client" TO "{coloana}"')
+    conn.execute('INSERT INTO "Job" ("nume") VALUES (\'Teste\')')
+    conn.executemany(
+        f'INSERT INTO "Programari" ("data", "ora", "nume{sufix}", "prenume{sufix}", "email{sufix}", "telefon{sufix}", "job_id") '
+        f"VALUES (?, ?, ?, ?, ?, ?, 1)",
+        [
+            ("2026-01-05", "09:30", "Popescu", "Ion", "ion@example.com", "0712345678"),
+            ("2026-01-05", "10:00", "Ionescu", "Ana", None, "+40722000111"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    assert apply_migration.apply_migration(baza, apply_migration.MIGRATIONS_DIR)
+
+    conn = sqlite3.connect(baza)
+    randuri = conn.execute(
+        'SELECT "ora", "nume", "prenume", "email", "telefon", "job_id" FROM "Programari" ORDER BY "id"'
+    ).fetchall()
+    assert randuri == [
+        ("09:30:00", "Popescu", "Ion", "ion@example.com", "0712345678", 1),
+        ("10:00:00", "Ionescu", "Ana", None, "+40722000111", 1),
+    ]
+    # Scrierile după reconstruire merg (fără trigger-e rămase pe tabelă)
+    conn.execute('INSERT INTO "Programari" ("data", "ora", "nume") VALUES (\'2026-01-06\', \'08:00:00\', \'Nou\')')
+    conn.commit()
+    assert not conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'new\\_%' ESCAPE '\\'").fetchall()
+
+
+def _migrarea_7():
+    fisier = next(
+        fisier for fisier in apply_migration.migration_files(apply_migration.MIGRATIONS_DIR)
+        if fisier.rsplit("/", 1)[-1].startswith("7_")
+    )
+    return apply_migration.load_migration(fisier)
+
+
+@pytest.mark.parametrize("varianta", ["online", "blocant"])
+def test_reconstruirea_pastreaza_triggerele_tabelei(tmp_path, varianta):
+    baza = str(tmp_path / "toate.db")
+    assert apply_migration.apply_migration(baza, apply_migration.MIGRATIONS_DIR)
+    conn = sqlite3.connect(baza, isolation_level=None)
+    conn.execute('INSERT INTO "Job" ("nume") VALUES (\'Teste\')')
+    conn.execute(
+        'INSERT INTO "Programari" ("data", "ora", "nume", "telefon", "job_id") '
+        "VALUES ('2026-02-02', '09:00:00', 'Vechi', '+40711000222', 1)"
+    )
+    triggere = conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name").fetchall()
+
+    # Reconstruirea din downgrade-ul migrării 7 (Programari fără "version")
+    reconstruiri = _migrarea_7().FARA_VERSIUNE
+    if varianta == "online":
+        reconstruire.reconstruieste_online(conn, reconstruiri, bucata=1, pauza=0, raport=lambda _: None)
+    else:
+        for r in reconstruiri:
+            r.existente = {rand[1] for rand in conn.execute('PRAGMA table_info("Programari")')}
+            r.triggere = [rand[1] for rand in conn.execute(r.sql_triggere_proprii())]
+        conn.executescript(reconstruire.sql_blocant(reconstruiri))
+
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name").fetchall() == triggere
+    conn.execute(
+        'INSERT INTO "Programari" ("data", "ora", "nume", "telefon", "job_id") '
+        "VALUES ('2026-02-02', '10:00:00', 'Nou', '0040 722 333 444', 1)"
+    )
+    gasite = conn.execute(
+        'SELECT rowid FROM "Programari_fts" WHERE "Programari_fts" MATCH \'"0722333"*\''
+    ).fetchall()
+    assert gasite == [(2,)]
+    contor = conn.execute(
+        'SELECT "numar" FROM "Statistici_zilnice" WHERE "data" = \'2026-02-02\' AND "job_id" = 1'
+    ).fetchone()
+    assert contor == (2,)
+
+
+def test_triggerele_migrarilor_sunt_cele_din_cautare(tmp_path):
+    # Aceeași sursă: la pornire asigura_indexul nu le consideră vechi
+    baza = str(tmp_path / "cautare.db")
+    assert apply_migration.apply_migration(baza, apply_migration.MIGRATIONS_DIR)
+    conn = sqlite3.connect(baza)
+    triggere = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'Programari\\_fts\\_%' ESCAPE '\\'"
+    ).fetchall())
+    assert {nume: sql.split() for nume, sql in triggere.items()} == {
+        nume: sql.split() for nume, sql in cautare.TRIGGERE_SQLITE.items()
+    }
@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.paginare import codifica_cursor, decodifica_cursor
+
+
+def _b64(valoare) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valoare).encode()).decode()
+
+
+def test_cursorul_se_decodifica_la_aceeasi_cheie():
+    rand = {"data": date(2030, 5, 17), "ora": time(9, 30), "id": 42}
+    assert decodifica_cursor(codifica_cursor(rand)) == (date(2030, 5, 17), time(9, 30), 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",
+    "bnUtZS1qc29u",  # "nu-e-json"
+    _b64(["2030-05-17", "09:30:00"]),
+    _b64(["2030-13-40", "09:30:00", 1]),
+    _b64(["2030-05-17", "25:00", 1]),
+    _b64(["2030-05-17", "09:30:00", "x"]),
+    _b64(["2030-05-17", "09:30:00", 2 ** 70]),
+    _b64(["2030-05-17", "09:30:00", -1]),
+    _b64({"data": "2030-05-17"}),
+])
+def test_cursor_invalid_400(cursor):
+    with pytest.raises(HTTPException) as eroare:
+        decodifica_cursor(cursor)
+    assert eroare.value.status_code == 400
+
+
+def _pagini(client, cale, **params):
+    """Toate paginile, urmând X-Next-Cursor; returnează id-urile în ordine."""
+    ids = []
+    while True:
+        raspuns = client.get(cale, params=params)
+        assert raspuns.status_code == 200, raspuns.text
+        ids.extend(rand["id"] for rand in raspuns.json())
+        cursor = raspuns.headers.get("x-next-cursor")
+        if cursor is None:
+            return ids
+        params["cursor"] = cursor
+
+
+def test_paginare_cu_egalitati_pe_data_si_ora(client):
+    zi = (date.today() + timedelta(days=300)).isoformat()
+    a_doua_zi = (date.today() + timedelta(days=301)).isoformat()
+    # Cinci programări la aceeași oră: doar id-ul le ordonează
+    ids = [
+        client.post("/programari", json={"data": data, "ora": ora}).json()["id"]
+        for data, ora in [(zi, "10:00")] * 5 + [(zi, "09:00"), (a_doua_zi, "08:00"), (a_doua_zi, "10:00")]
+    ]
+    ordonate = [ids[5], *ids[:5], ids[6], ids[7]]
+
+    for limit in (1, 2, 3, 10):
+        assert _pagini(client, "/programari", **{"from": zi, "to": a_doua_zi, "limit": limit}) == ordonate
+
+    # from/to împreună cu un cursor: cursorul doar continuă, intervalul rămâne
+    prima = client.get("/programari", params={"from": zi, "to": a_doua_zi, "limit": 3})
+    cursor = prima.headers["x-next-cursor"]
+    assert _pagini(client, "/programari", **{"from": zi, "to": zi, "cursor": cursor}) == ordonate[3:6]
+    assert _pagini(client, "/programari", **{"from": a_doua_zi, "to": a_doua_zi, "cursor": cursor}) == ordonate[6:]
+
+
+def test_api_cursor_invalid_400(autentificat):
+    for cale in ("/programari", "/programari/arhiva"):
+        for cursor in ("!!!", _b64(["2030-05-17", "09:30:00", 2 ** 70])):
+            raspuns = autentificat.get(cale, params={"cursor": cursor})
+            assert raspuns.status_code == 400, raspuns.text
+            assert raspuns.json() == {"detail": "Cursor invalid"}
@@ -0,0 +1,94 @@
+from datetime import time
+
+import pytest
+
+from db.models import Programari
+from src import versiuni
+
+
+def test_put_fara_persoana_pastreaza_persoana_din_baza(autentificat, maine):
+    # Fără persoană, programarea nu ocupă niciun slot în indexul de ocupare,
+    # deci PUT citește persoana_id din baza de date
+    creata = autentificat.post("/programari", json={"data": maine, "ora": "08:00", "nume": "Ionescu"})
+    assert creata.status_code == 200, creata.text
+    programare_id = creata.json()["id"]
+
+    raspuns = autentificat.put(f"/programari/{programare_id}", json={"data": maine, "ora": "08:30"})
+    assert raspuns.status_code == 200, raspuns.text
+
+
+def test_put_programare_inexistenta_404(autentificat, maine):
+    raspuns = autentificat.put("/programari/999999", json={"data": maine, "ora": "08:00"})
+    assert raspuns.status_code == 404
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "fara-returning"])
+def returning(request, monkeypatch):
+    # Fără RETURNING: ramura pentru SQLite < 3.35 (imaginea Docker are 3.27)
+    monkeypatch.setattr(versiuni, "SQLITE_ARE_RETURNING", request.param)
+    return request.param
+
+
+async def _ora_si_versiunea(programare_id):
+    programare = await Programari.get(id=programare_id)
+    return programare.ora, programare.version
+
+
+def test_put_cu_if_match(autentificat, maine, returning):
+    creata = autentificat.post("/programari", json={"data": maine, "ora": "16:00", "nume": "Etag"})
+    assert creata.status_code == 200, creata.text
+    programare_id = creata.json()["id"]
+    etag = creata.headers["etag"]
+    versiune = int(etag.strip('"'))
+
+    raspuns = autentificat.put(
+        f"/programari/{programare_id}", json={"data": maine, "ora": "16:30", "nume": "Etag"},
+        headers={"If-Match": etag},
+    )
+    assert raspuns.status_code == 200, raspuns.text
+    assert raspuns.headers["etag"] == f'"{versiune + 1}"'
+    assert raspuns.json()["version"] == versiune + 1
+
+    # ETag-ul vechi nu mai corespunde: 412, rândul rămâne neschimbat
+    invechit = autentificat.put(
+        f"/programari/{programare_id}", json={"data": maine, "ora": "17:00", "nume": "Etag"},
+        headers={"If-Match": etag},
+    )
+    assert invechit.status_code == 412
+    rand = autentificat.portal.call(_ora_si_versiunea, programare_id)
+    assert rand == (time(16, 30), versiune + 1)
+
+    assert autentificat.put(
+        f"/programari/{programare_id}", json={"data": maine, "ora": "17:00"}, headers={"If-Match": "abc"},
+    ).status_code == 400
+    assert autentificat.put(
+        "/programari/999999", json={"data": maine, "ora": "17:00"}, headers={"If-Match": '"1"'},
+    ).status_code == 404
+
+
+async def _nume_si_ora(ids):
+    return {p.id: (p.nume, p.ora) for p in await Programari.filter(id__in=ids)}
+
+
+def test_batch_id_urile_corespund_elementelor(client, maine):
+    persoana_id = client.date["persoana_id"]
+    items = [
+        {"data": maine, "ora": "06:00", "nume": "Lot Unu", "persoana_id": persoana_id},
+        {"data": maine, "ora": "nu-e-ora", "nume": "Invalid"},
+        {"data": maine, "ora": "06:10", "nume": "Suprapus", "persoana_id": persoana_id},
+        {"data": maine, "ora": "06:30", "nume": "Lot Doi"},
+        {"data": maine, "ora": "07:00", "nume": "Lot Trei", "persoana_id": persoana_id},
+    ]
+    raspuns = client.post("/programari/batch", json=items)
+    assert raspuns.status_code == 200, raspuns.text
+    rezultate = raspuns.json()["rezultate"]
+    assert [rand["status"] for rand in rezultate] == ["success", "error", "error", "success", "success"]
+
+    ids = {rand["index"]: rand["id"] for rand in rezultate if rand["status"] == "success"}
+    randuri = client.portal.call(_nume_si_ora, list(ids.values()))
+    for index, id_ in ids.items():
+        assert randuri[id_] == (items[index]["nume"], time.fromisoformat(items[index]["ora"]))
+
+    # Programarea următoare primește un id după cele rezervate de lot
+    urmatoarea = client.post("/programari", json={"data": maine, "ora": "07:30"}).json()["id"]
+    assert urmatoarea > max(ids.values())
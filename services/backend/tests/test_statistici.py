@@ -0,0 +1,132 @@
+from datetime import date, time, timedelta
+
+from tortoise import Tortoise
+
+from db.models import Job, Persoane, Programari, ProgramariArhiva
+from src import statistici
+from src.statistici import GRUPARI, citeste_statistici
+
+DE_LA = date(2000, 1, 1)
+PANA_LA = date.today() + timedelta(days=3650)
+
+
+async def _din_programari():
+    """Aceleași numere calculate direct din Programari ∪ Programari_archive."""
+    conn = Tortoise.get_connection("default")
+    randuri = await conn.execute_query_dict(
+        'SELECT "data", "job_id", "persoana_id", count(*) AS "numar" FROM ('
+        ' SELECT "data", "job_id", "persoana_id" FROM "Programari"'
+        ' UNION ALL SELECT "data", "job_id", "persoana_id" FROM "Programari_archive"'
+        ') GROUP BY 1, 2, 3 ORDER BY 1, 2, 3'
+    )
+    return [{**rand, "data": date.fromisoformat(rand["data"])} for rand in randuri]
+
+
+def _cheie(rand):
+    return (rand["data"], rand["job_id"] or 0, rand["persoana_id"] or 0)
+
+
+async def _din_contoare():
+    randuri = await citeste_statistici(DE_LA, PANA_LA, GRUPARI)
+    return sorted(randuri, key=_cheie)
+
+
+def _verifica(client):
+    asteptat = sorted(client.portal.call(_din_programari), key=_cheie)
+    assert client.portal.call(_din_contoare) == asteptat
+
+
+async def _persoana_si_job_noi():
+    job = await Job.create(nume="Statistici")
+    persoana = await Persoane.create(nume="Ionescu", prenume="Maria", job=job)
+    return persoana.id, job.id
+
+
+async def _schimba_jobul(programare_id, job_id):
+    await Programari.filter(id=programare_id).update(job_id=job_id)
+
+
+async def _programari_vechi(zi, job_id):
+    return [
+        (await Programari.create(data=zi, ora=ora, job_id=job_id)).id
+        for ora in (time(8, 0), time(8, 30))
+    ]
+
+
+async def _arhivate(ids):
+    return await ProgramariArhiva.filter(id__in=ids).count()
+
+
+async def _strica_contoarele():
+    conn = Tortoise.get_connection("default")
+    await conn.execute_script(f'UPDATE "{statistici.TABELA}" SET "numar" = "numar" + 7')
+
+
+async def _reconstruieste():
+    return await statistici.reconstruieste()
+
+
+def test_contoarele_urmaresc_scrierile(autentificat):
+    date_ = autentificat.date
+    zi = (date.today() + timedelta(days=40)).isoformat()
+    alta_zi = (date.today() + timedelta(days=41)).isoformat()
+    veche = (date.today() - timedelta(days=200)).isoformat()
+    persoana_noua, job_nou = autentificat.portal.call(_persoana_si_job_noi)
+
+    creata = autentificat.post("/programari", json={
+        "data": zi, "ora": "09:00", "persoana_id": date_["persoana_id"], "serviciu_id": date_["serviciu_id"],
+    }).json()["id"]
+    fara_persoana = autentificat.post("/programari", json={"data": zi, "ora": "09:00"}).json()["id"]
+    _verifica(autentificat)
+
+    lot = autentificat.post("/programari/batch", json=[
+        {"data": zi, "ora": "10:00", "persoana_id": date_["persoana_id"]},
+        {"data": zi, "ora": "nu-e-ora"},
+        {"data": alta_zi, "ora": "10:00", "serviciu_id": date_["serviciu_id"]},
+    ]).json()
+    assert lot["create"] == 2
+    _verifica(autentificat)
+
+    # PUT: altă zi, apoi altă persoană; job-ul schimbat direct în tabelă
+    assert autentificat.put(f"/programari/{creata}", json={
+        "data": alta_zi, "ora": "09:00", "persoana_id": date_["persoana_id"],
+    }).status_code == 200
+    _verifica(autentificat)
+    assert autentificat.put(f"/programari/{creata}", json={
+        "data": alta_zi, "ora": "09:00", "persoana_id": persoana_noua,
+    }).status_code == 200
+    autentificat.portal.call(_schimba_jobul, creata, job_nou)
+    _verifica(autentificat)
+
+    assert autentificat.delete(f"/programari/{fara_persoana}").status_code == 200
+    _verifica(autentificat)
+
+    # API-ul refuză datele din trecut: programările de arhivat se scriu direct
+    vechi = autentificat.portal.call(_programari_vechi, veche, date_["job_id"])
+    assert autentificat.post("/programari/arhiva/ruleaza").status_code == 200
+    assert autentificat.portal.call(_arhivate, vechi) == 2
+    _verifica(autentificat)
+
+    # Contoarele stricate sunt recalculate din ambele tabele
+    autentificat.portal.call(_strica_contoarele)
+    assert autentificat.portal.call(_reconstruieste) > 0
+    _verifica(autentificat)
+
+    raspuns = autentificat.get("/statistici", params={"from": veche, "to": alta_zi, "grupare": "zi"})
+    assert raspuns.status_code == 200, raspuns.text
+    pe_zile = {rand["data"]: rand["numar"] for rand in raspuns.json()["randuri"]}
+    assert pe_zile[veche] == 2 and pe_zile[zi] == 1 and pe_zile[alta_zi] == 2
+    assert raspuns.json()["total"] == sum(pe_zile.values())
+
+    pe_job = autentificat.get("/statistici", params={
+        "from": zi, "to": alta_zi, "grupare": "persoana", "job_id": job_nou,
+    }).json()
+    assert pe_job["randuri"] == [{"persoana_id": persoana_noua, "numar": 1}]
+
+
+def test_statistici_validare(client, autentificat):
+    assert autentificat.get("/statistici", params={"from": "2030-01-02", "to": "2030-01-01"}).status_code == 400
+    assert autentificat.get("/statistici", params={"from": "2030-01-01", "grupare": "luna"}).status_code == 400
+    assert autentificat.get("/statistici", params={"from": "2030-01-01", "to": "2032-01-01"}).status_code == 400
+    client.cookies.clear()
+    assert client.get("/statistici", params={"from": "2030-01-01"}).status_code == 401